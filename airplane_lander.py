@@ -4,14 +4,139 @@ Realistic 2D Rocket Landing Simulator
 A clean implementation with realistic physics for rocket landing simulation.
 """
 
-import uvicorn
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Request, WebSocket
+from fastapi.responses import HTMLResponse, Response
+from pydantic import BaseModel, Field
+
+from airplane_landing_simulator import STATE_FIELDS, warm_up
+from lander_demos import MAX_CHUNK_BYTES, DemoWriter, parse_demo_chunk
+from lander_assets import REVALIDATE_CACHE, StaticAsset, load_static_assets
+from lander_inference import InferenceBatcher, load_policy
+from lander_metrics import CONTENT_TYPE, MetricsMiddleware, MetricsRegistry, monitor_loop_lag
+from lander_recording import EpisodeReader
+from lander_stream import FRAME_FIELDS, EpisodeHub, LanderSwarm, replay_frames
+from lander_value_table import ValueTable
+
+def _warm_up():
+    """Compress static assets and load the step kernel (run off the event loop after startup)"""
+    start = time.perf_counter()
+    for asset in (PAGE, *STATIC_ASSETS.values(), VALUE_TABLE_ASSET, POLICY_WEIGHTS_ASSET):
+        if asset is not None:
+            asset.variants
+    warm_up()
+    print(f"✓ Worker {os.getpid()} warmed up in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+def _report_warm_up(future):
+    """Surface a failed warm-up; the server keeps running and compiles/compresses on first use instead"""
+    error = future.exception()
+    if error is not None:
+        print(f"✗ Worker {os.getpid()} warm-up failed: {error!r}")
+
+@asynccontextmanager
+async def lifespan(app):
+    """Report worker startup time (from LANDER_LAUNCH_TIME, set by the launcher), warm up, watch event-loop lag"""
+    launch_time = os.environ.get("LANDER_LAUNCH_TIME")
+    if launch_time:
+        print(f"✓ Worker {os.getpid()} ready in {time.time() - float(launch_time):.2f}s")
+    asyncio.get_running_loop().run_in_executor(None, _warm_up).add_done_callback(_report_warm_up)
+    lag_monitor = asyncio.create_task(monitor_loop_lag(loop_lag)) if metrics.enabled else None
+    yield
+    if lag_monitor is not None:
+        lag_monitor.cancel()
+    if demo_writer is not None:
+        demo_writer.close()
 
 # Create FastAPI app
-app = FastAPI(title="Realistic Rocket Landing Simulator", description="2D rocket landing with realistic physics")
+app = FastAPI(
+    title="Realistic Rocket Landing Simulator",
+    description="2D rocket landing with realistic physics",
+    lifespan=lifespan,
+)
+
+# Metrics served on /metrics; LANDER_METRICS=0 turns collection off entirely
+metrics = MetricsRegistry(enabled=os.environ.get("LANDER_METRICS", "1") != "0")
+request_latency = metrics.histogram(
+    "lander_http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status"))
+tick_phases = metrics.histogram(
+    "lander_tick_phase_duration_seconds", "Ticker time per phase: step (policy+physics), pack, publish", ("phase",))
+loop_lag = metrics.histogram("lander_event_loop_lag_seconds", "Event loop wake-up delay of a 100 ms sleeper")
+inference_batch_size = metrics.histogram(
+    "lander_inference_batch_size", "Observations per policy forward pass", buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256))
+if metrics.enabled:
+    app.add_middleware(MetricsMiddleware, histogram=request_latency)
+
+# Set LANDER_POLICY_PATH to a saved PPO model to serve it on /act and to let
+# the agent fly streamed episodes whenever no human pilot is connected.
+POLICY_PATH = os.environ.get("LANDER_POLICY_PATH")
+policy = load_policy(POLICY_PATH) if POLICY_PATH else None
+
+# Set LANDER_VALUE_TABLE to a table built by run_value_table.py to export it
+# to the browser autopilot (/?autopilot) on /value-table; without a PPO
+# policy it also answers /act and flies streamed episodes.
+VALUE_TABLE_PATH = os.environ.get("LANDER_VALUE_TABLE")
+value_table = ValueTable.load(VALUE_TABLE_PATH) if VALUE_TABLE_PATH else None
+VALUE_TABLE_ASSET = StaticAsset(value_table.to_bytes(), "application/octet-stream") if value_table else None
+
+# Set LANDER_POLICY_WEIGHTS to a policy exported for the browser (written next
+# to the model by training, models/ppo_lander.weights.bin): the page fetches it
+# once from /policy-weights and runs the AI pilot locally.
+POLICY_WEIGHTS_PATH = os.environ.get("LANDER_POLICY_WEIGHTS")
+POLICY_WEIGHTS_ASSET = StaticAsset.from_file(POLICY_WEIGHTS_PATH, REVALIDATE_CACHE) if POLICY_WEIGHTS_PATH else None
+
+# Server-side episodes streamed over /ws/episode, all stepped as one batch
+MAX_SESSIONS = int(os.environ.get("LANDER_MAX_SESSIONS", "4096"))
+SESSION_TTL = float(os.environ.get("LANDER_SESSION_TTL", "30"))
+episode_hub = EpisodeHub(policy=policy or value_table, max_sessions=MAX_SESSIONS, ttl=SESSION_TTL,
+                         tick_histogram=tick_phases if metrics.enabled else None)
+metrics.gauge_callback("lander_sessions_active", "Live server-side sessions", lambda: len(episode_hub.episodes))
+metrics.counter_callback("lander_ticks_total", "Simulation ticks advanced", lambda: episode_hub.tick_count)
+metrics.counter_callback("lander_frames_sent_total", "Frames written to WebSockets", lambda: episode_hub.frames_sent)
+metrics.counter_callback("lander_frames_skipped_total", "Frames slow WebSocket readers skipped",
+                         lambda: episode_hub.frames_skipped)
 
-# HTML template with embedded CSS and JS
+# Swarm view (/?swarm): a population of landers flown by the same policy (or
+# the attitude controller), streamed over /ws/swarm as one message per tick
+SWARM_SIZE = int(os.environ.get("LANDER_SWARM_SIZE", "2048"))
+swarm = LanderSwarm(policy=policy or value_table, size=SWARM_SIZE)
+metrics.gauge_callback("lander_websocket_clients", "Connected WebSocket clients (episodes and swarm)",
+                       lambda: sum(stream.clients for stream in episode_hub.episodes.values()) + swarm.clients)
+
+# Concurrent /act requests are coalesced into one forward pass per window
+ACT_MAX_BATCH = int(os.environ.get("LANDER_ACT_MAX_BATCH", "64"))
+ACT_MAX_WAIT_MS = float(os.environ.get("LANDER_ACT_MAX_WAIT_MS", "2"))
+inference = InferenceBatcher(policy, ACT_MAX_BATCH, ACT_MAX_WAIT_MS / 1000.0,
+                             batch_size_histogram=inference_batch_size if metrics.enabled else None) if policy else None
+
+# Set LANDER_DEMO_PATH to collect human demonstrations: the page POSTs its
+# buffered ticks to /demos, appended to a columnar dataset in that directory
+DEMO_PATH = os.environ.get("LANDER_DEMO_PATH")
+demo_writer = DemoWriter(DEMO_PATH) if DEMO_PATH else None
+if demo_writer is not None:
+    metrics.counter_callback("lander_demo_rows_total", "Demonstration rows written", lambda: demo_writer.rows_written)
+    metrics.counter_callback("lander_demo_chunks_dropped_total", "Demonstration chunks dropped under backlog",
+                             lambda: demo_writer.chunks_dropped)
+    metrics.counter_callback("lander_demo_rows_lost_total", "Demonstration rows that failed to write",
+                             lambda: demo_writer.rows_lost)
+
+# Recording file (lander_recording.py format) served under /replay
+RECORDING_PATH = os.environ.get("LANDER_RECORDING_PATH")
+_recording = None
+
+def get_recording():
+    """Open the configured recording on first use"""
+    global _recording
+    if _recording is None:
+        if not RECORDING_PATH or not os.path.exists(RECORDING_PATH):
+            raise HTTPException(status_code=404, detail="No episode recording configured")
+        _recording = EpisodeReader(RECORDING_PATH)
+    return _recording
+
+# HTML template; CSS and JS are served from static/ under fingerprinted URLs
 HTML_TEMPLATE = """
 <!DOCTYPE html>
 <html lang="en">
@@ -19,274 +144,7 @@ HTML_TEMPLATE = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Realistic Rocket Landing Simulator</title>
-    <style>
-        body {
-            margin: 0;
-            padding: 20px;
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(to bottom, #0c1445, #1a237e);
-            min-height: 100vh;
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            color: #e0e0e0;
-        }
-
-        .container {
-            text-align: center;
-            max-width: 800px;
-            width: 100%;
-        }
-
-        h1 {
-            font-size: 2rem;
-            margin: 0 0 15px 0;
-            color: #bb86fc;
-            text-shadow: 0 0 10px rgba(187, 134, 252, 0.5);
-        }
-
-        .instructions {
-            background: rgba(30, 30, 46, 0.8);
-            border-radius: 15px;
-            padding: 20px;
-            margin-bottom: 25px;
-            box-shadow: 0 8px 32px rgba(0, 0, 0, 0.3);
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            backdrop-filter: blur(10px);
-        }
-
-        .game-area {
-            width: 600px;
-            height: 400px;
-            margin: 0 auto;
-            position: relative;
-            background: linear-gradient(to bottom, #151d3b, #0f162d);
-            border-radius: 15px;
-            overflow: hidden;
-            box-shadow: 0 15px 35px rgba(0, 0, 0, 0.5);
-            border: 2px solid #5e35b1;
-        }
-
-        #rocket {
-            position: absolute;
-            width: 40px;
-            height: 40px;
-            transition: transform 0.2s cubic-bezier(0.4, 0, 0.2, 1);
-        }
-
-        #left-engine-flame {
-            position: absolute;
-            width: 20px;
-            height: 30px;
-            background: linear-gradient(to top, #ff5722, #ff9800, #ffff00);
-            border-radius: 50% 50% 0 0;
-            opacity: 0;
-            transition: opacity 0.15s ease, height 0.2s ease;
-            box-shadow: 0 0 15px #ff5722;
-        }
-
-        #right-engine-flame {
-            position: absolute;
-            width: 20px;
-            height: 30px;
-            background: linear-gradient(to top, #ff5722, #ff9800, #ffff00);
-            border-radius: 50% 50% 0 0;
-            opacity: 0;
-            transition: opacity 0.15s ease, height 0.2s ease;
-            box-shadow: 0 0 15px #ff5722;
-        }
-
-        .center-engine-flame {
-            position: absolute;
-            width: 25px;
-            height: 40px;
-            background: linear-gradient(to top, #ff5722, #ff9800, #ffff00);
-            border-radius: 50% 50% 0 0;
-            opacity: 0.7;
-            transition: height 0.3s ease;
-            box-shadow: 0 0 20px #ff5722;
-        }
-
-        .ground {
-            position: absolute;
-            bottom: 0;
-            width: 100%;
-            height: 40px;
-            background: linear-gradient(to top, #3e2723, #4e342e);
-        }
-
-        .landing-pad {
-            position: absolute;
-            bottom: 40px;
-            left: 50%;
-            transform: translateX(-50%);
-            width: 120px;
-            height: 15px;
-            background: linear-gradient(to right, #7b1fa2, #9c27b0, #7b1fa2);
-            border-radius: 5px 5px 0 0;
-            box-shadow: 0 0 20px rgba(156, 39, 176, 0.5);
-        }
-
-        .landing-lights {
-            position: absolute;
-            bottom: 42px;
-            left: 50%;
-            transform: translateX(-50%);
-            width: 130px;
-            display: flex;
-            justify-content: space-around;
-        }
-
-        .landing-light {
-            width: 10px;
-            height: 10px;
-            border-radius: 50%;
-            background: #ff5252;
-            box-shadow: 0 0 10px #ff5252;
-            animation: pulse 1.5s infinite;
-        }
-
-        .controls {
-            margin-top: 25px;
-            display: flex;
-            justify-content: center;
-            gap: 40px;
-        }
-
-        .key {
-            width: 90px;
-            height: 90px;
-            background: linear-gradient(145deg, #6200ea, #3700b3);
-            border-radius: 15px;
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            color: white;
-            font-size: 1.8rem;
-            font-weight: bold;
-            box-shadow: 0 8px 25px rgba(0, 0, 0, 0.4);
-            transition: all 0.2s ease;
-        }
-
-        .key.active {
-            transform: translateY(4px);
-            box-shadow: 0 4px 15px rgba(0, 0, 0, 0.3);
-            background: linear-gradient(145deg, #3700b3, #6200ea);
-        }
-
-        .status {
-            margin-top: 25px;
-            font-size: 1.3rem;
-            font-weight: bold;
-            color: #bb86fc;
-            text-shadow: 0 0 8px rgba(187, 134, 252, 0.5);
-            background: rgba(30, 30, 46, 0.6);
-            padding: 15px 30px;
-            border-radius: 30px;
-            backdrop-filter: blur(5px);
-        }
-
-        .altitude-bar {
-            position: absolute;
-            right: 20px;
-            top: 20px;
-            width: 30px;
-            height: 300px;
-            background: rgba(255, 255, 255, 0.1);
-            border-radius: 15px;
-            overflow: hidden;
-            border: 1px solid rgba(255, 255, 255, 0.2);
-        }
-
-        .altitude-fill {
-            position: absolute;
-            bottom: 0;
-            width: 100%;
-            background: linear-gradient(to top, #4caf50, #8bc34a);
-            transition: height 0.4s cubic-bezier(0.4, 0, 0.2, 1);
-        }
-
-        .crash-animation {
-            position: absolute;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            background: rgba(255, 0, 0, 0.85);
-            display: none;
-            justify-content: center;
-            align-items: center;
-            font-size: 3.5rem;
-            color: white;
-            font-weight: bold;
-            z-index: 100;
-            animation: shake 0.6s infinite;
-        }
-
-        .success-animation {
-            position: absolute;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            background: rgba(0, 128, 0, 0.85);
-            display: none;
-            justify-content: center;
-            align-items: center;
-            font-size: 3.5rem;
-            color: white;
-            font-weight: bold;
-            z-index: 100;
-            animation: success-pulse 2s infinite;
-        }
-
-        @keyframes shake {
-            0% { transform: translate(1px, 1px) rotate(0deg); }
-            10% { transform: translate(-2px, -3px) rotate(-2deg); }
-            20% { transform: translate(-4px, 0px) rotate(2deg); }
-            30% { transform: translate(4px, 3px) rotate(0deg); }
-            40% { transform: translate(2px, -2px) rotate(2deg); }
-            50% { transform: translate(-2px, 3px) rotate(-2deg); }
-            60% { transform: translate(-4px, 1px) rotate(0deg); }
-            70% { transform: translate(4px, 1px) rotate(-2deg); }
-            80% { transform: translate(-2px, -2px) rotate(2deg); }
-            90% { transform: translate(2px, 3px) rotate(0deg); }
-            100% { transform: translate(1px, -3px) rotate(-1deg); }
-        }
-
-        @keyframes pulse {
-            0% { opacity: 0.4; box-shadow: 0 0 5px #ff5252; }
-            50% { opacity: 1; box-shadow: 0 0 20px #ff5252; }
-            100% { opacity: 0.4; box-shadow: 0 0 5px #ff5252; }
-        }
-
-        @keyframes success-pulse {
-            0% { background: rgba(0, 128, 0, 0.85); }
-            50% { background: rgba(0, 200, 0, 0.9); }
-            100% { background: rgba(0, 128, 0, 0.85); }
-        }
-
-        @media (max-width: 650px) {
-            .game-area {
-                width: 95%;
-                height: 300px;
-            }
-            
-            .controls {
-                gap: 20px;
-            }
-            
-            .key {
-                width: 70px;
-                height: 70px;
-                font-size: 1.5rem;
-            }
-            
-            h1 {
-                font-size: 1.7rem;
-            }
-        }
-    </style>
+    <link rel="stylesheet" href="{css_url}">
 </head>
 <body>
     <div class="container">
@@ -295,24 +153,12 @@ HTML_TEMPLATE = """
         <div class="instructions">
             <p>Use LEFT and RIGHT arrow keys to control engine thrust</p>
             <p>Left Engine: Pushes rocket RIGHT | Right Engine: Pushes rocket LEFT</p>
+            <p>Press P or 🤖 to hand over to the AI pilot and back</p>
         </div>
         
         <div class="game-area" id="gameArea">
-            <svg id="rocket" width="40" height="40" viewBox="0 0 40 40">
-                <!-- Rocket body -->
-                <rect x="15" y="5" width="10" height="25" fill="#e0e0e0" rx="2"/>
-                <!-- Rocket nose -->
-                <polygon points="15,5 25,5 20,0" fill="#f5f5f5"/>
-                <!-- Rocket fins -->
-                <polygon points="15,30 10,35 15,35" fill="#bdbdbd"/>
-                <polygon points="25,30 30,35 25,35" fill="#bdbdbd"/>
-                <!-- Cockpit window -->
-                <circle cx="20" cy="12" r="3" fill="#4fc3f7"/>
-            </svg>
-            
-            <div id="left-engine-flame"></div>
-            <div id="right-engine-flame"></div>
-            <div class="center-engine-flame" id="centerEngineFlame"></div>
+            <!-- Rocket and engine flames are drawn here; see createSceneRenderer() -->
+            <canvas id="sceneCanvas"></canvas>
             
             <div class="landing-pad"></div>
             <div class="landing-lights">
@@ -335,256 +181,173 @@ HTML_TEMPLATE = """
         <div class="controls">
             <div class="key" id="leftKey">←</div>
             <div class="key" id="rightKey">→</div>
+            <div class="key pilot-key" id="pilotToggle" title="AI pilot (P)">🤖</div>
         </div>
         
         <div class="status" id="status">Altitude: 300ft | Speed: 15 mph | Angle: 0°</div>
     </div>
     
-    <script>
-        // Game variables
-        let rocketX = 300;
-        let rocketY = 50;
-        let rocketAngle = 0;
-        let velocityX = 0;
-        let velocityY = 0.25; // Slow descent due to gravity
-        let angularVelocity = 0;
-        let altitude = 300;
-        let speed = 15;
-        let gameRunning = true;
-        let lastThrustTime = 0;
-        
-        // DOM elements
-        const rocket = document.getElementById('rocket');
-        const leftFlame = document.getElementById('left-engine-flame');
-        const rightFlame = document.getElementById('right-engine-flame');
-        const centerFlame = document.getElementById('centerEngineFlame');
-        const leftKey = document.getElementById('leftKey');
-        const rightKey = document.getElementById('rightKey');
-        const status = document.getElementById('status');
-        const altitudeFill = document.getElementById('altitudeFill');
-        const gameArea = document.getElementById('gameArea');
-        const crashAnimation = document.getElementById('crashAnimation');
-        const successAnimation = document.getElementById('successAnimation');
-        
-        // Initialize positions
-        updateRocketPosition();
-        
-        // Keyboard event listeners
-        document.addEventListener('keydown', function(event) {
-            if (!gameRunning) return;
-            
-            switch(event.key) {
-                case 'ArrowLeft':
-                    activateLeftEngine();
-                    event.preventDefault();
-                    break;
-                case 'ArrowRight':
-                    activateRightEngine();
-                    event.preventDefault();
-                    break;
-            }
-        });
-        
-        document.addEventListener('keyup', function(event) {
-            switch(event.key) {
-                case 'ArrowLeft':
-                    deactivateLeftEngine();
-                    event.preventDefault();
-                    break;
-                case 'ArrowRight':
-                    deactivateRightEngine();
-                    event.preventDefault();
-                    break;
-            }
-        });
-        
-        // Touch events for mobile
-        leftKey.addEventListener('touchstart', function(e) {
-            e.preventDefault();
-            activateLeftEngine();
-        });
-        
-        leftKey.addEventListener('touchend', function(e) {
-            e.preventDefault();
-            deactivateLeftEngine();
-        });
-        
-        rightKey.addEventListener('touchstart', function(e) {
-            e.preventDefault();
-            activateRightEngine();
-        });
-        
-        rightKey.addEventListener('touchend', function(e) {
-            e.preventDefault();
-            deactivateRightEngine();
-        });
-        
-        // Mouse events for desktop
-        leftKey.addEventListener('mousedown', activateLeftEngine);
-        leftKey.addEventListener('mouseup', deactivateLeftEngine);
-        leftKey.addEventListener('mouseleave', deactivateLeftEngine);
-        
-        rightKey.addEventListener('mousedown', activateRightEngine);
-        rightKey.addEventListener('mouseup', deactivateRightEngine);
-        rightKey.addEventListener('mouseleave', deactivateRightEngine);
-        
-        function activateLeftEngine() {
-            const now = Date.now();
-            if (now - lastThrustTime < 50) return; // Prevent spam
-            lastThrustTime = now;
-            
-            leftKey.classList.add('active');
-            leftFlame.style.opacity = '1';
-            leftFlame.style.height = '40px';
-            
-            // Apply left thrust: pushes rocket RIGHT and creates CLOCKWISE rotation
-            velocityX += 0.55;  // Increased from 0.35 to 0.55 for faster response
-            angularVelocity += 1.5; // Increased from 1.0 to 1.5 for faster rotation
-            
-            // Add slight wobble effect
-            setTimeout(() => {
-                if (leftKey.classList.contains('active')) {
-                    rocketAngle += 0.8; // Increased from 0.5 to 0.8
-                }
-            }, 50);
-        }
-        
-        function deactivateLeftEngine() {
-            leftKey.classList.remove('active');
-            leftFlame.style.opacity = '0';
-            leftFlame.style.height = '30px';
-        }
-        
-        function activateRightEngine() {
-            const now = Date.now();
-            if (now - lastThrustTime < 50) return; // Prevent spam
-            lastThrustTime = now;
-            
-            rightKey.classList.add('active');
-            rightFlame.style.opacity = '1';
-            rightFlame.style.height = '40px';
-            
-            // Apply right thrust: pushes rocket LEFT and creates COUNTER-CLOCKWISE rotation
-            velocityX -= 0.55;  // Increased from 0.35 to 0.55 for faster response
-            angularVelocity -= 1.5; // Increased from 1.0 to 1.5 for faster rotation
-            
-            // Add slight wobble effect
-            setTimeout(() => {
-                if (rightKey.classList.contains('active')) {
-                    rocketAngle -= 0.8; // Increased from 0.5 to 0.8
-                }
-            }, 50);
-        }
-
-        function deactivateRightEngine() {
-            rightKey.classList.remove('active');
-            rightFlame.style.opacity = '0';
-            rightFlame.style.height = '30px';
-        }
-        
-        function updateRocketPosition() {
-            rocket.style.left = (rocketX - 20) + 'px';
-            rocket.style.top = rocketY + 'px';
-            rocket.style.transform = `rotate(${rocketAngle}deg)`;
-            
-            leftFlame.style.left = (rocketX - 25) + 'px';
-            leftFlame.style.top = (rocketY + 35) + 'px';
-            
-            rightFlame.style.left = (rocketX + 5) + 'px';
-            rightFlame.style.top = (rocketY + 35) + 'px';
-            
-            centerFlame.style.left = (rocketX - 12.5) + 'px';
-            centerFlame.style.top = (rocketY + 35) + 'px';
-        }
-        
-        function updateStatus() {
-            status.textContent = `Altitude: ${Math.round(altitude)}ft | Speed: ${Math.round(speed)} mph | Angle: ${Math.round(rocketAngle)}°`;
-            altitudeFill.style.height = (altitude / 300 * 100) + '%';
-        }
-        
-        function showCrash() {
-            crashAnimation.style.display = 'flex';
-            gameRunning = false;
-        }
-        
-        function showSuccess() {
-            successAnimation.style.display = 'flex';
-            gameRunning = false;
-        }
-        
-        // Game loop
-        function gameLoop() {
-            if (!gameRunning) return;
-            
-            // Apply gravity for slow descent
-            velocityY += 0.03; // Increased from 0.025 to 0.03 for slightly faster descent
-            
-            // Apply angular damping (natural stabilization)
-            angularVelocity *= 0.96; // Reduced from 0.97 to 0.96 for less stabilization
-            rocketAngle += angularVelocity;
-            
-            // Apply air resistance for more realistic movement
-            velocityX *= 0.98; // Reduced from 0.985 to 0.98 for less resistance
-            velocityY *= 0.994; // Reduced from 0.995 to 0.994 for slightly faster descent
-            
-            // Update position
-            rocketX += velocityX;
-            rocketY += velocityY;
-            
-            // Update altitude and speed
-            altitude = 300 - rocketY;
-            speed = Math.sqrt(velocityX * velocityX + velocityY * velocityY) * 12;
-            
-            // Boundary checks (allow some movement beyond edges)
-            if (rocketX < -100) {
-                showCrash();
-                return;
-            }
-            if (rocketX > 700) {
-                showCrash();
-                return;
-            }
-            
-            // Ground collision
-            if (rocketY > 315) {
-                rocketY = 315;
-                velocityY = 0;
-                
-                // Check landing success - made more challenging
-                if (Math.abs(rocketAngle) < 5 && Math.abs(velocityX) < 1.0) {
-                    showSuccess();
-                } else {
-                    showCrash();
-                }
-            }
-            
-            // Update rocket position and status
-            updateRocketPosition();
-            updateStatus();
-            
-            // Continue game loop
-            requestAnimationFrame(gameLoop);
-        }
-        
-        // Start the game
-        gameLoop();
-    </script>
+    <script src="{js_url}"></script>
 </body>
 </html>
 """
 
+# Static assets and the page are rendered and compressed once at import
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+STATIC_ASSETS = load_static_assets(STATIC_DIR)
+PAGE = StaticAsset(
+    HTML_TEMPLATE.format(
+        css_url=f"/static/lander.css?v={STATIC_ASSETS['lander.css'].version}",
+        js_url=f"/static/lander.js?v={STATIC_ASSETS['lander.js'].version}",
+    ),
+    "text/html; charset=utf-8",
+)
+
 # Routes
 @app.get("/", response_class=HTMLResponse)
-async def read_root():
+async def read_root(request: Request):
     """Serve the main game page"""
-    return HTML_TEMPLATE
+    return PAGE.response(request)
+
+@app.get("/static/{name}")
+async def static_asset(name: str, request: Request):
+    """Serve a pre-compressed static asset"""
+    asset = STATIC_ASSETS.get(name)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    return asset.response(request)
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
 
+class ActRequest(BaseModel):
+    observation: list[float] = Field(min_length=len(STATE_FIELDS), max_length=len(STATE_FIELDS))
+
+@app.post("/act")
+async def act(request: ActRequest):
+    """Action chosen by the loaded policy for one observation (x, y, angle, vx, vy, angular_velocity)"""
+    if inference is not None:
+        return {"action": await inference.act(request.observation)}
+    if value_table is not None:
+        # A table lookup costs microseconds: answer inline, no batching
+        return {"action": int(value_table([request.observation])[0])}
+    raise HTTPException(status_code=503, detail="No policy loaded (set LANDER_POLICY_PATH or LANDER_VALUE_TABLE)")
+
+@app.get("/act/stats")
+async def act_stats():
+    """Inference batch-size and latency metrics"""
+    if inference is None:
+        raise HTTPException(status_code=503, detail="No policy loaded (set LANDER_POLICY_PATH)")
+    return inference.stats()
+
+@app.get("/value-table")
+async def value_table_export(request: Request):
+    """The value-iteration table in its browser format (ValueTable.to_bytes)"""
+    if VALUE_TABLE_ASSET is None:
+        raise HTTPException(status_code=404, detail="No value table loaded (set LANDER_VALUE_TABLE)")
+    return VALUE_TABLE_ASSET.response(request)
+
+@app.get("/policy-weights")
+async def policy_weights(request: Request):
+    """The trained actor's raw weights for in-browser inference (lander_inference.export_policy_weights)"""
+    if POLICY_WEIGHTS_ASSET is None:
+        raise HTTPException(status_code=404, detail="No browser policy configured (set LANDER_POLICY_WEIGHTS)")
+    return POLICY_WEIGHTS_ASSET.response(request)
+
+@app.post("/demos", status_code=204)
+async def ingest_demos(request: Request):
+    """Queue one chunk of human demonstration ticks for the dataset writer"""
+    if demo_writer is None:
+        raise HTTPException(status_code=404, detail="Demo capture is disabled (set LANDER_DEMO_PATH)")
+    if int(request.headers.get("content-length") or 0) > MAX_CHUNK_BYTES:
+        raise HTTPException(status_code=413, detail="Demonstration chunk too large")
+    body = bytearray()
+    async for part in request.stream():  # chunked uploads declare no length: stop reading at the limit
+        body += part
+        if len(body) > MAX_CHUNK_BYTES:
+            raise HTTPException(status_code=413, detail="Demonstration chunk too large")
+    try:
+        chunk = parse_demo_chunk(bytes(body))
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+    if not demo_writer.submit(chunk):
+        raise HTTPException(status_code=503, detail="Demonstration backlog is full")
+    return Response(status_code=204)
+
+@app.get("/replay")
+async def replay_info():
+    """Describe the served recording"""
+    return {"episodes": len(get_recording()), "frame_fields": FRAME_FIELDS}
+
+@app.get("/replay/{index}")
+async def replay_episode(index: int):
+    """One recorded episode as little-endian float32 frames, one per tick"""
+    recording = get_recording()
+    if not 0 <= index < len(recording):
+        raise HTTPException(status_code=404, detail="Episode not found")
+    return Response(replay_frames(recording.episode(index)), media_type="application/octet-stream")
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus text exposition of the server metrics"""
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled (LANDER_METRICS=0)")
+    return Response(metrics.render(), media_type=CONTENT_TYPE)
+
+@app.get("/sessions")
+async def session_stats():
+    """Live session counts and ticker cost"""
+    return episode_hub.stats()
+
+@app.get("/swarm")
+async def swarm_stats():
+    """Swarm size, outcome totals and ticker cost"""
+    return swarm.stats()
+
+async def _send_frames(websocket, stream):
+    """Forward the stream's shared frame to one socket after every tick"""
+    async for frame in stream.frames():
+        await websocket.send_bytes(frame)
+
+@app.websocket("/ws/episode")
+async def episode_socket(websocket: WebSocket, episode: str = "main", role: str = "spectator"):
+    """Stream a server-side episode as little-endian float32 frames"""
+    await websocket.accept()
+    pilot = role == "pilot"
+    stream = episode_hub.join(episode, pilot)
+    if stream is None:
+        await websocket.close(code=1013, reason="Server is at its session limit")
+        return
+    sender = asyncio.create_task(_send_frames(websocket, stream))
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if pilot and message.get("bytes"):
+                stream.submit(message["bytes"])
+    finally:
+        sender.cancel()
+        episode_hub.leave(stream, pilot)
+
+@app.websocket("/ws/swarm")
+async def swarm_socket(websocket: WebSocket):
+    """Stream every swarm lander's pose and outcome as one packed message per tick"""
+    await websocket.accept()
+    swarm.join()
+    sender = asyncio.create_task(_send_frames(websocket, swarm))
+    try:
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    finally:
+        sender.cancel()
+        swarm.leave()
+
 if __name__ == "__main__":
+    import uvicorn
+
     print("🚀 Starting Realistic Rocket Landing Simulator...")
     print("🎮 Access the game at: http://localhost:8005")
     uvicorn.run(app, host="127.0.0.1", port=8005)
\ No newline at end of file
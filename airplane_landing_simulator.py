@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Server-side Landing Simulator Engine
+Vectorized NumPy port of the browser gameLoop() physics in static/lander.js.
+
+N landers are kept in structure-of-arrays float64 buffers and stepped together.
+Every operation mirrors the JavaScript physics block (same constants, same
+order, same IEEE doubles), so trajectories match the browser bit for bit.
+
+Two step backends share that contract: "numba" runs one fused, JIT-compiled
+pass per lander (no temporaries, one sweep over memory), "numpy" runs the
+same update as a sequence of in-place ufuncs. The Numba backend is used when
+numba is installed; set LANDER_BACKEND=numpy to force the fallback.
+"""
+
+import importlib.util
+import json
+import os
+
+import numpy as np
+
+# Physics constants (mirror PHYSICS in static/lander.js)
+GRAVITY = 0.03
+ANGULAR_DAMPING = 0.96
+DRAG_X = 0.98
+DRAG_Y = 0.994
+THRUST_VELOCITY = 0.55
+THRUST_ANGULAR = 1.5
+WOBBLE_ANGLE = 0.8
+BOUNDARY_LEFT = -100
+BOUNDARY_RIGHT = 700
+GROUND_Y = 315
+LANDING_MAX_ANGLE = 5
+LANDING_MAX_VELOCITY_X = 1.0
+
+# Initial state of createLander()
+START_X = 300
+START_Y = 50
+START_VELOCITY_Y = 0.25
+
+# Fixed timestep shared with the browser loop: one tick is 1/60 s. A held
+# engine thrusts at most once per 50 ms and its wobble lands 50 ms later.
+TICK_RATE = 60
+DT = 1.0 / TICK_RATE
+THRUST_COOLDOWN_TICKS = 3
+WOBBLE_DELAY_TICKS = 3
+
+# Actions: which engine key is held during the tick
+NOOP = 0
+LEFT_ENGINE = 1
+RIGHT_ENGINE = 2
+NUM_ACTIONS = 3
+
+# Episode outcomes
+RUNNING = 0
+LANDED = 1
+CRASHED = 2
+
+STATE_FIELDS = ("x", "y", "angle", "vx", "vy", "angular_velocity")
+
+# Per-lander physics parameters (domain randomization) and their defaults
+DOMAIN_DEFAULTS = {
+    "gravity": GRAVITY,
+    "drag_x": DRAG_X,
+    "drag_y": DRAG_Y,
+    "thrust_velocity": THRUST_VELOCITY,
+    "thrust_angular": THRUST_ANGULAR,
+}
+
+# Per-lander task parameters (how hard the landing is) and their defaults, the
+# browser game's. Unlike DOMAIN_DEFAULTS they are not restored by reset(): a
+# curriculum sets them per lander and they hold until it changes them.
+TASK_DEFAULTS = {
+    "boundary_left": BOUNDARY_LEFT,
+    "boundary_right": BOUNDARY_RIGHT,
+    "landing_max_angle": LANDING_MAX_ANGLE,
+    "landing_max_velocity_x": LANDING_MAX_VELOCITY_X,
+}
+
+# Thrust direction per action: left engine pushes RIGHT (+1), right engine LEFT (-1)
+_DIRECTION = np.array([0, 1, -1], dtype=np.int8)
+
+BACKENDS = ("numba", "numpy")
+
+
+def available_backends():
+    """Step backends usable in this interpreter, fastest first"""
+    return tuple(b for b in BACKENDS if b != "numba" or importlib.util.find_spec("numba") is not None)
+
+
+def default_backend():
+    """LANDER_BACKEND if set, otherwise the fastest available backend"""
+    return os.environ.get("LANDER_BACKEND") or available_backends()[0]
+
+
+def _step_kernel(actions, x, y, angle, vx, vy, angular_velocity,
+                 gravity, drag_x, drag_y, thrust_velocity, thrust_angular,
+                 boundary_left, boundary_right, landing_max_angle, landing_max_velocity_x,
+                 thrust_cooldown, wobble_timer, wobble_direction, outcome, steps, done):
+    """
+    Fused per-lander step: input timers, physics and termination in one pass.
+
+    Same operations in the same order as LanderBatch._step_numpy (and the
+    browser stepTick()), written as scalar code so Numba compiles it to a
+    single loop with no temporaries.
+    """
+    for i in range(x.shape[0]):
+        done[i] = False
+        if outcome[i] != RUNNING:
+            continue
+        action = min(actions[i], RIGHT_ENGINE)
+        direction = 1 if action == LEFT_ENGINE else (-1 if action == RIGHT_ENGINE else 0)
+
+        # Pending wobble: fires if the same engine is still held
+        if wobble_timer[i] > 0:
+            wobble_timer[i] -= 1
+            if wobble_timer[i] == 0 and direction == wobble_direction[i]:
+                angle[i] += direction * WOBBLE_ANGLE
+
+        # Thrust impulse, rate limited by the 50 ms spam guard
+        if thrust_cooldown[i] > 0:
+            thrust_cooldown[i] -= 1
+        if thrust_cooldown[i] == 0 and direction != 0:
+            vx[i] += direction * thrust_velocity[i]
+            angular_velocity[i] += direction * thrust_angular[i]
+            thrust_cooldown[i] = THRUST_COOLDOWN_TICKS
+            wobble_timer[i] = WOBBLE_DELAY_TICKS
+            wobble_direction[i] = direction
+
+        # Gravity, angular damping, air resistance and integration
+        vy[i] += gravity[i]
+        angular_velocity[i] *= ANGULAR_DAMPING
+        angle[i] += angular_velocity[i]
+        vx[i] *= drag_x[i]
+        vy[i] *= drag_y[i]
+        x[i] += vx[i]
+        y[i] += vy[i]
+        steps[i] += 1
+
+        # Boundary checks, then ground collision and landing success
+        if x[i] < boundary_left[i] or x[i] > boundary_right[i]:
+            outcome[i] = CRASHED
+            done[i] = True
+        elif y[i] > GROUND_Y:
+            y[i] = GROUND_Y
+            vy[i] = 0.0
+            if abs(angle[i]) < landing_max_angle[i] and abs(vx[i]) < landing_max_velocity_x[i]:
+                outcome[i] = LANDED
+            else:
+                outcome[i] = CRASHED
+            done[i] = True
+
+
+_compiled_kernel = None
+
+
+def _numba_kernel():
+    """Import numba and compile _step_kernel on first use (cached on disk across runs)"""
+    global _compiled_kernel
+    if _compiled_kernel is None:
+        import numba
+        # fastmath stays off: reassociation would break bit-exactness with the browser
+        _compiled_kernel = numba.njit(cache=True, nogil=True)(_step_kernel)
+    return _compiled_kernel
+
+
+def warm_up(backend=None):
+    """Import and compile the step kernel now instead of on the first step (no-op for numpy)"""
+    if (backend or default_backend()) == "numba":
+        LanderBatch(1, "numba").step(np.zeros(1, dtype=np.uint8))
+
+
+class LanderBatch:
+    """Structure-of-arrays state for N landers stepped in lockstep."""
+
+    def __init__(self, num_landers, backend=None):
+        n = int(num_landers)
+        self.num_landers = n
+        self.backend = backend or default_backend()
+        if self.backend not in available_backends():
+            raise ValueError(f"unknown or unavailable backend {self.backend!r}; available: {available_backends()}")
+
+        # Physical state
+        self.x = np.empty(n, dtype=np.float64)
+        self.y = np.empty(n, dtype=np.float64)
+        self.angle = np.empty(n, dtype=np.float64)
+        self.vx = np.empty(n, dtype=np.float64)
+        self.vy = np.empty(n, dtype=np.float64)
+        self.angular_velocity = np.empty(n, dtype=np.float64)
+
+        # Physics parameters, per lander so episodes can be domain-randomized
+        self.gravity = np.empty(n, dtype=np.float64)
+        self.drag_x = np.empty(n, dtype=np.float64)
+        self.drag_y = np.empty(n, dtype=np.float64)
+        self.thrust_velocity = np.empty(n, dtype=np.float64)
+        self.thrust_angular = np.empty(n, dtype=np.float64)
+
+        # Task parameters: kept across reset(), see TASK_DEFAULTS
+        self.boundary_left = np.full(n, TASK_DEFAULTS["boundary_left"], dtype=np.float64)
+        self.boundary_right = np.full(n, TASK_DEFAULTS["boundary_right"], dtype=np.float64)
+        self.landing_max_angle = np.full(n, TASK_DEFAULTS["landing_max_angle"], dtype=np.float64)
+        self.landing_max_velocity_x = np.full(n, TASK_DEFAULTS["landing_max_velocity_x"], dtype=np.float64)
+
+        # Input timers (ticks) and bookkeeping
+        self.thrust_cooldown = np.empty(n, dtype=np.int8)
+        self.wobble_timer = np.empty(n, dtype=np.int8)
+        self.wobble_direction = np.empty(n, dtype=np.int8)
+        self.outcome = np.empty(n, dtype=np.uint8)
+        self.steps = np.empty(n, dtype=np.int32)
+
+        # Scratch buffers reused by step() so the hot path does not allocate
+        self._direction = np.empty(n, dtype=np.int8)
+        self._impulse = np.empty(n, dtype=np.float64)
+        self._alive = np.empty(n, dtype=bool)
+        self._mask = np.empty(n, dtype=bool)
+        self._mask2 = np.empty(n, dtype=bool)
+        self._crashed = np.empty(n, dtype=bool)
+        self._done = np.empty(n, dtype=bool)
+
+        self.reset()
+
+    def reset(self, mask=None):
+        """Reset all landers, or only those where mask is True, to the start state and default physics"""
+        if mask is None:
+            mask = slice(None)
+        self.x[mask] = START_X
+        self.y[mask] = START_Y
+        self.angle[mask] = 0.0
+        self.vx[mask] = 0.0
+        self.vy[mask] = START_VELOCITY_Y
+        self.angular_velocity[mask] = 0.0
+        for name, value in DOMAIN_DEFAULTS.items():
+            getattr(self, name)[mask] = value
+        self.thrust_cooldown[mask] = 0
+        self.wobble_timer[mask] = 0
+        self.wobble_direction[mask] = 0
+        self.outcome[mask] = RUNNING
+        self.steps[mask] = 0
+
+    @property
+    def running(self):
+        """Boolean mask of landers whose episode is still in progress"""
+        return self.outcome == RUNNING
+
+    def state(self):
+        """Return the physical state as an (N, 6) array in STATE_FIELDS order"""
+        return np.stack([getattr(self, name) for name in STATE_FIELDS], axis=1)
+
+    def step(self, actions):
+        """
+        Advance every running lander by one tick.
+
+        actions holds one of NOOP/LEFT_ENGINE/RIGHT_ENGINE per lander; entries
+        for finished landers are ignored. Returns a boolean mask of landers that
+        terminated on this tick (the buffer is reused by the next call).
+        """
+        if self.backend == "numpy":
+            return self._step_numpy(actions)
+        _numba_kernel()(np.asarray(actions), self.x, self.y, self.angle, self.vx, self.vy, self.angular_velocity,
+                        self.gravity, self.drag_x, self.drag_y, self.thrust_velocity, self.thrust_angular,
+                        self.boundary_left, self.boundary_right, self.landing_max_angle, self.landing_max_velocity_x,
+                        self.thrust_cooldown, self.wobble_timer, self.wobble_direction, self.outcome, self.steps,
+                        self._done)
+        return self._done
+
+    def _step_numpy(self, actions):
+        """step() as a sequence of in-place, masked ufuncs"""
+        alive = np.equal(self.outcome, RUNNING, out=self._alive)
+        direction = np.take(_DIRECTION, actions, out=self._direction, mode="clip")
+        mask = self._mask
+        mask2 = self._mask2
+        impulse = self._impulse
+
+        # Pending wobble: fires if the same engine is still held
+        np.equal(self.wobble_timer, 1, out=mask)
+        np.greater(self.wobble_timer, 0, out=mask2)
+        np.subtract(self.wobble_timer, 1, out=self.wobble_timer, where=mask2)
+        np.logical_and(mask, alive, out=mask)
+        np.equal(direction, self.wobble_direction, out=mask2)
+        np.logical_and(mask, mask2, out=mask)
+        np.multiply(direction, WOBBLE_ANGLE, out=impulse)
+        np.add(self.angle, impulse, out=self.angle, where=mask)
+
+        # Thrust impulse, rate limited by the 50 ms spam guard
+        np.greater(self.thrust_cooldown, 0, out=mask2)
+        np.subtract(self.thrust_cooldown, 1, out=self.thrust_cooldown, where=mask2)
+        np.equal(self.thrust_cooldown, 0, out=mask)
+        np.not_equal(direction, 0, out=mask2)
+        np.logical_and(mask, mask2, out=mask)
+        np.logical_and(mask, alive, out=mask)
+        np.multiply(direction, self.thrust_velocity, out=impulse)
+        np.add(self.vx, impulse, out=self.vx, where=mask)
+        np.multiply(direction, self.thrust_angular, out=impulse)
+        np.add(self.angular_velocity, impulse, out=self.angular_velocity, where=mask)
+        np.copyto(self.thrust_cooldown, THRUST_COOLDOWN_TICKS, where=mask)
+        np.copyto(self.wobble_timer, WOBBLE_DELAY_TICKS, where=mask)
+        np.copyto(self.wobble_direction, direction, where=mask)
+
+        # Gravity, angular damping, air resistance and integration
+        np.add(self.vy, self.gravity, out=self.vy, where=alive)
+        np.multiply(self.angular_velocity, ANGULAR_DAMPING, out=self.angular_velocity, where=alive)
+        np.add(self.angle, self.angular_velocity, out=self.angle, where=alive)
+        np.multiply(self.vx, self.drag_x, out=self.vx, where=alive)
+        np.multiply(self.vy, self.drag_y, out=self.vy, where=alive)
+        np.add(self.x, self.vx, out=self.x, where=alive)
+        np.add(self.y, self.vy, out=self.y, where=alive)
+        np.add(self.steps, 1, out=self.steps, where=alive)
+
+        # Boundary checks
+        crashed = np.less(self.x, self.boundary_left, out=self._crashed)
+        np.greater(self.x, self.boundary_right, out=mask)
+        np.logical_or(crashed, mask, out=crashed)
+        np.logical_and(crashed, alive, out=crashed)
+
+        # Ground collision (only for landers still inside the boundaries)
+        ground = np.greater(self.y, GROUND_Y, out=mask)
+        np.logical_and(ground, alive, out=ground)
+        np.logical_and(ground, np.logical_not(crashed, out=mask2), out=ground)
+        np.copyto(self.y, GROUND_Y, where=ground)
+        np.copyto(self.vy, 0.0, where=ground)
+
+        # Landing success: |angle| and |vx| under the lander's thresholds, otherwise a crash
+        np.abs(self.angle, out=impulse)
+        np.less(impulse, self.landing_max_angle, out=mask2)
+        np.logical_and(ground, mask2, out=mask2)
+        np.abs(self.vx, out=impulse)
+        np.less(impulse, self.landing_max_velocity_x, out=self._done)
+        np.logical_and(mask2, self._done, out=mask2)
+        np.copyto(self.outcome, LANDED, where=mask2)
+        np.logical_xor(ground, mask2, out=ground)
+        np.logical_or(crashed, ground, out=crashed)
+        np.copyto(self.outcome, CRASHED, where=crashed)
+
+        done = np.logical_or(crashed, mask2, out=self._done)
+        return done
+
+
+def check_golden(path, backend=None):
+    """
+    Replay golden trajectories recorded from the browser physics and compare.
+
+    Returns a list of mismatch descriptions; an empty list means every state
+    and outcome matched exactly.
+    """
+    with open(path) as f:
+        golden = json.load(f)
+
+    trajectories = golden["trajectories"]
+    batch = LanderBatch(len(trajectories), backend)
+    max_ticks = max(len(t["actions"]) for t in trajectories)
+    actions = np.zeros((max_ticks, len(trajectories)), dtype=np.int8)
+    for i, t in enumerate(trajectories):
+        actions[:len(t["actions"]), i] = t["actions"]
+
+    outcome_codes = {"running": RUNNING, "landed": LANDED, "crashed": CRASHED}
+    mismatches = []
+    for tick in range(max_ticks):
+        batch.step(actions[tick])
+        state = batch.state()
+        for i, t in enumerate(trajectories):
+            if tick < len(t["states"]) and state[i].tolist() != t["states"][tick]:
+                mismatches.append(f"trajectory {i} tick {tick}: {state[i].tolist()} != {t['states'][tick]}")
+    for i, t in enumerate(trajectories):
+        if batch.outcome[i] != outcome_codes[t["outcome"]]:
+            mismatches.append(f"trajectory {i}: outcome {int(batch.outcome[i])} != {t['outcome']}")
+    return mismatches
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the airplane lander.
+
+Measures the physics step (scalar and batched, per engine backend), the
+Gymnasium env overhead on top of the raw physics, HTTP latency of `/` and
+`/health` through an in-process ASGI client, WebSocket frame throughput
+against a real server, and the import time of airplane_lander.py. Results
+are printed and written as one JSON document so runs can be compared across
+releases.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from airplane_landing_simulator import (  # noqa: E402
+    LanderBatch,
+    NUM_ACTIONS,
+    RUNNING,
+    TICK_RATE,
+    available_backends,
+)
+
+SECTIONS = ("physics", "env", "http", "websocket", "import")
+
+
+def log(*args):
+    """Progress output goes to stderr so stdout stays valid JSON"""
+    print(*args, file=sys.stderr)
+
+
+def _percentiles(samples_ms):
+    """Latency summary in milliseconds"""
+    values = np.asarray(samples_ms, dtype=np.float64)
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {"p50_ms": float(p50), "p90_ms": float(p90), "p99_ms": float(p99),
+            "mean_ms": float(values.mean()), "max_ms": float(values.max())}
+
+
+def _step_rate(step, reset, n, ticks):
+    """Steps/sec of step(actions) over `ticks` ticks of random actions with periodic autoreset"""
+    rng = np.random.default_rng(0)
+    actions = rng.integers(0, NUM_ACTIONS, size=(64, n), dtype=np.uint8)
+    step(actions[0])  # warm-up (JIT compilation, first-touch allocation)
+    start = time.perf_counter()
+    for tick in range(ticks):
+        step(actions[tick % 64])
+        if tick % 64 == 63:
+            reset()
+    return n * ticks / (time.perf_counter() - start)
+
+
+def bench_physics(batch_sizes, ticks):
+    """Lander-steps/sec per backend and batch size (N=1 is the scalar case)"""
+    results = {}
+    for backend in available_backends():
+        rates = {}
+        for n in batch_sizes:
+            batch = LanderBatch(n, backend)
+            rate = _step_rate(batch.step, lambda: batch.reset(batch.outcome != RUNNING), n, ticks)
+            rates[str(n)] = rate
+            log(f"   physics  {backend:>6} N={n:>7}: {rate / 1e6:9.3f} M steps/sec")
+        results[backend] = rates
+    return results
+
+
+def bench_env(env_sizes, ticks):
+    """Gymnasium VectorEnv steps/sec against raw LanderBatch steps at the same size"""
+    from env.mountain_car_plane_env import MountainCarPlaneVectorEnv
+
+    results = {}
+    for n in env_sizes:
+        batch = LanderBatch(n)
+        raw = _step_rate(batch.step, lambda: batch.reset(batch.outcome != RUNNING), n, ticks)
+        env = MountainCarPlaneVectorEnv(n)
+        env.reset(seed=0)
+        wrapped = _step_rate(env.step, lambda: None, n, ticks)
+        env.close()
+        results[str(n)] = {"physics_steps_per_sec": raw, "env_steps_per_sec": wrapped,
+                           "overhead_us_per_step": (1 / wrapped - 1 / raw) * n * 1e6}
+        log(f"   env      N={n:>7}: {wrapped / 1e6:9.3f} M steps/sec "
+            f"(physics {raw / 1e6:.3f} M, +{results[str(n)]['overhead_us_per_step']:.1f} µs per batch step)")
+    return results
+
+
+def bench_http(requests):
+    """Latency percentiles of / and /health through an in-process ASGI client"""
+    import httpx
+
+    from airplane_lander import app
+
+    async def measure():
+        transport = httpx.ASGITransport(app=app)
+        results = {}
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for path, headers in (("/", {"accept-encoding": "br, gzip"}), ("/health", {})):
+                await client.get(path, headers=headers)
+                samples = []
+                for _ in range(requests):
+                    start = time.perf_counter()
+                    response = await client.get(path, headers=headers)
+                    samples.append((time.perf_counter() - start) * 1000.0)
+                    response.raise_for_status()
+                results[path] = dict(_percentiles(samples), bytes=len(response.content))
+                log(f"   http     {path:<8} p50 {results[path]['p50_ms']:.3f} ms, "
+                    f"p99 {results[path]['p99_ms']:.3f} ms, {results[path]['bytes']} bytes")
+        return results
+
+    return asyncio.run(measure())
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def bench_websocket(clients, seconds):
+    """Frames/sec delivered to `clients` spectators of one episode over a real socket"""
+    try:
+        import websockets
+    except ImportError:
+        log("   websocket: skipped (pip install -r requirements-extra.txt)")
+        return {"skipped": "websockets is not installed"}
+    import uvicorn
+
+    from airplane_lander import app
+    from lander_stream import FRAME_SIZE
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+
+    async def spectate(url, stop, counts, index):
+        async with websockets.connect(url) as ws:
+            while time.perf_counter() < stop:
+                frame = await ws.recv()
+                if len(frame) == FRAME_SIZE:
+                    counts[index] += 1
+
+    async def measure():
+        url = f"ws://127.0.0.1:{port}/ws/episode?episode=bench"
+        counts = [0] * clients
+        stop = time.perf_counter() + seconds
+        await asyncio.gather(*(spectate(url, stop, counts, i) for i in range(clients)))
+        return counts
+
+    try:
+        counts = asyncio.run(measure())
+    finally:
+        server.should_exit = True
+        thread.join()
+    total = sum(counts)
+    result = {"clients": clients, "seconds": seconds, "frames_per_sec": total / seconds,
+              "frames_per_client_per_sec": total / seconds / clients, "tick_rate": TICK_RATE}
+    log(f"   websocket {clients} clients: {result['frames_per_sec']:,.0f} frames/sec "
+        f"({result['frames_per_client_per_sec']:.1f} per client, tick rate {TICK_RATE})")
+    return result
+
+
+def bench_import(repeats):
+    """Wall time of a fresh interpreter importing airplane_lander"""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import airplane_lander"], cwd=REPO_ROOT, check=True)
+        samples.append((time.perf_counter() - start) * 1000.0)
+    baseline = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        baseline.append((time.perf_counter() - start) * 1000.0)
+    result = {"import_ms": statistics.median(samples), "interpreter_ms": statistics.median(baseline),
+              "samples_ms": samples}
+    log(f"   import   airplane_lander: {result['import_ms']:.0f} ms (bare interpreter {result['interpreter_ms']:.0f} ms)")
+    return result
+
+
+def environment():
+    """Machine and version details recorded with every run"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "backends": list(available_backends()),
+    }
+
+
+def main():
+    """Main function for the benchmark suite"""
+    parser = argparse.ArgumentParser(description="Airplane lander benchmark suite")
+    parser.add_argument("--only", nargs="+", choices=SECTIONS, default=list(SECTIONS))
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 1000, 10000, 100000])
+    parser.add_argument("--env-sizes", type=int, nargs="+", default=[1, 256, 4096])
+    parser.add_argument("--ticks", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--ws-clients", type=int, default=100)
+    parser.add_argument("--ws-seconds", type=float, default=5.0)
+    parser.add_argument("--import-repeats", type=int, default=5)
+    parser.add_argument("--output", metavar="PATH", help="write the JSON results to PATH (default: stdout)")
+    args = parser.parse_args()
+
+    log("📏 Airplane Lander Benchmarks")
+    results = {"environment": environment()}
+    runners = {
+        "physics": lambda: bench_physics(args.batch_sizes, args.ticks),
+        "env": lambda: bench_env(args.env_sizes, args.ticks),
+        "http": lambda: bench_http(args.requests),
+        "websocket": lambda: bench_websocket(args.ws_clients, args.ws_seconds),
+        "import": lambda: bench_import(args.import_repeats),
+    }
+    for section in SECTIONS:
+        if section in args.only:
+            results[section] = runners[section]()
+
+    document = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(document + "\n")
+        log(f"💾 Results written to {args.output}")
+    else:
+        print(document)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Gymnasium vector environment for the airplane lander.
+
+The whole batch is stepped with array operations on a single LanderBatch from
+airplane_landing_simulator.py; there are no per-environment gym.Env objects
+and no Python loop over environments. Observation, reward and termination
+buffers are allocated once and reused by every step.
+"""
+
+import numpy as np
+import gymnasium as gym
+from gymnasium import spaces
+from gymnasium.utils import seeding
+from gymnasium.vector import AutoresetMode, VectorEnv
+from gymnasium.vector.utils import batch_space
+
+from airplane_landing_simulator import (
+    CRASHED,
+    GROUND_Y,
+    LANDED,
+    LanderBatch,
+    NUM_ACTIONS,
+    START_X,
+    STATE_FIELDS,
+    TASK_DEFAULTS,
+)
+from lander_randomization import LanderRandomizer
+
+# Reward shaping
+LANDING_REWARD = 100.0
+CRASH_REWARD = -100.0
+DISTANCE_PENALTY = 0.01   # per tick, per 100 px from the pad centre
+ANGLE_PENALTY = 0.01      # per tick, per 10 degrees of tilt
+
+OBS_DIM = len(STATE_FIELDS)
+Y_COLUMN = STATE_FIELDS.index("y")
+# x is unbounded: the crash boundaries are per-environment task parameters
+# (TASK_DEFAULTS) that a curriculum may widen or narrow at any step
+OBS_LOW = np.array([-np.inf, -np.inf, -np.inf, -np.inf, -np.inf, -np.inf], dtype=np.float32)
+OBS_HIGH = np.array([np.inf, GROUND_Y, np.inf, np.inf, np.inf, np.inf], dtype=np.float32)
+
+# Per-environment shape and dtype of every output buffer
+BUFFER_SPECS = {
+    "observations": ((OBS_DIM,), np.float32),
+    "final_observations": ((OBS_DIM,), np.float32),
+    "rewards": ((), np.float32),
+    "terminated": ((), np.bool_),
+    "truncated": ((), np.bool_),
+    "done": ((), np.bool_),
+    "outcome": ((), np.uint8),
+}
+
+
+class MountainCarPlaneVectorEnv(VectorEnv):
+    """
+    Batched lander environment with same-step autoreset.
+
+    Observations are (x, y, angle, vx, vy, angular_velocity) as float32, the
+    action is Discrete(3): 0 = no engine, 1 = left engine, 2 = right engine.
+    When an episode ends the environment is reset within the same step; the
+    last observation is in info["final_obs"] (masked by info["_final_obs"])
+    and the engine outcome code in info["outcome"].
+
+    The arrays returned by reset() and step() are reused by the next call;
+    copy them if they need to outlive it. ``buffers`` may supply any of those
+    arrays up front (keys as in BUFFER_SPECS), e.g. views into shared memory
+    so that a worker process writes its results directly where they are read.
+    An optional lander_recording.EpisodeRecorder receives every transition.
+
+    ``randomization`` maps lander_randomization.FIELDS (start state and
+    physics parameters) to (low, high) ranges drawn at every reset. reset()
+    seeds accept an int (environment i then behaves as global environment
+    first_env + i, independent of how environments are split across
+    processes) or one seed per environment.
+
+    ``task`` may supply the engine's per-environment task parameters
+    (TASK_DEFAULTS names: crash boundaries and landing thresholds) as
+    float64 arrays, e.g. shared memory written by a curriculum in the
+    parent process; they are read on every step and survive resets.
+    """
+
+    metadata = {"render_modes": [], "autoreset_mode": AutoresetMode.SAME_STEP}
+
+    def __init__(self, num_envs=256, max_episode_steps=1000, buffers=None, recorder=None,
+                 randomization=None, first_env=0, task=None):
+        self.num_envs = int(num_envs)
+        self.max_episode_steps = int(max_episode_steps)
+
+        self.single_observation_space = spaces.Box(OBS_LOW, OBS_HIGH, dtype=np.float32)
+        self.single_action_space = spaces.Discrete(NUM_ACTIONS)
+        self.observation_space = batch_space(self.single_observation_space, self.num_envs)
+        self.action_space = batch_space(self.single_action_space, self.num_envs)
+
+        self.lander = LanderBatch(self.num_envs)
+        for name, array in (task or {}).items():
+            setattr(self.lander, name, array)
+        self.task = {name: getattr(self.lander, name) for name in TASK_DEFAULTS}
+        self.recorder = recorder
+        self.randomizer = LanderRandomizer(self.num_envs, randomization, first_env=first_env)
+
+        # Buffers handed back to the caller
+        buffers = dict(buffers or {})
+        for name, (shape, dtype) in BUFFER_SPECS.items():
+            if name not in buffers:
+                buffers[name] = np.zeros((self.num_envs, *shape), dtype=dtype)
+        self._observations = buffers["observations"]
+        self._final_observations = buffers["final_observations"]
+        self._rewards = buffers["rewards"]
+        self._terminated = buffers["terminated"]
+        self._truncated = buffers["truncated"]
+        self._done = buffers["done"]
+        self._outcome = buffers["outcome"]
+
+        # Scratch for the reward computation
+        self._scratch = np.zeros(self.num_envs, dtype=np.float64)
+
+    def reset(self, *, seed=None, options=None):
+        """Reset every environment and return the initial observations"""
+        if seed is not None:
+            self.randomizer.seed(seed)
+            self._np_random, self._np_random_seed = seeding.np_random(seed if np.ndim(seed) == 0 else None)
+        self.lander.reset()
+        self.randomizer.apply(self.lander)
+        if self.recorder is not None:
+            self.recorder.begin(self.lander)
+        self._write_observations(self._observations)
+        return self._observations, {}
+
+    def step(self, actions):
+        """Step the whole batch; finished environments are reset in place"""
+        lander = self.lander
+        actions = np.asarray(actions)
+        terminated = lander.step(actions)
+        np.copyto(self._terminated, terminated)
+        np.greater_equal(lander.steps, self.max_episode_steps, out=self._truncated)
+        np.logical_and(self._truncated, np.logical_not(terminated, out=self._done), out=self._truncated)
+        self._compute_rewards()
+
+        info = {}
+        done = np.logical_or(self._terminated, self._truncated, out=self._done)
+        if self.recorder is not None:
+            self.recorder.record(lander, actions, self._rewards, done, self._truncated)
+        if done.any():
+            self._write_observations(self._final_observations)
+            np.copyto(self._outcome, lander.outcome)
+            lander.reset(done)
+            self.randomizer.apply(lander, done)
+            if self.recorder is not None:
+                self.recorder.begin(lander, done)
+            info = {
+                "final_obs": self._final_observations,
+                "_final_obs": done,
+                "outcome": self._outcome,
+                "_outcome": done,
+            }
+        self._write_observations(self._observations)
+        return self._observations, self._rewards, self._terminated, self._truncated, info
+
+    def close_extras(self, **kwargs):
+        """Finalize the recording file, if any"""
+        if self.recorder is not None:
+            self.recorder.close()
+
+    def _write_observations(self, out):
+        """Copy the engine state into an (num_envs, 6) float32 buffer"""
+        for column, name in enumerate(STATE_FIELDS):
+            out[:, column] = getattr(self.lander, name)
+        # A boundary crash on the tick the lander sinks below the ground is not
+        # snapped to GROUND_Y by the engine; keep the observation in the space
+        np.minimum(out[:, Y_COLUMN], GROUND_Y, out=out[:, Y_COLUMN])
+
+    def _compute_rewards(self):
+        """Shaped reward: distance/tilt penalty per tick plus terminal bonus"""
+        lander = self.lander
+        scratch = self._scratch
+        rewards = self._rewards
+
+        np.subtract(lander.x, START_X, out=scratch)
+        np.abs(scratch, out=scratch)
+        np.multiply(scratch, -DISTANCE_PENALTY / 100.0, out=scratch)
+        np.copyto(rewards, scratch, casting="same_kind")
+        np.abs(lander.angle, out=scratch)
+        np.multiply(scratch, -ANGLE_PENALTY / 10.0, out=scratch)
+        np.add(rewards, scratch, out=rewards, casting="same_kind")
+
+        landed = np.equal(lander.outcome, LANDED, out=self._done)
+        np.add(rewards, LANDING_REWARD, out=rewards, where=landed)
+        crashed = np.equal(lander.outcome, CRASHED, out=self._done)
+        np.add(rewards, CRASH_REWARD, out=rewards, where=crashed)
+
+
+gym.register(
+    id="MountainCarPlane-v0",
+    vector_entry_point=MountainCarPlaneVectorEnv,
+)
@@ -0,0 +1,71 @@
+#!/usr/bin/env node
+/*
+ * Golden trajectory generator for the lander physics.
+ *
+ * Extracts the physics block from static/lander.js (the page script), drives
+ * its fixed 60 Hz stepTick() with scripted and pseudo-random held-engine
+ * sequences, and prints the resulting trajectories as JSON.
+ * airplane_landing_simulator.check_golden() replays the recorded actions and
+ * requires every state to match exactly.
+ *
+ * Usage: node golden/make_golden.js > golden/lander_trajectories.json
+ */
+
+const fs = require('fs');
+const path = require('path');
+
+const source = fs.readFileSync(path.join(__dirname, '..', 'static', 'lander.js'), 'utf8');
+const begin = source.indexOf('// --- physics:begin ---');
+const end = source.indexOf('// --- physics:end ---');
+const physics = new Function(
+    source.slice(begin, end) + 'return { PHYSICS, createLander, createControls, stepTick };'
+)();
+
+const MAX_TICKS = 600;
+
+function runEpisode(policy) {
+    const lander = physics.createLander();
+    const controls = physics.createControls();
+    const actions = [];
+    const states = [];
+    let outcome = 'running';
+
+    for (let tick = 0; tick < MAX_TICKS && outcome === 'running'; tick++) {
+        const action = policy(tick, lander);
+        actions.push(action);
+        outcome = physics.stepTick(lander, controls, action);
+        states.push([lander.x, lander.y, lander.angle, lander.vx, lander.vy, lander.angularVelocity]);
+    }
+    return { actions, states, outcome };
+}
+
+// Deterministic LCG so the golden file is reproducible
+function makeRandomPolicy(seed, holdTicks) {
+    let state = seed >>> 0;
+    let current = 0;
+    return function(tick) {
+        if (tick % holdTicks === 0) {
+            state = (Math.imul(state, 1664525) + 1013904223) >>> 0;
+            current = state % 3;
+        }
+        return current;
+    };
+}
+
+const policies = [
+    () => 0,                                    // free fall onto the pad
+    () => 1,                                    // left engine held
+    () => 2,                                    // right engine held
+    (tick) => (tick < 12 ? 1 : 0),              // short burn then coast
+    (tick) => (tick % 8 < 4 ? 1 : 2),           // alternating engines
+    (tick) => (tick % 7 === 0 ? 2 : 0),         // taps released before the wobble
+    (tick, lander) => (lander.angle > 1 ? 2 : lander.angle < -1 ? 1 : 0),
+    makeRandomPolicy(1, 1),
+    makeRandomPolicy(2, 3),
+    makeRandomPolicy(3, 5),
+    makeRandomPolicy(4, 9),
+    makeRandomPolicy(5, 2),
+];
+
+const trajectories = policies.map(runEpisode);
+process.stdout.write(JSON.stringify({ tick_rate: 60, trajectories }) + '\n');
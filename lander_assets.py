@@ -0,0 +1,121 @@
+"""
+Pre-compressed static assets with strong ETags.
+
+Every asset is read and fingerprinted at import time and compressed once,
+on first use or by a background warm-up (gzip, plus brotli from the
+`brotli` package in requirements.txt; without it only gzip is served).
+Requests pick the smallest variant
+the client accepts, get a strong per-variant ETag and Cache-Control, and a
+matching If-None-Match is answered with 304 and no body.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Fingerprinted URLs (?v=<hash>) never change content, so they can be cached forever
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+
+class StaticAsset:
+    """One asset with its identity, gzip and brotli representations"""
+
+    def __init__(self, content, media_type, cache_control=REVALIDATE_CACHE):
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.content = content
+        self.version = hashlib.sha256(content).hexdigest()[:16]
+        self._variants = None
+
+    @property
+    def variants(self):
+        """content-coding -> (body, strong ETag); compressed on first use, not at import"""
+        if self._variants is None:
+            content = self.content
+            variants = {"identity": (content, f'"{self.version}"')}
+            compressed = gzip.compress(content, compresslevel=9, mtime=0)
+            if len(compressed) < len(content):
+                variants["gzip"] = (compressed, f'"{self.version}-gz"')
+            if brotli is not None:
+                compressed = brotli.compress(content, quality=11)
+                if len(compressed) < len(content):
+                    variants["br"] = (compressed, f'"{self.version}-br"')
+            self._variants = variants
+        return self._variants
+
+    @classmethod
+    def from_file(cls, path, cache_control=IMMUTABLE_CACHE):
+        """Load an asset from disk, guessing its media type from the extension"""
+        media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if media_type.startswith("text/") or media_type.endswith("javascript"):
+            media_type += "; charset=utf-8"
+        with open(path, "rb") as f:
+            return cls(f.read(), media_type, cache_control)
+
+    def select(self, accept_encoding):
+        """Pick the smallest representation allowed by an Accept-Encoding header"""
+        accepted = _parse_accept_encoding(accept_encoding)
+        coding = "identity"
+        for candidate in ("br", "gzip"):
+            if candidate in self.variants and accepted.get(candidate, accepted.get("*", 0)) > 0:
+                if len(self.variants[candidate][0]) < len(self.variants[coding][0]):
+                    coding = candidate
+        return coding
+
+    def response(self, request: Request):
+        """Serve the asset for a request, honouring Accept-Encoding and If-None-Match"""
+        coding = self.select(request.headers.get("accept-encoding", ""))
+        body, etag = self.variants[coding]
+        cache_control = self.cache_control
+        if cache_control == IMMUTABLE_CACHE and request.query_params.get("v") != self.version:
+            cache_control = REVALIDATE_CACHE  # only the fingerprinted URL may be cached forever
+        headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+        if coding != "identity":
+            headers["Content-Encoding"] = coding
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if etag in tags or "*" in tags:
+                return Response(status_code=304, headers=headers)
+        return Response(body, media_type=self.media_type, headers=headers)
+
+
+def _parse_accept_encoding(header):
+    """Map each coding in an Accept-Encoding header to its q-value"""
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def load_static_assets(directory):
+    """Load every file in a directory as an immutable, pre-compressed asset"""
+    assets = {}
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            assets[name] = StaticAsset.from_file(path)
+    return assets
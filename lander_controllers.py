@@ -0,0 +1,58 @@
+"""
+Scripted controllers for the lander engine.
+
+A controller maps a batch of observations (N, 6) in STATE_FIELDS order to N
+actions, like the batched function returned by lander_inference.load_policy(),
+so evaluation and serving code can use either interchangeably.
+"""
+
+import numpy as np
+
+from airplane_landing_simulator import (
+    ANGULAR_DAMPING,
+    GROUND_Y,
+    LEFT_ENGINE,
+    NUM_ACTIONS,
+    RIGHT_ENGINE,
+    THRUST_ANGULAR,
+)
+
+
+def noop_controller(observations):
+    """Never fire an engine"""
+    return np.zeros(len(observations), dtype=np.uint8)
+
+
+def random_controller(seed=None):
+    """Uniformly random engine presses from a seeded generator"""
+    rng = np.random.default_rng(seed)
+
+    def act(observations):
+        return rng.integers(0, NUM_ACTIONS, size=len(observations), dtype=np.uint8)
+
+    return act
+
+
+def attitude_controller(observations, margin=0.5):
+    """
+    Fire whichever engine brings the predicted touchdown angle closest to 0.
+
+    The angle at touchdown is extrapolated from the current angular velocity
+    under damping over the estimated ticks left to the ground; an engine is
+    fired only if its angular impulse improves that prediction by `margin`
+    degrees. Horizontal drift is left to drag.
+    """
+    y = observations[:, 1]
+    angle = observations[:, 2]
+    vy = observations[:, 4]
+    angular_velocity = observations[:, 5]
+
+    ticks = np.maximum((GROUND_Y - y) / np.maximum(vy, 0.5), 0.0)
+    gain = ANGULAR_DAMPING * (1.0 - ANGULAR_DAMPING ** ticks) / (1.0 - ANGULAR_DAMPING)
+    predicted = angle + angular_velocity * gain
+    impulse = THRUST_ANGULAR * gain
+
+    actions = np.zeros(len(observations), dtype=np.uint8)
+    actions[(predicted > 0) & (np.abs(predicted - impulse) + margin < np.abs(predicted))] = RIGHT_ENGINE
+    actions[(predicted < 0) & (np.abs(predicted + impulse) + margin < np.abs(predicted))] = LEFT_ENGINE
+    return actions
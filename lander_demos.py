@@ -0,0 +1,254 @@
+"""
+Human demonstrations captured in the browser.
+
+The page buffers one row per human-flown tick in a Float32Array (the tick,
+the state the player saw, the engine they held) and POSTs a chunk every
+few seconds and at the end of the episode, so the server sees a handful of
+requests per game instead of one per key press. Chunk layout:
+
+    DEMO_MAGIC, uint32 header length, JSON header padded to 4 bytes
+    {"session": 16 hex digits, "episode": n, "outcome": null | "landed" | "crashed"},
+    then little-endian float32 rows in DEMO_ROW_FIELDS order
+
+A DemoWriter appends chunks to a columnar dataset: one raw little-endian
+file per column, plus an episode table of outcomes. submit() only queues
+the parsed chunk; a single background thread concatenates everything
+queued and appends it with one write per column, so the event loop never
+waits on disk. Every server process writes its own shard directory, so
+several workers can share one dataset root without coordination.
+load_demonstrations() filters every shard through its memory maps by
+episode outcome and returns the kept (observation, action) pairs for
+behavior cloning.
+"""
+
+import json
+import os
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from airplane_landing_simulator import CRASHED, LANDED, NUM_ACTIONS, STATE_FIELDS
+
+DEMO_MAGIC = b"LDM1"
+DEMO_ROW_FIELDS = ("tick",) + STATE_FIELDS + ("action",)
+DEMO_ROW_DTYPE = np.dtype("<f4")
+DEMO_ROW_SIZE = len(DEMO_ROW_FIELDS) * DEMO_ROW_DTYPE.itemsize
+MAX_CHUNK_ROWS = 4096
+MAX_CHUNK_BYTES = 1024 + MAX_CHUNK_ROWS * DEMO_ROW_SIZE
+OUTCOMES = {"landed": LANDED, "crashed": CRASHED}
+
+# Dataset columns: name -> (dtype, per-row shape); one file <name>.bin each
+COLUMNS = {
+    "session": (np.dtype("<u8"), ()),
+    "episode": (np.dtype("<u4"), ()),
+    "tick": (np.dtype("<u4"), ()),
+    "observation": (np.dtype("<f4"), (len(STATE_FIELDS),)),
+    "action": (np.dtype("u1"), ()),
+}
+EPISODE_DTYPE = np.dtype([("session", "<u8"), ("episode", "<u4"), ("outcome", "u1")])
+EPISODES_FILE = "episodes.bin"
+SHARD_PREFIX = "shard-"
+
+
+def parse_demo_chunk(data):
+    """Validate one uploaded chunk; returns its columns and outcome, or raises ValueError"""
+    if len(data) < 8 or data[:4] != DEMO_MAGIC:
+        raise ValueError("not a demonstration chunk")
+    (header_length,) = struct.unpack_from("<I", data, 4)
+    if header_length % 4 or 8 + header_length > len(data):
+        raise ValueError("bad header length")
+    try:
+        header = json.loads(data[8:8 + header_length])
+        session = int(header["session"], 16)
+        episode = header["episode"]
+        outcome = header.get("outcome")
+    except (ValueError, KeyError, TypeError, AttributeError) as error:
+        raise ValueError(f"bad header: {error!r}") from None
+    if isinstance(episode, bool) or not isinstance(episode, int):
+        raise ValueError(f"episode must be an integer, got {episode!r}")
+    if not 0 <= session < 2 ** 64 or not 0 <= episode < 2 ** 32:
+        raise ValueError("session or episode out of range")
+    if outcome is not None and not (isinstance(outcome, str) and outcome in OUTCOMES):
+        raise ValueError(f"unknown outcome {outcome!r}")
+
+    payload = len(data) - 8 - header_length
+    if payload % DEMO_ROW_SIZE or payload // DEMO_ROW_SIZE > MAX_CHUNK_ROWS:
+        raise ValueError("payload is not a whole number of rows (or too many)")
+    rows = np.frombuffer(data, DEMO_ROW_DTYPE, offset=8 + header_length).reshape(-1, len(DEMO_ROW_FIELDS))
+    ticks, actions = rows[:, 0], rows[:, -1]
+    if not np.isfinite(rows).all() or (ticks < 0).any() or (ticks >= 2 ** 24).any():
+        raise ValueError("rows hold non-finite values or bad ticks")
+    if ((actions != np.round(actions)) | (actions < 0) | (actions >= NUM_ACTIONS)).any():
+        raise ValueError("bad actions")
+    n = len(rows)
+    return {
+        "columns": {
+            "session": np.full(n, session, dtype=COLUMNS["session"][0]),
+            "episode": np.full(n, episode, dtype=COLUMNS["episode"][0]),
+            "tick": ticks.astype(COLUMNS["tick"][0]),
+            "observation": rows[:, 1:-1].astype(COLUMNS["observation"][0]),
+            "action": actions.astype(COLUMNS["action"][0]),
+        },
+        "outcome": None if outcome is None else (session, episode, OUTCOMES[outcome]),
+    }
+
+
+class DemoWriter:
+    """
+    Append demonstration chunks to this process's shard of a dataset root.
+
+    submit() is cheap and thread-safe; it returns False (and drops the
+    chunk) when more than max_pending_rows are already waiting for disk.
+    Rows that fail to write are reported and counted in rows_lost.
+    """
+
+    def __init__(self, root, max_pending_rows=1 << 20):
+        self.root = root
+        self.max_pending_rows = int(max_pending_rows)
+        self.shard = None  # created on the first write
+        self.rows_written = 0
+        self.episodes_written = 0
+        self.chunks_dropped = 0
+        self.rows_lost = 0  # accepted by submit() but failed to write
+        self._pending = []
+        self._pending_rows = 0
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lander-demos")
+
+    def submit(self, chunk):
+        """Queue a parse_demo_chunk() result for the writer thread"""
+        rows = len(chunk["columns"]["action"])
+        with self._lock:
+            if self._pending_rows + rows > self.max_pending_rows:
+                self.chunks_dropped += 1
+                return False
+            self._pending.append(chunk)
+            self._pending_rows += rows
+            schedule = not self._scheduled
+            self._scheduled = True
+        if schedule:
+            self._executor.submit(self._flush)
+        return True
+
+    def _open_shard(self):
+        shard = os.path.join(self.root, f"{SHARD_PREFIX}{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}")
+        os.makedirs(shard, exist_ok=True)
+        meta = {name: {"dtype": dtype.str, "shape": list(shape)} for name, (dtype, shape) in COLUMNS.items()}
+        with open(os.path.join(shard, "meta.json"), "w") as f:
+            json.dump({"columns": meta, "episode_dtype": EPISODE_DTYPE.descr}, f, indent=2)
+        self.shard = shard
+
+    def _flush(self):
+        """Writer thread: append everything queued so far, one write per column"""
+        with self._lock:
+            chunks, self._pending = self._pending, []
+            self._pending_rows = 0
+            self._scheduled = False
+        if not chunks:
+            return
+        rows = sum(len(chunk["columns"]["action"]) for chunk in chunks)
+        outcomes = [chunk["outcome"] for chunk in chunks if chunk["outcome"] is not None]
+        try:
+            self._append(chunks, outcomes)
+        except Exception as error:  # disk full, permissions: the rows are gone, but counted and reported
+            self.rows_lost += rows
+            print(f"✗ Demonstration writer lost {rows} rows: {error!r}")
+            return
+        self.rows_written += rows
+        self.episodes_written += len(outcomes)
+
+    def _append(self, chunks, outcomes):
+        """Append to every column file; on failure cut them all back so the columns stay aligned"""
+        if self.shard is None:
+            self._open_shard()
+        paths = [os.path.join(self.shard, f"{name}.bin") for name in COLUMNS]
+        paths.append(os.path.join(self.shard, EPISODES_FILE))
+        sizes = [os.path.getsize(path) if os.path.exists(path) else 0 for path in paths]
+        try:
+            for name, path in zip(COLUMNS, paths):
+                with open(path, "ab") as f:
+                    np.concatenate([chunk["columns"][name] for chunk in chunks]).tofile(f)
+            if outcomes:
+                with open(paths[-1], "ab") as f:
+                    np.array(outcomes, dtype=EPISODE_DTYPE).tofile(f)
+        except Exception:
+            for path, size in zip(paths, sizes):
+                if os.path.exists(path):
+                    try:
+                        os.truncate(path, size)
+                    except OSError:
+                        pass
+            raise
+
+    def close(self):
+        """Write whatever is still queued and stop the writer thread"""
+        self._executor.submit(self._flush)
+        self._executor.shutdown(wait=True)
+
+
+def _read_shard(shard, outcomes):
+    """
+    Memory-map one shard's columns, cut to the rows every column has (a write
+    may have been interrupted), and keep the rows of episodes that ended in
+    one of outcomes (None keeps every row). Only kept rows are copied.
+    """
+    columns = {}
+    for name, (dtype, shape) in COLUMNS.items():
+        path = os.path.join(shard, f"{name}.bin")
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        row_bytes = dtype.itemsize * int(np.prod(shape, dtype=np.int64))
+        count = size // row_bytes
+        columns[name] = np.memmap(path, dtype=dtype, mode="r", shape=(count, *shape)) if count else \
+            np.zeros((0, *shape), dtype=dtype)
+    rows = min(len(column) for column in columns.values())
+    if outcomes is None:
+        return {name: np.array(column[:rows]) for name, column in columns.items()}
+
+    path = os.path.join(shard, EPISODES_FILE)
+    size = os.path.getsize(path) if os.path.exists(path) else 0
+    episodes = np.fromfile(path, dtype=EPISODE_DTYPE, count=size // EPISODE_DTYPE.itemsize) if size else \
+        np.zeros(0, dtype=EPISODE_DTYPE)
+    wanted = episodes[np.isin(episodes["outcome"], outcomes)]
+    keep = _in_episodes(columns["session"][:rows], columns["episode"][:rows], wanted)
+    return {name: column[:rows][keep] for name, column in columns.items()}
+
+
+def _in_episodes(sessions, episodes, table):
+    """Mask of the rows whose (session, episode) is in an EPISODE_DTYPE table"""
+    # Exact uint64 keys: the session's index among the table's sessions above the episode number
+    known = np.unique(table["session"])
+    if not len(known):
+        return np.zeros(len(sessions), dtype=bool)
+    index = np.minimum(np.searchsorted(known, sessions), len(known) - 1)
+    keys = (index.astype(np.uint64) << np.uint64(32)) | episodes.astype(np.uint64)
+    wanted = (np.searchsorted(known, table["session"]).astype(np.uint64) << np.uint64(32)) | \
+        table["episode"].astype(np.uint64)
+    return (known[index] == sessions) & np.isin(keys, wanted)
+
+
+def load_demonstrations(root, outcomes=(LANDED,)):
+    """
+    Every shard under root as one dataset: a dict of observations (N, 6)
+    float32, actions (N,) uint8, plus session, episode and tick columns.
+
+    outcomes keeps only rows of episodes that ended that way (by default the
+    successful landings); None keeps every row, including unfinished episodes.
+    Each shard is filtered through its memory maps, so only the kept rows are
+    read into memory.
+    """
+    shards = sorted(os.path.join(root, name) for name in os.listdir(root) if name.startswith(SHARD_PREFIX))
+    outcomes = None if outcomes is None else np.asarray(outcomes, dtype=EPISODE_DTYPE["outcome"])
+    parts = [_read_shard(shard, outcomes) for shard in shards]
+    columns = {name: np.concatenate([part[name] for part in parts]) if parts else
+               np.zeros((0, *shape), dtype=dtype) for name, (dtype, shape) in COLUMNS.items()}
+    return {
+        "observations": columns["observation"],
+        "actions": columns["action"],
+        "session": columns["session"],
+        "episode": columns["episode"],
+        "tick": columns["tick"],
+    }
@@ -0,0 +1,229 @@
+"""
+Policy inference for the lander server.
+
+load_policy() loads a trained stable-baselines3 PPO model once and exposes it
+as a plain observations -> actions function running a torch.no_grad() CPU
+forward pass. InferenceBatcher coalesces concurrent single-observation
+requests arriving within a short window (or until the batch is full) into
+one forward pass, so many clients asking for actions at 60 Hz cost one
+batched forward per window instead of one batch-size-1 forward each.
+
+export_policy_weights() writes the actor as raw float32 arrays that the
+browser page runs itself (static/lander.js), with no server round-trips.
+"""
+
+import asyncio
+import json
+import struct
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from airplane_landing_simulator import STATE_FIELDS
+
+POLICY_WEIGHTS_MAGIC = b"LPW1"
+
+# Activations an exported actor may use (SB3 default is tanh); None is linear
+ACTIVATIONS = {"tanh": np.tanh, "relu": lambda x: np.maximum(x, 0.0), None: lambda x: x}
+
+
+def load_policy(path, num_threads=1):
+    """Load a saved PPO model as a batched observations -> actions function"""
+    import torch
+    from stable_baselines3 import PPO
+
+    # Small batched forwards are fastest single-threaded; keep cores for the server
+    torch.set_num_threads(num_threads)
+    return policy_function(PPO.load(path, device="cpu").policy)
+
+
+def policy_function(policy):
+    """Wrap an SB3 policy as a deterministic, batched observations -> actions function"""
+    import torch
+
+    policy.set_training_mode(False)
+
+    def act(observations):
+        with torch.no_grad():
+            obs = torch.as_tensor(observations, dtype=torch.float32)
+            actions = policy.get_distribution(obs).get_actions(deterministic=True)
+        return actions.numpy()
+
+    return act
+
+
+def export_policy_weights(policy):
+    """
+    Actor network of an SB3 MlpPolicy as raw arrays for in-browser inference.
+
+    Layout: POLICY_WEIGHTS_MAGIC, uint32 header length, JSON header (padded
+    to 4 bytes) listing each dense layer's inputs, outputs and activation,
+    then every layer's float32 weight (outputs x inputs, row-major) and bias.
+    The last layer's outputs are the action logits; the action is their argmax.
+    """
+    import torch
+
+    layers = []
+    for module in list(policy.mlp_extractor.policy_net) + [policy.action_net]:
+        if isinstance(module, torch.nn.Linear):
+            layers.append({"weight": module.weight.detach().cpu().numpy(), "bias": module.bias.detach().cpu().numpy(),
+                           "activation": None})
+        elif layers and type(module).__name__.lower() in ACTIVATIONS:
+            layers[-1]["activation"] = type(module).__name__.lower()
+        else:
+            raise ValueError(f"cannot export policy layer {module!r}")
+    return pack_policy_weights(layers)
+
+
+def pack_policy_weights(layers):
+    """Serialize dense layers (dicts with weight, bias, activation) in the export_policy_weights() layout"""
+    header = json.dumps({
+        "observation_fields": STATE_FIELDS,
+        "layers": [{"inputs": int(np.shape(layer["weight"])[1]), "outputs": int(np.shape(layer["weight"])[0]),
+                    "activation": layer["activation"]} for layer in layers],
+    }).encode("utf-8")
+    header += b" " * (-len(header) % 4)
+    arrays = [np.asarray(layer[name], dtype="<f4").tobytes() for layer in layers for name in ("weight", "bias")]
+    return POLICY_WEIGHTS_MAGIC + struct.pack("<I", len(header)) + header + b"".join(arrays)
+
+
+def weights_policy(data):
+    """
+    NumPy observations -> actions function over export_policy_weights() bytes:
+    the reference for the browser's forward pass, and a torch-free way to run
+    an exported policy.
+    """
+    if data[:4] != POLICY_WEIGHTS_MAGIC:
+        raise ValueError("not a policy weights file")
+    (header_length,) = struct.unpack_from("<I", data, 4)
+    header = json.loads(data[8:8 + header_length])
+    offset = 8 + header_length
+    layers = []
+    for layer in header["layers"]:
+        weight = np.frombuffer(data, "<f4", layer["outputs"] * layer["inputs"], offset)
+        offset += weight.nbytes
+        bias = np.frombuffer(data, "<f4", layer["outputs"], offset)
+        offset += bias.nbytes
+        layers.append((weight.reshape(layer["outputs"], layer["inputs"]), bias, ACTIVATIONS[layer["activation"]]))
+
+    def act(observations):
+        x = np.asarray(observations, dtype=np.float32)
+        for weight, bias, activation in layers:
+            x = activation(x @ weight.T + bias)
+        return np.argmax(x, axis=1).astype(np.uint8)
+
+    return act
+
+
+class InferenceBatcher:
+    """
+    Micro-batch concurrent act() calls into single policy forward passes.
+
+    A batch is dispatched when max_batch_size requests are waiting or
+    max_wait seconds after its first request arrived, whichever comes first.
+    The forward pass runs on a dedicated thread so the event loop keeps
+    accepting requests meanwhile.
+    """
+
+    def __init__(self, policy, max_batch_size=64, max_wait=0.002, history=1024, batch_size_histogram=None):
+        self.policy = policy
+        self.max_batch_size = int(max_batch_size)
+        self.max_wait = float(max_wait)
+        self._pending = []
+        self._arrived = asyncio.Event()
+        self._full = asyncio.Event()
+        self._worker = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lander-inference")
+        self._observations = np.zeros((self.max_batch_size, len(STATE_FIELDS)), dtype=np.float32)
+
+        # Metrics
+        self.requests = 0
+        self.batches = 0
+        self.batch_size_counts = np.zeros(self.max_batch_size + 1, dtype=np.int64)
+        self.batch_latencies = deque(maxlen=history)    # dispatch -> results, seconds
+        self.request_latencies = deque(maxlen=history)  # enqueue -> result, seconds
+        self.batch_size_histogram = batch_size_histogram
+
+    async def act(self, observation):
+        """Queue one observation and wait for its action"""
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((observation, future, time.perf_counter()))
+        self._arrived.set()
+        if len(self._pending) >= self.max_batch_size:
+            self._full.set()
+        return await future
+
+    async def _run(self):
+        """Dispatch loop: collect a window of requests, run one forward pass"""
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                await self._arrived.wait()
+                if len(self._pending) < self.max_batch_size:
+                    try:
+                        await asyncio.wait_for(self._full.wait(), self.max_wait)
+                    except asyncio.TimeoutError:
+                        pass
+                batch = self._pending[:self.max_batch_size]
+                del self._pending[:self.max_batch_size]
+                if len(self._pending) < self.max_batch_size:
+                    self._full.clear()
+                if not self._pending:
+                    self._arrived.clear()
+                try:
+                    await self._dispatch(loop, batch)
+                except Exception as error:  # a bad observation or policy output fails its batch, not the loop
+                    for _, future, _ in batch:
+                        if not future.done():
+                            future.set_exception(error)
+        finally:
+            self._worker = None  # the next act() starts a new dispatcher
+
+    async def _dispatch(self, loop, batch):
+        """Run one forward pass for a batch and resolve its futures"""
+        size = len(batch)
+        observations = self._observations[:size]
+        for i, (observation, _, _) in enumerate(batch):
+            observations[i] = observation
+
+        start = time.perf_counter()
+        actions = await loop.run_in_executor(self._executor, self.policy, observations)
+        finished = time.perf_counter()
+        if len(actions) != size:
+            raise ValueError(f"policy returned {len(actions)} actions for a batch of {size}")
+
+        for (_, future, enqueued), action in zip(batch, actions):
+            if not future.done():
+                future.set_result(int(action))
+            self.request_latencies.append(finished - enqueued)
+        self.requests += size
+        self.batches += 1
+        self.batch_size_counts[size] += 1
+        self.batch_latencies.append(finished - start)
+        if self.batch_size_histogram is not None:
+            self.batch_size_histogram.observe(size)
+
+    def stats(self):
+        """Batch-size and latency summary for monitoring"""
+        def percentiles(samples):
+            if not samples:
+                return {}
+            values = np.fromiter(samples, dtype=np.float64) * 1000.0
+            p50, p90, p99 = np.percentile(values, [50, 90, 99])
+            return {"p50_ms": float(p50), "p90_ms": float(p90), "p99_ms": float(p99), "max_ms": float(values.max())}
+
+        sizes = np.flatnonzero(self.batch_size_counts)
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "batch_sizes": {int(size): int(self.batch_size_counts[size]) for size in sizes},
+            "batch_latency": percentiles(self.batch_latencies),
+            "request_latency": percentiles(self.request_latencies),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+        }
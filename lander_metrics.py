@@ -0,0 +1,194 @@
+"""
+Prometheus-style metrics for the lander server.
+
+Counters and histograms are plain Python numbers updated in place. The
+server runs its routes, ticker and inference dispatch on one event loop,
+so updates never race and need no locks. Values that already exist
+elsewhere (session and client counts, tick and frame counters) are read by callbacks at
+scrape time instead of being mirrored on the hot path. render() produces the
+Prometheus text exposition format (version 0.0.4).
+
+A disabled registry hands out no-op metrics, so instrumented code costs a
+method call and nothing else; the app skips its middleware and /metrics
+entirely in that case.
+"""
+
+import asyncio
+import time
+from bisect import bisect_left
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; from sub-millisecond ticks and routes up to slow page loads
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)] + list(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter, optionally labelled"""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+
+    def inc(self, amount=1, labels=()):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in self.values.items():
+            yield self.name, _format_labels(self.labelnames, labels), value
+
+
+class Histogram:
+    """Fixed-bucket histogram, optionally labelled; observe() is a bisect and two adds"""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.bounds = tuple(float(b) for b in buckets)
+        self.series = {}  # labels -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value, labels=()):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [0] * (len(self.bounds) + 1) + [0.0]
+        series[bisect_left(self.bounds, value)] += 1
+        series[-1] += value
+
+    def samples(self):
+        for labels, series in self.series.items():
+            cumulative = 0
+            for bound, count in zip(self.bounds + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                yield self.name + "_bucket", _format_labels(self.labelnames, labels, [le]), cumulative
+            yield self.name + "_sum", _format_labels(self.labelnames, labels), series[-1]
+            yield self.name + "_count", _format_labels(self.labelnames, labels), cumulative
+
+
+class CallbackMetric:
+    """Gauge or counter whose samples are computed at scrape time"""
+
+    def __init__(self, kind, name, documentation, callback, labelnames=()):
+        self.kind = kind
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.labelnames = tuple(labelnames)
+
+    def samples(self):
+        value = self.callback()
+        if isinstance(value, dict):
+            for labels, v in value.items():
+                labels = labels if isinstance(labels, tuple) else (labels,)
+                yield self.name, _format_labels(self.labelnames, labels), v
+        else:
+            yield self.name, "", value
+
+
+class _NoopMetric:
+    """Stand-in returned by a disabled registry"""
+
+    def inc(self, amount=1, labels=()):
+        pass
+
+    def observe(self, value, labels=()):
+        pass
+
+
+_NOOP = _NoopMetric()
+
+
+class MetricsRegistry:
+    """Creates and renders metrics; a disabled registry creates no-ops"""
+
+    def __init__(self, enabled=True):
+        self.enabled = bool(enabled)
+        self.metrics = []
+
+    def _register(self, metric):
+        if not self.enabled:
+            return _NOOP
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge_callback(self, name, documentation, callback, labelnames=()):
+        return self._register(CallbackMetric("gauge", name, documentation, callback, labelnames))
+
+    def counter_callback(self, name, documentation, callback, labelnames=()):
+        return self._register(CallbackMetric("counter", name, documentation, callback, labelnames))
+
+    def render(self):
+        """Every metric in the Prometheus text exposition format"""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request by route template.
+
+    Written against raw ASGI rather than BaseHTTPMiddleware so it adds no
+    extra task or response buffering; WebSocket traffic passes straight
+    through.
+    """
+
+    def __init__(self, app, histogram):
+        self.app = app
+        self.histogram = histogram
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            self.histogram.observe(time.perf_counter() - start, (scope["method"], path, status))
+
+
+async def monitor_loop_lag(histogram, interval=0.1):
+    """Observe how late the event loop wakes a sleeper, every `interval` seconds"""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        histogram.observe(max(0.0, loop.time() - expected))
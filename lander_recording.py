@@ -0,0 +1,231 @@
+"""
+Compact binary episode recordings for the lander engine.
+
+File layout (all little-endian):
+
+    header   32 bytes: magic, version, block count, episode count, index offset
+    blocks   each block stores `count` transitions column by column
+             (state, action, reward, done), every column 8-byte aligned
+    index    block table (offset, count) followed by the episode table
+             (block, row, length, outcome, initial state)
+
+Every transition has the same fixed width, episodes never span blocks, and
+the index is read through np.memmap, so EpisodeReader.episode(i) is an O(1)
+lookup that returns zero-copy views into the file. A transition row holds
+the state *after* the action; the state before the first action is kept in
+the episode table.
+"""
+
+import struct
+
+import numpy as np
+
+from airplane_landing_simulator import STATE_FIELDS
+
+MAGIC = b"LNDREC\x00\x01"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQQ")
+
+# Transition columns: name -> (dtype, per-row shape)
+COLUMNS = {
+    "state": (np.dtype("<f4"), (len(STATE_FIELDS),)),
+    "action": (np.dtype("u1"), ()),
+    "reward": (np.dtype("<f4"), ()),
+    "done": (np.dtype("u1"), ()),
+}
+
+# done column values
+NOT_DONE = 0
+TERMINATED = 1
+TRUNCATED = 2
+
+BLOCK_DTYPE = np.dtype([("offset", "<u8"), ("count", "<u8")])
+EPISODE_DTYPE = np.dtype([
+    ("block", "<u4"),
+    ("row", "<u4"),
+    ("length", "<u4"),
+    ("outcome", "u1"),
+    ("initial_state", "<f4", (len(STATE_FIELDS),)),
+], align=True)
+
+
+def _row_bytes(name):
+    dtype, shape = COLUMNS[name]
+    return dtype.itemsize * int(np.prod(shape, dtype=np.int64))
+
+
+def _column_layout(count):
+    """Byte offset of every column inside a block of `count` rows, and the block size"""
+    offsets = {}
+    position = 0
+    for name in COLUMNS:
+        offsets[name] = position
+        position += -(-count * _row_bytes(name) // 8) * 8
+    return offsets, position
+
+
+class EpisodeRecorder:
+    """
+    Record the episodes of a LanderBatch into a recording file.
+
+    Call begin() after (re)setting landers, then record() after every step.
+    Per-lander transitions are staged in memory with vectorized writes; a
+    finished episode is copied once into the current block, and full blocks
+    are written to disk column by column.
+    """
+
+    def __init__(self, path, num_landers, block_size=65536):
+        self.num_landers = int(num_landers)
+        self.block_size = int(block_size)
+        self._file = open(path, "wb")
+        self._file.write(b"\x00" * HEADER.size)
+        self._blocks = []
+        self._episodes = []
+
+        n = self.num_landers
+        self._lengths = np.zeros(n, dtype=np.int64)
+        self._initial_states = np.zeros((n, len(STATE_FIELDS)), dtype=np.float32)
+        self._staging = {}
+        self._allocate_staging(256)
+
+        self._block = {name: np.zeros((self.block_size, *shape), dtype=dtype) for name, (dtype, shape) in COLUMNS.items()}
+        self._block_rows = 0
+        self._rows = np.arange(n)
+        self.closed = False
+
+    def _allocate_staging(self, capacity):
+        """(Re)allocate per-lander staging with room for `capacity` steps, keeping content"""
+        staging = {}
+        for name, (dtype, shape) in COLUMNS.items():
+            staging[name] = np.zeros((self.num_landers, capacity, *shape), dtype=dtype)
+            if name in self._staging:
+                old = self._staging[name]
+                staging[name][:, :old.shape[1]] = old
+        self._staging = staging
+        self._capacity = capacity
+
+    def begin(self, batch, mask=None):
+        """Start new episodes from the batch's current state (all landers or where mask)"""
+        if mask is None:
+            mask = slice(None)
+        for column, name in enumerate(STATE_FIELDS):
+            self._initial_states[mask, column] = getattr(batch, name)[mask]
+        self._lengths[mask] = 0
+
+    def record(self, batch, actions, rewards, done, truncated=None):
+        """
+        Append one transition for every lander (the state after batch.step()).
+
+        done marks landers whose episode ended on this step, truncated those
+        of them that were cut off rather than landing or crashing. Finished
+        episodes are written out; call begin() for them after resetting.
+        """
+        if self._lengths.max(initial=0) >= self._capacity:
+            self._allocate_staging(self._capacity * 2)
+
+        rows, steps = self._rows, self._lengths
+        staged_state = self._staging["state"]
+        for column, name in enumerate(STATE_FIELDS):
+            staged_state[rows, steps, column] = getattr(batch, name)
+        self._staging["action"][rows, steps] = actions
+        self._staging["reward"][rows, steps] = rewards
+        done_codes = np.where(done, TERMINATED, NOT_DONE).astype(np.uint8)
+        if truncated is not None:
+            done_codes[np.asarray(truncated, dtype=bool)] = TRUNCATED
+        self._staging["done"][rows, steps] = done_codes
+        self._lengths += 1
+
+        for i in np.flatnonzero(done):
+            self._finish_episode(i, int(batch.outcome[i]))
+
+    def _finish_episode(self, i, outcome):
+        """Copy lander i's staged episode into the current block"""
+        length = int(self._lengths[i])
+        if length > self.block_size:
+            self._flush()
+            self._block = {name: np.zeros((length, *shape), dtype=dtype) for name, (dtype, shape) in COLUMNS.items()}
+        elif self._block_rows + length > len(self._block["action"]):
+            self._flush()
+
+        row = self._block_rows
+        for name in COLUMNS:
+            self._block[name][row:row + length] = self._staging[name][i, :length]
+        self._block_rows += length
+        self._episodes.append((len(self._blocks), row, length, outcome, self._initial_states[i].copy()))
+        self._lengths[i] = 0
+
+    def _flush(self):
+        """Write the current block to disk"""
+        count = self._block_rows
+        if count == 0:
+            return
+        offsets, size = _column_layout(count)
+        data = bytearray(size)
+        for name in COLUMNS:
+            raw = self._block[name][:count].tobytes()
+            data[offsets[name]:offsets[name] + len(raw)] = raw
+        self._blocks.append((self._file.tell(), count))
+        self._file.write(data)
+        self._block_rows = 0
+        if len(self._block["action"]) != self.block_size:
+            self._block = {name: np.zeros((self.block_size, *shape), dtype=dtype) for name, (dtype, shape) in COLUMNS.items()}
+
+    def close(self):
+        """Flush pending data, write the index and finalize the header"""
+        if self.closed:
+            return
+        self._flush()
+        index_offset = self._file.tell()
+        np.array(self._blocks, dtype=BLOCK_DTYPE).tofile(self._file)
+        np.array(self._episodes, dtype=EPISODE_DTYPE).tofile(self._file)
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, len(self._blocks), len(self._episodes), index_offset))
+        self._file.close()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class EpisodeReader:
+    """Zero-copy, random-access view of a recording file"""
+
+    def __init__(self, path):
+        self._data = np.memmap(path, dtype=np.uint8, mode="r")
+        magic, version, num_blocks, num_episodes, index_offset = HEADER.unpack(self._data[:HEADER.size].tobytes())
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a lander recording (version {VERSION})")
+        blocks_end = index_offset + num_blocks * BLOCK_DTYPE.itemsize
+        self.blocks = self._data[index_offset:blocks_end].view(BLOCK_DTYPE)
+        self.episodes = self._data[blocks_end:blocks_end + num_episodes * EPISODE_DTYPE.itemsize].view(EPISODE_DTYPE)
+        self._layouts = {}
+
+    def __len__(self):
+        return len(self.episodes)
+
+    def _column(self, block, name, start=0, stop=None):
+        """View of one column of one block, rows [start:stop]"""
+        offset, count = (int(v) for v in self.blocks[block])
+        if count not in self._layouts:
+            self._layouts[count] = _column_layout(count)[0]
+        dtype, shape = COLUMNS[name]
+        base = offset + self._layouts[count][name]
+        column = self._data[base:base + count * _row_bytes(name)].view(dtype).reshape(count, *shape)
+        return column[start:stop]
+
+    def episode(self, index):
+        """Columns of episode `index` as zero-copy views, plus its index entry"""
+        entry = self.episodes[index]
+        block, row, length = int(entry["block"]), int(entry["row"]), int(entry["length"])
+        episode = {name: self._column(block, name, row, row + length) for name in COLUMNS}
+        episode["initial_state"] = entry["initial_state"]
+        episode["outcome"] = int(entry["outcome"])
+        return episode
+
+    def iter_blocks(self):
+        """Yield every block's columns as zero-copy views (dataset loading)"""
+        for block in range(len(self.blocks)):
+            yield {name: self._column(block, name) for name in COLUMNS}
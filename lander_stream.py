@@ -0,0 +1,436 @@
+"""
+Server-side episode streaming for the airplane lander.
+
+An EpisodeHub hosts every live episode (session) as one slot of a single
+shared LanderBatch. One ticker coroutine advances all sessions with one
+vectorized step per tick, runs the policy once for every session without a
+human pilot, and packs all frames at once. Each session then publishes its
+frame to its sockets: serialization and wake-up happen once per tick per
+session, not once per socket, and slow sockets simply skip to the newest
+frame instead of queueing. Sessions nobody is connected to expire after
+SESSION_TTL seconds and their slots are reused.
+
+Frame layout: little-endian float32 values in FRAME_FIELDS order.
+Client messages: one byte, the held engine (0 none, 1 left, 2 right), or
+RESET_COMMAND to restart the episode. Recorded episodes are replayed in the
+same frame format (replay_frames()).
+
+A LanderSwarm is the population view: one batch of thousands of landers,
+flown by the same policy from randomized starts, streamed to every /ws/swarm
+socket as one packed message per tick (SWARM_HEADER, then int16 x, y, angle
+triples in SWARM_SCALE units, then one outcome byte per lander).
+"""
+
+import asyncio
+import time
+
+import numpy as np
+
+from airplane_landing_simulator import (
+    CRASHED,
+    LANDED,
+    LanderBatch,
+    NOOP,
+    NUM_ACTIONS,
+    RUNNING,
+    STATE_FIELDS,
+    TICK_RATE,
+)
+from lander_controllers import attitude_controller
+from lander_randomization import DEFAULT_RANGES, LanderRandomizer
+
+FRAME_FIELDS = ("tick",) + STATE_FIELDS + ("action", "outcome")
+FRAME_DTYPE = np.dtype("<f4")
+FRAME_SIZE = len(FRAME_FIELDS) * FRAME_DTYPE.itemsize
+RESET_COMMAND = 255
+RESTART_DELAY_TICKS = 2 * TICK_RATE  # keep the final frame on screen before restarting
+MAX_SESSIONS = 4096
+SESSION_TTL = 30.0  # seconds an unwatched session is kept for reconnects
+
+# Swarm message: uint32 tick, lander count, landed and crashed episode totals
+SWARM_HEADER = np.dtype([("tick", "<u4"), ("count", "<u4"), ("landed", "<u4"), ("crashed", "<u4")])
+SWARM_POSE_DTYPE = np.dtype("<i2")
+SWARM_SCALE = (8.0, 8.0, 100.0)  # x and y in 1/8 px, angle in 1/100 degree wrapped to [-180, 180)
+SWARM_SIZE = 2048
+
+
+def replay_frames(episode):
+    """Pack a recorded episode (EpisodeReader.episode()) as one frame per tick"""
+    length = len(episode["action"])
+    state = slice(1, 1 + len(STATE_FIELDS))
+    frames = np.zeros((length + 1, len(FRAME_FIELDS)), dtype=FRAME_DTYPE)
+    frames[:, 0] = np.arange(length + 1)
+    frames[0, state] = episode["initial_state"]
+    frames[1:, state] = episode["state"]
+    frames[1:, -2] = episode["action"]
+    frames[-1, -1] = episode["outcome"]
+    return frames.tobytes()
+
+
+class EpisodeStream:
+    """One session: a slot of the hub's batch shared by a pilot and any number of spectators"""
+
+    def __init__(self, hub, name, slot):
+        self.hub = hub
+        self.name = name
+        self.slot = slot
+        self.clients = 0
+        self.idle_since = time.monotonic()
+        self.published = 0
+        self._frame_event = asyncio.Event()
+        self.frame = hub.frames[slot].tobytes()
+
+    @property
+    def pilots(self):
+        return int(self.hub.pilots[self.slot])
+
+    def observation(self):
+        """Current state as a (1, 6) float32 observation, as seen by the env"""
+        lander = self.hub.lander
+        return np.array([[getattr(lander, name)[self.slot] for name in STATE_FIELDS]], dtype=np.float32)
+
+    def submit(self, message):
+        """Apply a pilot message: held engine byte or RESET_COMMAND"""
+        if not message:
+            return
+        command = message[0]
+        if command == RESET_COMMAND:
+            self.hub.restart(self.slot)
+        elif command < NUM_ACTIONS:
+            self.hub.actions[self.slot] = command
+
+    def publish(self, frame):
+        """Hand a new frame to every reader of this session"""
+        self.frame = frame
+        self.published += 1
+        event, self._frame_event = self._frame_event, asyncio.Event()
+        event.set()
+
+    async def frames(self):
+        """Yield the current frame at once, then the newest after every tick (missed frames are counted, not queued)"""
+        hub = self.hub
+        seen = self.published
+        hub.frames_sent += 1
+        yield self.frame
+        while True:
+            await self._frame_event.wait()
+            hub.frames_skipped += self.published - seen - 1
+            seen = self.published
+            hub.frames_sent += 1
+            yield self.frame
+
+
+class EpisodeHub:
+    """
+    Named sessions packed into one LanderBatch of max_sessions slots.
+
+    join() creates a session on first connection (or resumes one that has
+    not expired yet); leave() releases a connection. Freed slots are parked
+    (the engine skips finished landers) until a new session reuses them.
+    """
+
+    def __init__(self, policy=None, max_sessions=MAX_SESSIONS, ttl=SESSION_TTL, tick_histogram=None):
+        self.policy = policy
+        self.max_sessions = int(max_sessions)
+        self.ttl = float(ttl)
+        self.episodes = {}
+        n = self.max_sessions
+
+        # Per-slot state, indexed like the lander batch
+        self.lander = LanderBatch(n)
+        self.lander.outcome[:] = CRASHED  # park every slot until it is allocated
+        self.active = np.zeros(n, dtype=bool)
+        self.actions = np.zeros(n, dtype=np.uint8)
+        self.pilots = np.zeros(n, dtype=np.int32)
+        self.ticks = np.zeros(n, dtype=np.int64)
+        self.finished_ticks = np.zeros(n, dtype=np.int32)
+        self.frames = np.zeros((n, len(FRAME_FIELDS)), dtype=FRAME_DTYPE)
+        self._free = list(range(n - 1, -1, -1))
+        self._running = np.zeros(n, dtype=bool)
+        self._mask = np.zeros(n, dtype=bool)
+        self._sessions = [None] * n
+
+        self._ticker = None
+        self.tick_seconds = 0.0
+
+        # Instrumentation: plain counters, read by the metrics endpoint
+        self.tick_histogram = tick_histogram  # observes each tick phase's duration, labelled by phase
+        self.phase_seconds = {"step": 0.0, "pack": 0.0, "publish": 0.0}
+        self.tick_count = 0
+        self.frames_sent = 0
+        self.frames_skipped = 0
+
+    def join(self, name, pilot=False):
+        """Return the named session, creating it if needed; None if every slot is taken"""
+        stream = self.episodes.get(name)
+        if stream is None:
+            if not self._free:
+                self.collect(time.monotonic())
+                if not self._free:
+                    return None
+            slot = self._free.pop()
+            self._allocate(slot)
+            stream = self.episodes[name] = self._sessions[slot] = EpisodeStream(self, name, slot)
+        stream.clients += 1
+        self.pilots[stream.slot] += bool(pilot)
+        if self._ticker is None:
+            self._ticker = asyncio.create_task(self.run())
+        return stream
+
+    def leave(self, stream, pilot=False):
+        """Release a connection; the session stays resumable for ttl seconds"""
+        stream.clients -= 1
+        self.pilots[stream.slot] -= bool(pilot)
+        if pilot and self.pilots[stream.slot] == 0:
+            self.actions[stream.slot] = NOOP
+        if stream.clients == 0:
+            stream.idle_since = time.monotonic()
+
+    def _allocate(self, slot):
+        """Give a slot a fresh episode"""
+        self.active[slot] = True
+        self.actions[slot] = NOOP
+        self.pilots[slot] = 0
+        self.restart(slot)
+        self._pack()
+
+    def restart(self, slot):
+        """Start a fresh episode in one slot"""
+        self._mask[:] = False
+        self._mask[slot] = True
+        self.lander.reset(self._mask)
+        self.ticks[slot] = 0
+        self.finished_ticks[slot] = 0
+
+    def collect(self, now):
+        """Expire sessions that have had no connection for ttl seconds and free their slots"""
+        for name, stream in list(self.episodes.items()):
+            if stream.clients == 0 and now - stream.idle_since >= self.ttl:
+                del self.episodes[name]
+                self._sessions[stream.slot] = None
+                self.active[stream.slot] = False
+                self.lander.outcome[stream.slot] = CRASHED
+                self._free.append(stream.slot)
+
+    def advance(self):
+        """Step every session one tick in one batch and publish the new frames"""
+        started = time.perf_counter()
+        lander = self.lander
+        running = np.equal(lander.outcome, RUNNING, out=self._running)
+        np.logical_and(running, self.active, out=running)
+
+        # One policy forward pass for every running session without a pilot
+        if self.policy is not None:
+            agents = np.flatnonzero(running & (self.pilots == 0))
+            if len(agents):
+                self.actions[agents] = self.policy(lander.state()[agents].astype(np.float32))
+
+        lander.step(self.actions)
+        self.ticks[running] += 1
+
+        # Finished sessions show their last frame for a while, then restart
+        finished = np.logical_and(self.active, np.logical_not(running, out=self._mask), out=self._mask)
+        self.finished_ticks[finished] += 1
+        restart = finished & (self.finished_ticks >= RESTART_DELAY_TICKS)
+        if restart.any():
+            lander.reset(restart)
+            self.ticks[restart] = 0
+            self.finished_ticks[restart] = 0
+        stepped = time.perf_counter()
+
+        self._pack()
+        packed = self.frames.tobytes()
+        packed_at = time.perf_counter()
+        for stream in self.episodes.values():
+            if stream.clients:
+                offset = stream.slot * FRAME_SIZE
+                stream.publish(packed[offset:offset + FRAME_SIZE])
+        published = time.perf_counter()
+
+        phases = self.phase_seconds
+        phases["step"] = stepped - started
+        phases["pack"] = packed_at - stepped
+        phases["publish"] = published - packed_at
+        self.tick_seconds = published - started
+        self.tick_count += 1
+
+    def _pack(self):
+        """Serialize every slot's current tick into its row of the frame array"""
+        frames = self.frames
+        frames[:, 0] = self.ticks
+        for i, name in enumerate(STATE_FIELDS, start=1):
+            frames[:, i] = getattr(self.lander, name)
+        frames[:, -2] = self.actions
+        frames[:, -1] = self.lander.outcome
+
+    async def run(self):
+        """Ticker: advance all sessions at TICK_RATE until none is left"""
+        loop = asyncio.get_running_loop()
+        period = 1.0 / TICK_RATE
+        deadline = loop.time()
+        tick = 0
+        try:
+            while self.episodes:
+                self.advance()
+                if self.tick_histogram is not None:
+                    for phase, seconds in self.phase_seconds.items():
+                        self.tick_histogram.observe(seconds, (phase,))
+                tick += 1
+                if tick % TICK_RATE == 0:
+                    self.collect(time.monotonic())
+                deadline += period
+                delay = deadline - loop.time()
+                if delay < -period:
+                    deadline = loop.time()  # fell behind; skip instead of bursting
+                    delay = 0
+                await asyncio.sleep(max(0.0, delay))
+        except Exception as error:  # e.g. a policy failure; the next join() starts a new ticker
+            print(f"✗ Episode ticker stopped: {error!r}")
+        finally:
+            self._ticker = None
+
+    def stats(self):
+        """Session counts and ticker cost for monitoring"""
+        return {
+            "sessions": len(self.episodes),
+            "connected": sum(1 for stream in self.episodes.values() if stream.clients),
+            "capacity": self.max_sessions,
+            "free_slots": len(self._free),
+            "tick_ms": self.tick_seconds * 1000.0,
+        }
+
+
+class LanderSwarm:
+    """
+    A population of `size` landers flown by one policy, for eyeballing its
+    failure modes across randomized starts.
+
+    Every tick runs one policy pass and one engine step for the whole batch
+    and packs one message for all subscribers; landers that finished hold
+    their final pose for `restart_delay` ticks, then restart with the next
+    randomized episode. The ticker only runs while someone is subscribed.
+    """
+
+    def __init__(self, policy=None, size=SWARM_SIZE, ranges=DEFAULT_RANGES, seed=0,
+                 restart_delay=RESTART_DELAY_TICKS):
+        self.policy = policy or attitude_controller
+        self.size = int(size)
+        self.restart_delay = int(restart_delay)
+        self.lander = LanderBatch(self.size)
+        self.randomizer = LanderRandomizer(self.size, ranges, seed)
+        self.randomizer.apply(self.lander)
+        self.finished_ticks = np.zeros(self.size, dtype=np.int32)
+        self.tick = 0
+        self.landed = 0
+        self.crashed = 0
+
+        # One preallocated message; the pose and outcome sections are views into it
+        poses_at = SWARM_HEADER.itemsize
+        outcomes_at = poses_at + 3 * self.size * SWARM_POSE_DTYPE.itemsize
+        self.message = np.zeros(outcomes_at + self.size, dtype=np.uint8)
+        self._header = self.message[:poses_at].view(SWARM_HEADER)
+        self._poses = self.message[poses_at:outcomes_at].view(SWARM_POSE_DTYPE).reshape(self.size, 3)
+        self._outcomes = self.message[outcomes_at:]
+        self._scratch = np.empty(self.size, dtype=np.float64)
+        self._pack()
+
+        self.clients = 0
+        self.published = 0
+        self.frame = self.message.tobytes()
+        self._frame_event = asyncio.Event()
+        self._ticker = None
+        self.tick_seconds = 0.0
+
+    def join(self):
+        """Register a subscriber and start the ticker if it is not running"""
+        self.clients += 1
+        if self._ticker is None:
+            self._ticker = asyncio.create_task(self.run())
+
+    def leave(self):
+        self.clients -= 1
+
+    def advance(self):
+        """Step the whole swarm one tick, restart landers that have been finished long enough, repack"""
+        started = time.perf_counter()
+        lander = self.lander
+        running = lander.outcome == RUNNING
+        actions = np.zeros(self.size, dtype=np.uint8)
+        if running.any():
+            actions[running] = self.policy(lander.state()[running].astype(np.float32))
+        done = lander.step(actions)
+        self.landed += int(np.count_nonzero(done & (lander.outcome == LANDED)))
+        self.crashed += int(np.count_nonzero(done & (lander.outcome == CRASHED)))
+
+        finished = ~running
+        self.finished_ticks[finished] += 1
+        restart = finished & (self.finished_ticks >= self.restart_delay)
+        if restart.any():
+            lander.reset(restart)
+            self.randomizer.apply(lander, restart)
+            self.finished_ticks[restart] = 0
+        self.tick += 1
+        self._pack()
+        self.tick_seconds = time.perf_counter() - started
+
+    def _pack(self):
+        """Quantize every pose into the shared message"""
+        lander, poses, scratch = self.lander, self._poses, self._scratch
+        for column, (name, scale) in enumerate(zip(("x", "y", "angle"), SWARM_SCALE)):
+            values = getattr(lander, name)
+            if name == "angle":
+                values = np.add(values, 180.0, out=scratch)
+                np.mod(values, 360.0, out=values)
+                np.subtract(values, 180.0, out=values)
+            np.multiply(values, scale, out=scratch)
+            np.clip(scratch, -32768, 32767, out=scratch)
+            np.rint(scratch, out=scratch)
+            poses[:, column] = scratch
+        self._outcomes[:] = lander.outcome
+        self._header[0] = (self.tick, self.size, self.landed, self.crashed)
+
+    def publish(self):
+        self.frame = self.message.tobytes()
+        self.published += 1
+        event, self._frame_event = self._frame_event, asyncio.Event()
+        event.set()
+
+    async def frames(self):
+        """Yield the current message at once, then the newest after every tick; a slow reader skips to the latest"""
+        yield self.frame
+        while True:
+            await self._frame_event.wait()
+            yield self.frame
+
+    async def run(self):
+        """Ticker: advance the swarm at TICK_RATE while anyone is subscribed"""
+        loop = asyncio.get_running_loop()
+        period = 1.0 / TICK_RATE
+        deadline = loop.time()
+        try:
+            while self.clients > 0:
+                self.advance()
+                self.publish()
+                deadline += period
+                delay = deadline - loop.time()
+                if delay < -period:
+                    deadline = loop.time()
+                    delay = 0
+                await asyncio.sleep(max(0.0, delay))
+        except Exception as error:  # e.g. a policy failure; the next join() starts a new ticker
+            print(f"✗ Swarm ticker stopped: {error!r}")
+        finally:
+            self._ticker = None
+
+    def stats(self):
+        """Episode totals and ticker cost for monitoring"""
+        finished = self.landed + self.crashed
+        return {
+            "size": self.size,
+            "clients": self.clients,
+            "tick": self.tick,
+            "landed": self.landed,
+            "crashed": self.crashed,
+            "success_rate": self.landed / finished if finished else None,
+            "tick_ms": self.tick_seconds * 1000.0,
+        }
@@ -0,0 +1,294 @@
+"""
+Value-iteration lookup table for the lander: a near-optimal scripted pilot.
+
+The vertical motion does not depend on the engines (gravity and drag only),
+so an episode is a fixed number of ticks from touchdown, read off a small
+(height above ground, vy) table. What the pilot controls is the coupled
+angle / angular velocity / vx dynamics, and landing only asks |angle| and
+|vx| to be small on the touchdown tick. The table holds the optimal value
+of every (ticks to touchdown, engine phase, angle, angular velocity, vx)
+grid point, solved backwards from touchdown by vectorized value iteration:
+
+    terminal value   min(1 - |angle| / 5, 1 - |vx| / 1), clipped to [-1, 1]
+                     (positive exactly when the landing succeeds)
+    per tick         V_k = max(V_{k-1}(noop), V_{k-3}(thrust) - THRUST_COST)
+
+A thrust commits to the three-tick cooldown, and pressing the same engine
+again as soon as it is ready also fires the delayed wobble, so the engine
+phase at a decision tick is one of: fresh, or wobble pending for +1/-1.
+Mode -1 is the mirror image of mode +1 and is not stored.
+
+Acting is a one-step lookahead: simulate each action exactly and pick the
+best multilinearly interpolated successor value, a fixed amount of work per
+lander. Beyond `horizon` ticks from the ground the last layer is used.
+"""
+
+import json
+import struct
+
+import numpy as np
+
+from airplane_landing_simulator import (
+    ANGULAR_DAMPING,
+    DRAG_X,
+    DRAG_Y,
+    GRAVITY,
+    GROUND_Y,
+    LANDING_MAX_ANGLE,
+    LANDING_MAX_VELOCITY_X,
+    LEFT_ENGINE,
+    NOOP,
+    RIGHT_ENGINE,
+    THRUST_ANGULAR,
+    THRUST_COOLDOWN_TICKS,
+    THRUST_VELOCITY,
+    WOBBLE_ANGLE,
+)
+
+# Grid axes as (low, high, points); symmetric so mode -1 is an index reversal
+DEFAULT_AXES = {
+    "angle": (-30.0, 30.0, 31),
+    "angular_velocity": (-6.0, 6.0, 25),
+    "vx": (-3.0, 3.0, 25),
+}
+DEFAULT_HORIZON = 64
+
+# Ticks-to-touchdown table over (height above ground, vy)
+HEIGHT_AXIS = (0.0, 340.0, 171)
+VY_AXIS = (-0.5, 6.0, 66)
+
+# Keeps the pilot off the engines when thrusting gains nothing
+THRUST_COST = 0.002
+
+# Value lost per grid step outside the grid: off-grid states are looked up
+# at the nearest edge, and this keeps the pilot from drifting out there
+OUTSIDE_PENALTY = 0.5
+
+FRESH = 0
+PENDING = 1  # wobble pending for direction +1 (left engine)
+NUM_MODES = 2
+
+FILE_MAGIC = b"LVT1"
+
+
+def _axis(spec):
+    low, high, points = spec
+    return np.linspace(low, high, int(points))
+
+
+def _grid_coordinates(value, spec):
+    """Lower grid index, fractional offset and grid steps outside the axis of each value"""
+    low, high, points = spec
+    unclamped = (value - low) / (high - low) * (points - 1)
+    position = np.clip(unclamped, 0.0, points - 1)
+    index = np.minimum(position.astype(np.int64), points - 2)
+    return index, position - index, np.abs(unclamped - position)
+
+
+def _quantize(values):
+    """Values in [-1, 1] as uint8 (v + 1) * 127.5; a step is under 0.008 of landing margin"""
+    return np.round((np.clip(values, -1.0, 1.0) + 1.0) * 127.5).astype(np.uint8)
+
+
+def terminal_value(angle, vx):
+    """Landing margin on the touchdown tick: > 0 exactly when the landing succeeds"""
+    margin = np.minimum(1.0 - np.abs(angle) / LANDING_MAX_ANGLE, 1.0 - np.abs(vx) / LANDING_MAX_VELOCITY_X)
+    return np.clip(margin, -1.0, 1.0)
+
+
+def _advance(angle, angular_velocity, vx, ticks):
+    """Free flight (no engine) of the controlled state for `ticks` ticks"""
+    for _ in range(ticks):
+        angular_velocity = angular_velocity * ANGULAR_DAMPING
+        angle = angle + angular_velocity
+        vx = vx * DRAG_X
+    return angle, angular_velocity, vx
+
+
+def _thrust(angle, angular_velocity, vx, direction, wobble):
+    """Engine impulse of a ready engine, with the pending wobble when it fires"""
+    angle = angle + np.where(wobble, direction * WOBBLE_ANGLE, 0.0)
+    return angle, angular_velocity + direction * THRUST_ANGULAR, vx + direction * THRUST_VELOCITY
+
+
+def touchdown_ticks(height, vy, max_ticks=1000):
+    """
+    Fractional tick at which the default vertical dynamics cross the ground:
+    touchdown happens on tick ceil(result). Vectorized over height and vy.
+    """
+    height = np.array(height, dtype=np.float64)
+    vy = np.array(vy, dtype=np.float64)
+    y = np.zeros_like(height)
+    result = np.full(height.shape, float(max_ticks))
+    pending = np.ones(height.shape, dtype=bool)
+    for tick in range(1, max_ticks + 1):
+        previous = y
+        vy = (vy + GRAVITY) * DRAG_Y
+        y = y + vy
+        crossed = pending & (y > height)
+        if crossed.any():
+            fraction = (height[crossed] - previous[crossed]) / (y[crossed] - previous[crossed])
+            result[crossed] = tick - 1 + fraction
+            pending &= ~crossed
+            if not pending.any():
+                break
+    return result
+
+
+class ValueTable:
+    """Solved value grid plus the lookups that turn it into a controller"""
+
+    def __init__(self, values, axes, ticks, horizon):
+        self.values = values  # (horizon + 1, NUM_MODES, *axis points) float32; layer 0 is unused
+        self.axes = {name: tuple(spec) for name, spec in axes.items()}
+        self.ticks = ticks    # touchdown_ticks() on the HEIGHT_AXIS x VY_AXIS grid
+        self.horizon = int(horizon)
+        self._specs = [self.axes[name] for name in DEFAULT_AXES]
+        self._flat = values.reshape(-1)
+
+    @classmethod
+    def build(cls, axes=None, horizon=DEFAULT_HORIZON):
+        """Solve the value grid by backward value iteration over ticks to touchdown"""
+        axes = dict(DEFAULT_AXES, **(axes or {}))
+        grids = np.meshgrid(*(_axis(axes[name]) for name in DEFAULT_AXES), indexing="ij")
+        angle, angular_velocity, vx = (g.reshape(-1) for g in grids)
+        shape = tuple(int(axes[name][2]) for name in DEFAULT_AXES)
+        size = angle.size
+        values = np.zeros((horizon + 1, NUM_MODES) + shape, dtype=np.float32)
+        table = cls(values, axes, None, horizon)
+
+        # Successor states do not depend on k: precompute their interpolation stencils
+        noop = _advance(angle, angular_velocity, vx, 1)
+        noop_stencil = table._stencil(FRESH, *noop)
+        thrusts = []  # (mode, direction) -> thrust state, successor stencil
+        for mode in (FRESH, PENDING):
+            for direction in (1, -1):
+                state = _thrust(angle, angular_velocity, vx, direction, mode == PENDING and direction == 1)
+                after = _advance(*state, THRUST_COOLDOWN_TICKS)
+                thrusts.append((mode, direction, state, table._stencil(direction, *after)))
+
+        for k in range(1, horizon + 1):
+            layer = values[k].reshape(NUM_MODES, size)
+            best = np.full((NUM_MODES, size), -np.inf)
+            if k == 1:
+                q = terminal_value(noop[0], noop[2])
+            else:
+                q = table._lookup(k - 1, noop_stencil)
+            best[:] = q
+            for mode, direction, state, stencil in thrusts:
+                if k <= THRUST_COOLDOWN_TICKS:
+                    flight = _advance(*state, k)
+                    q = terminal_value(flight[0], flight[2])
+                else:
+                    q = table._lookup(k - THRUST_COOLDOWN_TICKS, stencil)
+                np.maximum(best[mode], q - THRUST_COST, out=best[mode])
+            layer[:] = np.clip(best, -1.0, 1.0)
+
+        heights, vys = np.meshgrid(_axis(HEIGHT_AXIS), _axis(VY_AXIS), indexing="ij")
+        table.ticks = touchdown_ticks(heights, vys).astype(np.float32)
+        return table
+
+    def _stencil(self, mode, angle, angular_velocity, vx):
+        """Corner offsets (8, N) within a layer, weights and off-grid penalty of a mode -1/0/+1 lookup"""
+        mirror = np.asarray(mode) < 0
+        sign = np.where(mirror, -1.0, 1.0)
+        stored_mode = np.where(mirror, PENDING, np.asarray(mode))
+        coordinates = [_grid_coordinates(sign * value, spec)
+                       for value, spec in zip((angle, angular_velocity, vx), self._specs)]
+        (ia, ta, oa), (iw, tw, ow), (iu, tu, ou) = coordinates
+        na, nw, nu = (spec[2] for spec in self._specs)
+        base = ((stored_mode * na + ia) * nw + iw) * nu + iu
+        offsets = np.empty((8,) + np.shape(base), dtype=np.int64)
+        weights = np.empty((8,) + np.shape(base), dtype=np.float64)
+        for corner in range(8):
+            da, dw, du = (corner >> 2) & 1, (corner >> 1) & 1, corner & 1
+            offsets[corner] = base + (da * nw + dw) * nu + du
+            weights[corner] = ((ta if da else 1 - ta) * (tw if dw else 1 - tw) * (tu if du else 1 - tu))
+        return offsets, weights, OUTSIDE_PENALTY * (oa + ow + ou)
+
+    def _lookup(self, k, stencil):
+        """Interpolated value at layer k (scalar or per-lander array) for a precomputed stencil"""
+        offsets, weights, penalty = stencil
+        index = offsets + np.asarray(k, dtype=np.int64) * (self._flat.size // (self.horizon + 1))
+        return np.einsum("ij,ij->j", self._flat[index].astype(np.float64), weights) - penalty
+
+    def ticks_to_touchdown(self, y, vy):
+        """Integer ticks until the tick that touches down, clamped to [1, horizon]"""
+        (ih, th, _), (iv, tv, _) = _grid_coordinates(GROUND_Y - y, HEIGHT_AXIS), _grid_coordinates(vy, VY_AXIS)
+        t = self.ticks
+        ticks = ((1 - th) * ((1 - tv) * t[ih, iv] + tv * t[ih, iv + 1])
+                 + th * ((1 - tv) * t[ih + 1, iv] + tv * t[ih + 1, iv + 1]))
+        return np.clip(np.ceil(ticks), 1, self.horizon).astype(np.int64)
+
+    def act(self, observations, cooldown=None, wobble_timer=None, wobble_direction=None):
+        """
+        Best action for each observation (N, 6) in STATE_FIELDS order.
+
+        The engine timers (LanderBatch.thrust_cooldown etc.) make the lookup
+        exact; without them every lander is assumed ready with no wobble
+        pending. Landers whose engine is still cooling down get NOOP.
+        """
+        observations = np.asarray(observations, dtype=np.float64)
+        angle, vx, angular_velocity = observations[:, 2], observations[:, 3], observations[:, 5]
+        k = self.ticks_to_touchdown(observations[:, 1], observations[:, 4])
+        if cooldown is None:
+            ready = np.ones(len(observations), dtype=bool)
+            mode = np.zeros(len(observations), dtype=np.int64)
+        else:
+            ready = np.asarray(cooldown) <= 1
+            mode = np.where(np.asarray(wobble_timer) == 1, np.asarray(wobble_direction), 0).astype(np.int64)
+
+        noop = _advance(angle, angular_velocity, vx, 1)
+        best = np.where(k == 1, terminal_value(noop[0], noop[2]),
+                        self._lookup(np.maximum(k - 1, 1), self._stencil(FRESH, *noop)))
+        actions = np.full(len(observations), NOOP, dtype=np.uint8)
+        for action, direction in ((LEFT_ENGINE, 1), (RIGHT_ENGINE, -1)):
+            state = _thrust(angle, angular_velocity, vx, direction, mode == direction)
+            after = _advance(*state, THRUST_COOLDOWN_TICKS)
+            q = self._lookup(np.maximum(k - THRUST_COOLDOWN_TICKS, 1), self._stencil(direction, *after))
+            for ticks in range(1, THRUST_COOLDOWN_TICKS + 1):
+                flight = _advance(*state, ticks)
+                q = np.where(k == ticks, terminal_value(flight[0], flight[2]), q)
+            q -= THRUST_COST
+            better = ready & (q > best)
+            actions[better] = action
+            best = np.where(better, q, best)
+        return actions
+
+    def __call__(self, observations):
+        """Controller interface (see lander_controllers): observations only"""
+        return self.act(observations)
+
+    def act_batch(self, batch, mask=slice(None)):
+        """Exact actions for the landers of a LanderBatch, using its engine timers"""
+        return self.act(batch.state()[mask], batch.thrust_cooldown[mask], batch.wobble_timer[mask],
+                        batch.wobble_direction[mask])
+
+    def save(self, path):
+        """Write the table as one compressed .npz; values are quantized to uint8"""
+        np.savez_compressed(path, values=_quantize(self.values), ticks=self.ticks,
+                            meta=np.array(json.dumps(self._meta())))
+
+    @classmethod
+    def load(cls, path):
+        """Load a table written by save()"""
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            values = data["values"].astype(np.float32) / 127.5 - 1.0
+            ticks = data["ticks"]
+        return cls(values, meta["axes"], ticks, meta["horizon"])
+
+    def _meta(self):
+        return {"horizon": self.horizon, "axes": self.axes, "height_axis": HEIGHT_AXIS, "vy_axis": VY_AXIS,
+                "thrust_cost": THRUST_COST, "outside_penalty": OUTSIDE_PENALTY, "modes": ["fresh", "pending"]}
+
+    def to_bytes(self):
+        """
+        Browser export: FILE_MAGIC, uint32 header length, JSON header (padded
+        to 4 bytes), float32 ticks table, then uint8 values as in save().
+        """
+        header = json.dumps(dict(self._meta(), value_shape=self.values.shape,
+                                 ticks_shape=self.ticks.shape)).encode("utf-8")
+        header += b" " * (-len(header) % 4)
+        return (FILE_MAGIC + struct.pack("<I", len(header)) + header
+                + self.ticks.astype("<f4").tobytes() + _quantize(self.values).tobytes())
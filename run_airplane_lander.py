@@ -3,48 +3,117 @@
 Launcher script for Realistic Airplane Landing Simulator
 """
 
+import argparse
+import importlib.util
 import os
-import sys
 import subprocess
+import sys
+import time
 
-def check_dependencies():
-    """Check if required dependencies are installed"""
-    try:
-        import fastapi
-        import uvicorn
-        print("✓ All dependencies found")
-        return True
-    except ImportError as e:
-        print(f"✗ Missing dependency: {e}")
+# Packages only the RL features need; the web server must start without importing them
+RL_PACKAGES = ("torch", "stable_baselines3", "gymnasium", "numba")
+
+def check_dependencies(loop="auto", http="auto"):
+    """Check if required dependencies (and the selected loop/HTTP implementations) are installed, without importing them"""
+    required = ["fastapi", "uvicorn", "numpy"]
+    required += [name for name, wanted in (("uvloop", loop == "uvloop"), ("httptools", http == "httptools")) if wanted]
+    missing = [name for name in required if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"✗ Missing dependency: {', '.join(missing)}")
         print("Please install required packages:")
-        print("pip install fastapi uvicorn")
+        print(f"pip install {' '.join(missing)}   # or: pip install -r requirements-extra.txt")
         return False
+    print("✓ All dependencies found")
+    return True
+
+def startup_report(top=15):
+    """Import the app in a fresh interpreter with -X importtime and summarize where the time goes"""
+    app_dir = os.path.dirname(os.path.abspath(__file__))
+    code = "import sys; import airplane_lander; print(','.join(sorted(sys.modules)))"
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=app_dir,
+                            capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - start
+
+    # importtime lines: "import time: self [us] | cumulative | <indent>package", children before parents
+    packages = []
+    children = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or line.endswith("package"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = len(name) - len(name.lstrip())
+        if depth == 3:
+            children.append((int(cumulative), name.strip()))
+        elif depth == 1:
+            if name.strip() == "airplane_lander":
+                packages = children
+            children = []
+    modules = set(result.stdout.strip().split(","))
+
+    print(f"⏱  Startup report: interpreter + app import {elapsed * 1000:.0f} ms")
+    for cumulative, name in sorted(packages, reverse=True)[:top]:
+        print(f"   {cumulative / 1000:8.1f} ms  {name}")
+    loaded = [name for name in RL_PACKAGES if name in modules]
+    if loaded:
+        print(f"✗ RL packages imported at startup: {', '.join(loaded)}")
+    else:
+        print(f"✓ No RL packages imported at startup ({', '.join(RL_PACKAGES)} load on first use)")
+
+def parse_args():
+    """Command-line options for the server"""
+    parser = argparse.ArgumentParser(description="Realistic Airplane Landing Simulator server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8005)
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (one per core behind a load balancer)")
+    parser.add_argument("--loop", choices=["auto", "asyncio", "uvloop"], default="auto")
+    parser.add_argument("--http", choices=["auto", "h11", "httptools"], default="auto")
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--startup-report", action="store_true", help="report app import time by package and exit")
+    return parser.parse_args()
 
 def main():
     """Main function to run the airplane lander"""
+    launch_time = time.time()
+    args = parse_args()
     print("🚀 Realistic Airplane Landing Simulator Launcher")
     print("=" * 50)
-    
+
     # Check dependencies
-    if not check_dependencies():
+    if not check_dependencies(args.loop, args.http):
         sys.exit(1)
-    
+    if args.startup_report:
+        startup_report()
+        return
+
+    import uvicorn
+
+    # Workers report their own startup time relative to this moment
+    os.environ["LANDER_LAUNCH_TIME"] = repr(launch_time)
+
     # Start the game server
     print("🎮 Starting Realistic Airplane Landing Simulator...")
-    print("   Access the game at: http://localhost:8005")
+    print(f"   Access the game at: http://{args.host}:{args.port}")
+    print(f"   Workers: {args.workers} | loop: {args.loop} | http: {args.http}")
     print("   Press Ctrl+C to stop the server")
     print()
-    
+
+    options = dict(host=args.host, port=args.port, loop=args.loop, http=args.http, log_level=args.log_level)
     try:
-        # Run the main application
-        subprocess.run([
-            sys.executable, 
-            "airplane_lander.py"
-        ])
+        if args.workers > 1:
+            # Multiple workers need an import string so each process loads the app
+            app_dir = os.path.dirname(os.path.abspath(__file__))
+            uvicorn.run("airplane_lander:app", workers=args.workers, app_dir=app_dir, **options)
+        else:
+            # Single worker: run the app in this process, no second interpreter
+            start = time.perf_counter()
+            from airplane_lander import app
+            print(f"✓ App imported in {(time.perf_counter() - start) * 1000:.0f} ms")
+            uvicorn.run(app, **options)
     except KeyboardInterrupt:
         print("\n🛑 Server stopped by user")
     except Exception as e:
         print(f"❌ Error running the simulator: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Large-scale evaluation of a lander policy or scripted controller.
+
+Episodes are split into fixed-size tasks; each task steps a LanderBatch of
+envs_per_task landers until every lander has flown episodes_per_env
+episodes. Tasks run on a process pool and stream compact per-episode result
+rows back as they finish; rows are folded into running statistics and
+optionally appended to a CSV file, so memory stays flat however many
+episodes are evaluated. Task t always covers the same global environments
+and seeds, so results do not depend on the number of workers.
+"""
+
+import argparse
+import math
+import multiprocessing as mp
+import os
+import sys
+import time
+
+import numpy as np
+
+from airplane_landing_simulator import CRASHED, GROUND_Y, LANDED, LanderBatch, RUNNING
+from lander_controllers import attitude_controller, noop_controller, random_controller
+from lander_randomization import DEFAULT_RANGES, LanderRandomizer
+
+# Outcome code for episodes cut off at max_episode_steps (parks the lander in the batch)
+TIMEOUT = 3
+OUTCOME_NAMES = {LANDED: "landed", CRASHED: "crashed", TIMEOUT: "timeout"}
+
+RESULT_DTYPE = np.dtype([
+    ("task", "<u4"),
+    ("env", "<u4"),
+    ("episode", "<u4"),
+    ("outcome", "u1"),
+    ("touchdown", "?"),
+    ("steps", "<u4"),
+    ("x", "<f4"),
+    ("angle", "<f4"),
+    ("vx", "<f4"),
+])
+CSV_FORMAT = ["%d", "%d", "%d", "%d", "%d", "%d", "%.3f", "%.4f", "%.4f"]
+
+# Touchdown histograms: (low, high, bins); values outside land in the edge bins
+ANGLE_BINS = (-20.0, 20.0, 40)
+VX_BINS = (-4.0, 4.0, 32)
+
+_policy = None
+
+
+def _init_worker(policy_path, table_path=None):
+    """Pool initializer: load the policy or value table once per worker process"""
+    global _policy
+    if policy_path:
+        from lander_inference import load_policy
+        _policy = load_policy(policy_path)
+    elif table_path:
+        from lander_value_table import ValueTable
+        _policy = ValueTable.load(table_path)
+
+
+def _controller(name, seed, task):
+    """Controller for one task; the random controller is seeded per task"""
+    if name in ("policy", "table"):
+        return _policy
+    if name == "random":
+        return random_controller([seed, task])
+    if name == "noop":
+        return noop_controller
+    return attitude_controller
+
+
+def evaluate_task(task, controller, seed=0, envs_per_task=1024, episodes_per_env=16,
+                  max_episode_steps=1000, randomization=None):
+    """
+    Fly episodes_per_env episodes on each of envs_per_task landers; returns
+    RESULT_DTYPE rows. controller is a controller name or an observations ->
+    actions function.
+    """
+    n = int(envs_per_task)
+    act = controller if callable(controller) else _controller(controller, seed, task)
+    batch = LanderBatch(n)
+    randomizer = LanderRandomizer(n, randomization, seed, first_env=task * n)
+    episodes = randomizer.apply(batch)
+    results = np.zeros(n * episodes_per_env, dtype=RESULT_DTYPE)
+    results["task"] = task
+    rows = 0
+    restart = np.zeros(n, dtype=bool)
+
+    while True:
+        done = batch.step(act(batch.state().astype(np.float32)))
+        timeout = (batch.outcome == RUNNING) & (batch.steps >= max_episode_steps)
+        finished = np.flatnonzero(done | timeout)
+        if len(finished):
+            batch.outcome[timeout] = TIMEOUT
+            out = results[rows:rows + len(finished)]
+            out["env"] = task * n + finished
+            out["episode"] = episodes[finished]
+            out["outcome"] = batch.outcome[finished]
+            out["touchdown"] = batch.y[finished] >= GROUND_Y
+            out["steps"] = batch.steps[finished]
+            out["x"] = batch.x[finished]
+            out["angle"] = batch.angle[finished]
+            out["vx"] = batch.vx[finished]
+            rows += len(finished)
+
+            restart[:] = False
+            restart[finished] = randomizer.episodes[finished] < episodes_per_env
+            if restart.any():
+                batch.reset(restart)
+                episodes[restart] = randomizer.apply(batch, restart)
+        if not batch.running.any():
+            return results[:rows]
+
+
+def _evaluate_task(args):
+    return evaluate_task(*args)
+
+
+def wilson_interval(successes, trials, z=1.96):
+    """Wilson score confidence interval for a binomial rate (95% by default)"""
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denominator
+    half = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+class EvaluationStats:
+    """Running aggregates over streamed result rows"""
+
+    def __init__(self):
+        self.episodes = 0
+        self.steps = 0
+        self.outcomes = {code: 0 for code in OUTCOME_NAMES}
+        self.touchdowns = 0
+        self.angle_counts = np.zeros(ANGLE_BINS[2], dtype=np.int64)
+        self.vx_counts = np.zeros(VX_BINS[2], dtype=np.int64)
+
+    @staticmethod
+    def _bin(values, bins):
+        low, high, count = bins
+        index = np.floor((values - low) / (high - low) * count).astype(np.int64)
+        return np.bincount(np.clip(index, 0, count - 1), minlength=count)
+
+    def update(self, rows):
+        self.episodes += len(rows)
+        self.steps += int(rows["steps"].sum(dtype=np.int64))
+        counts = np.bincount(rows["outcome"], minlength=TIMEOUT + 1)
+        for code in self.outcomes:
+            self.outcomes[code] += int(counts[code])
+        touchdown = rows[rows["touchdown"]]
+        self.touchdowns += len(touchdown)
+        self.angle_counts += self._bin(touchdown["angle"], ANGLE_BINS)
+        self.vx_counts += self._bin(touchdown["vx"], VX_BINS)
+
+
+def print_histogram(title, counts, bins, width=50):
+    """ASCII histogram of counts over evenly spaced bins, empty tails trimmed"""
+    low, high, count = bins
+    edges = np.linspace(low, high, count + 1)
+    peak = max(1, int(counts.max()))
+    print(f"   {title}")
+    filled = np.flatnonzero(counts)
+    if not len(filled):
+        return
+    for i in range(filled[0], filled[-1] + 1):
+        value = counts[i]
+        bar = "█" * int(round(value / peak * width))
+        print(f"   {edges[i]:7.2f} .. {edges[i + 1]:7.2f} {value:>10,} {bar}")
+
+
+def print_report(stats, elapsed):
+    """Success/crash rates with 95% intervals, touchdown histograms, throughput"""
+    print()
+    print(f"📊 {stats.episodes:,} episodes, {stats.steps:,} lander-steps in {elapsed:.1f}s")
+    for code, name in OUTCOME_NAMES.items():
+        count = stats.outcomes[code]
+        low, high = wilson_interval(count, stats.episodes)
+        rate = count / stats.episodes if stats.episodes else 0.0
+        print(f"   {name:>8}: {rate:9.5%}  95% CI [{low:.5%}, {high:.5%}]  ({count:,})")
+    print(f"   touchdowns: {stats.touchdowns:,} (the rest left the boundaries or timed out)")
+    print()
+    print_histogram("touchdown angle (degrees)", stats.angle_counts, ANGLE_BINS)
+    print()
+    print_histogram("touchdown horizontal velocity", stats.vx_counts, VX_BINS)
+    print()
+    print(f"⏱  {stats.episodes / elapsed:,.0f} episodes/sec, {stats.steps / elapsed / 1e6:,.2f} M lander-steps/sec")
+
+
+def main():
+    """Main function for policy evaluation"""
+    parser = argparse.ArgumentParser(description="Evaluate a lander policy over many episodes")
+    parser.add_argument("--controller", choices=["attitude", "noop", "random"], default="attitude",
+                        help="scripted controller (ignored with --policy or --value-table)")
+    parser.add_argument("--policy", metavar="PATH", help="saved PPO model to evaluate")
+    parser.add_argument("--value-table", metavar="PATH", help="value-iteration table to evaluate (run_value_table.py)")
+    parser.add_argument("--episodes", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=max(1, os.cpu_count() or 1))
+    parser.add_argument("--envs-per-task", type=int, default=1024)
+    parser.add_argument("--episodes-per-env", type=int, default=16)
+    parser.add_argument("--max-episode-steps", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--randomize", action="store_true", help="randomize start state and physics per episode")
+    parser.add_argument("--output", metavar="PATH", help="stream per-episode results to a CSV file")
+    args = parser.parse_args()
+
+    controller = "policy" if args.policy else "table" if args.value_table else args.controller
+    per_task = args.envs_per_task * args.episodes_per_env
+    num_tasks = max(1, -(-args.episodes // per_task))
+    randomization = DEFAULT_RANGES if args.randomize else None
+
+    print("🎯 Landing Simulator Evaluation")
+    print("=" * 50)
+    print(f"   {controller}: {num_tasks * per_task:,} episodes in {num_tasks} tasks on {args.workers} workers")
+
+    tasks = ((task, controller, args.seed, args.envs_per_task, args.episodes_per_env,
+              args.max_episode_steps, randomization) for task in range(num_tasks))
+    stats = EvaluationStats()
+    output = None
+    if args.output:
+        output = open(args.output, "w")
+        output.write(",".join(RESULT_DTYPE.names) + "\n")
+
+    start = time.perf_counter()
+    try:
+        with mp.Pool(args.workers, initializer=_init_worker, initargs=(args.policy, args.value_table)) as pool:
+            for done, rows in enumerate(pool.imap_unordered(_evaluate_task, tasks), start=1):
+                stats.update(rows)
+                if output is not None:
+                    np.savetxt(output, rows, fmt=CSV_FORMAT, delimiter=",")
+                elapsed = time.perf_counter() - start
+                print(f"\r   {done}/{num_tasks} tasks, {stats.episodes / elapsed:,.0f} episodes/sec", end="", flush=True)
+    except KeyboardInterrupt:
+        print("\n🛑 Interrupted; reporting the episodes finished so far")
+    finally:
+        if output is not None:
+            output.close()
+
+    if stats.episodes == 0:
+        sys.exit(1)
+    print_report(stats, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Launcher script for the server-side Landing Simulator engine
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from airplane_landing_simulator import LanderBatch, NUM_ACTIONS, RUNNING, available_backends, check_golden
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden", "lander_trajectories.json")
+
+
+def run_golden_check(path, backends):
+    """Compare every engine backend against the browser golden trajectories"""
+    ok = True
+    for backend in backends:
+        print(f"🔍 Checking {backend} engine against {path}")
+        mismatches = check_golden(path, backend)
+        if mismatches:
+            for line in mismatches[:20]:
+                print(f"   ✗ {line}")
+            print(f"✗ {len(mismatches)} mismatches")
+            ok = False
+        else:
+            print("✓ All golden trajectories match exactly")
+    return ok
+
+
+def run_benchmark(batch_sizes, ticks, backends):
+    """Measure batched lander-steps/sec per backend with random actions and autoreset"""
+    rng = np.random.default_rng(0)
+    print(f"⏱  Benchmarking {ticks} ticks per batch size")
+    print(f"   {'N':>8}  " + "".join(f"{backend:>10}" for backend in backends) + "   (M lander-steps/sec)")
+    for n in batch_sizes:
+        actions = rng.integers(0, NUM_ACTIONS, size=(64, n), dtype=np.int8)
+        rates = []
+        for backend in backends:
+            batch = LanderBatch(n, backend)
+            batch.step(actions[0])  # warm-up (JIT compilation)
+            batch.reset()
+            start = time.perf_counter()
+            for tick in range(ticks):
+                batch.step(actions[tick % 64])
+                if tick % 64 == 63:
+                    batch.reset(batch.outcome != RUNNING)
+            rates.append(n * ticks / (time.perf_counter() - start) / 1e6)
+        print(f"   {n:>8}  " + "".join(f"{rate:10.2f}" for rate in rates))
+
+
+def run_recording(path, episodes, num_envs):
+    """Record random-policy episodes to a recording file"""
+    from env.mountain_car_plane_env import MountainCarPlaneVectorEnv
+    from lander_recording import EpisodeRecorder
+
+    print(f"💾 Recording {episodes} random-policy episodes to {path}")
+    rng = np.random.default_rng(0)
+    env = MountainCarPlaneVectorEnv(num_envs, recorder=EpisodeRecorder(path, num_envs))
+    env.reset(seed=0)
+    finished = 0
+    start = time.perf_counter()
+    while finished < episodes:
+        _, _, terminated, truncated, _ = env.step(rng.integers(0, NUM_ACTIONS, size=num_envs))
+        finished += int(terminated.sum() + truncated.sum())
+    env.close()
+    print(f"✓ Recorded {finished} episodes in {time.perf_counter() - start:.1f}s")
+
+
+def main():
+    """Main function for the landing simulator engine"""
+    parser = argparse.ArgumentParser(description="Server-side Landing Simulator engine")
+    parser.add_argument("--check-golden", action="store_true", help="verify against browser golden trajectories")
+    parser.add_argument("--golden-path", default=GOLDEN_PATH)
+    parser.add_argument("--benchmark", action="store_true", help="measure batched step throughput")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 1000, 10000, 100000])
+    parser.add_argument("--ticks", type=int, default=1000)
+    parser.add_argument("--backends", nargs="+", choices=available_backends(), default=list(available_backends()),
+                        help="engine backends to check and benchmark")
+    parser.add_argument("--record", metavar="PATH", help="record random-policy episodes to PATH")
+    parser.add_argument("--episodes", type=int, default=1000)
+    parser.add_argument("--num-envs", type=int, default=256)
+    args = parser.parse_args()
+
+    print("🚀 Landing Simulator Engine")
+    print("=" * 50)
+
+    ok = True
+    if args.check_golden or not (args.benchmark or args.record):
+        ok = run_golden_check(args.golden_path, args.backends)
+    if args.benchmark:
+        run_benchmark(args.batch_sizes, args.ticks, args.backends)
+    if args.record:
+        run_recording(args.record, args.episodes, args.num_envs)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Launcher script for Mountain Car Plane training
+"""
+
+import importlib.util
+import os
+import sys
+
+def check_dependencies(training=True):
+    """Check the RL dependencies are installed, without importing them"""
+    required = ["numpy", "gymnasium", "torch", "stable_baselines3"] if training else ["numpy", "gymnasium"]
+    missing = [name for name in required if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"✗ Missing dependency: {', '.join(missing)}")
+        print("Please install required packages:")
+        print(f"pip install {' '.join(name.replace('_', '-') for name in missing)}")
+        return False
+    print("✓ All dependencies found")
+    return True
+
+def main():
+    """Main function to run lander training (arguments as for training/train_mountain_car.py)"""
+    # Benchmarking and replay collection need no torch/stable-baselines3
+    training = not {"--benchmark", "--collect-replay"} & {arg.split("=")[0] for arg in sys.argv[1:]}
+    if not check_dependencies(training):
+        sys.exit(1)
+
+    # Heavy RL imports happen only now, inside the training module
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from training.train_mountain_car import main as train_main
+    train_main()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Launcher script for the value-iteration lookup table (lander_value_table.py)
+"""
+
+import argparse
+import os
+import time
+
+from airplane_landing_simulator import LANDED, LanderBatch
+from lander_controllers import attitude_controller
+from lander_randomization import DEFAULT_RANGES, LanderRandomizer
+from lander_value_table import DEFAULT_AXES, DEFAULT_HORIZON, ValueTable
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lander_value_table.npz")
+
+# Tougher than DEFAULT_RANGES: tilted, drifting and spinning, with little time left
+HARD_RANGES = dict(DEFAULT_RANGES, y=(230.0, 290.0), angle=(-25.0, 25.0), vx=(-2.5, 2.5),
+                   angular_velocity=(-3.0, 3.0))
+
+
+def landing_rate(act, ranges, num_landers, seed=0):
+    """Fraction of randomized episodes a controller (batch -> actions) lands"""
+    batch = LanderBatch(num_landers)
+    LanderRandomizer(num_landers, ranges, seed).apply(batch)
+    while batch.running.any():
+        batch.step(act(batch))
+    return float((batch.outcome == LANDED).mean())
+
+
+def run_check(table, num_landers):
+    """Landing rates of the table against the attitude controller"""
+    controllers = {
+        "table": table.act_batch,
+        "table (observations only)": lambda batch: table(batch.state()),
+        "attitude": lambda batch: attitude_controller(batch.state()),
+    }
+    print(f"🔍 Landing rate over {num_landers:,} randomized episodes")
+    print(f"   {'controller':<28}{'default ranges':>16}{'hard ranges':>14}")
+    for name, act in controllers.items():
+        rates = [landing_rate(act, ranges, num_landers) for ranges in (DEFAULT_RANGES, HARD_RANGES)]
+        print(f"   {name:<28}" + "".join(f"{rate:>15.3%}" for rate in rates))
+
+
+def main():
+    """Main function for the value table"""
+    parser = argparse.ArgumentParser(description="Build and check the value-iteration lookup table")
+    parser.add_argument("--output", default=TABLE_PATH, help="where to write the table (.npz)")
+    parser.add_argument("--horizon", type=int, default=DEFAULT_HORIZON, help="ticks to touchdown solved for")
+    for name, (low, high, points) in DEFAULT_AXES.items():
+        parser.add_argument(f"--{name.replace('_', '-')}-points", type=int, default=points,
+                            help=f"grid points over [{low}, {high}]")
+    parser.add_argument("--check", metavar="PATH", help="check an existing table instead of building one")
+    parser.add_argument("--episodes", type=int, default=8192, help="episodes per landing-rate check")
+    args = parser.parse_args()
+
+    print("🧭 Lander Value Table")
+    print("=" * 50)
+    if args.check:
+        table = ValueTable.load(args.check)
+    else:
+        axes = {name: (low, high, getattr(args, f"{name}_points")) for name, (low, high, _) in DEFAULT_AXES.items()}
+        start = time.perf_counter()
+        table = ValueTable.build(axes, args.horizon)
+        print(f"✓ Solved {table.values[1:].size:,} grid values in {time.perf_counter() - start:.1f}s")
+        table.save(args.output)
+        print(f"💾 Saved to {args.output} ({os.path.getsize(args.output) / 1e6:.2f} MB, "
+              f"browser export {len(table.to_bytes()) / 1e6:.2f} MB)")
+        table = ValueTable.load(args.output)  # check what was saved, quantization included
+    run_check(table, args.episodes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,817 @@
+// --- physics:begin ---
+// Lander dynamics on a fixed 60 Hz tick. airplane_landing_simulator.py
+// mirrors this block operation for operation; golden/make_golden.js
+// evaluates it in Node to produce the trajectories the Python engine
+// is checked against.
+const PHYSICS = {
+    tickRate: 60,            // Fixed physics ticks per second (engine TICK_RATE)
+    gravity: 0.03,           // Increased from 0.025 to 0.03 for slightly faster descent
+    angularDamping: 0.96,    // Reduced from 0.97 to 0.96 for less stabilization
+    dragX: 0.98,             // Reduced from 0.985 to 0.98 for less resistance
+    dragY: 0.994,            // Reduced from 0.995 to 0.994 for slightly faster descent
+    thrustVelocity: 0.55,    // Increased from 0.35 to 0.55 for faster response
+    thrustAngular: 1.5,      // Increased from 1.0 to 1.5 for faster rotation
+    wobbleAngle: 0.8,        // Increased from 0.5 to 0.8
+    thrustCooldownTicks: 3,  // Prevent spam: one thrust per 50 ms while held
+    wobbleDelayTicks: 3,     // Wobble lands 50 ms after the thrust
+    boundaryLeft: -100,      // Allow some movement beyond edges
+    boundaryRight: 700,
+    groundY: 315,
+    landingMaxAngle: 5,      // Made more challenging
+    landingMaxVelocityX: 1.0
+};
+
+// Thrust direction per action: 0 = no engine, 1 = left engine, 2 = right engine
+const ACTION_DIRECTION = [0, 1, -1];
+
+function createLander() {
+    return { x: 300, y: 50, angle: 0, vx: 0, vy: 0.25, angularVelocity: 0 };
+}
+
+function createControls() {
+    return { cooldown: 0, wobbleTimer: 0, wobbleDirection: 0 };
+}
+
+// direction: +1 = left engine (pushes RIGHT, CLOCKWISE), -1 = right engine
+function applyThrust(lander, direction) {
+    lander.vx += direction * PHYSICS.thrustVelocity;
+    lander.angularVelocity += direction * PHYSICS.thrustAngular;
+}
+
+function applyWobble(lander, direction) {
+    lander.angle += direction * PHYSICS.wobbleAngle;
+}
+
+// Advance the dynamics by one tick. Returns 'running', 'landed' or 'crashed'.
+function stepPhysics(lander) {
+    // Apply gravity for slow descent
+    lander.vy += PHYSICS.gravity;
+
+    // Apply angular damping (natural stabilization)
+    lander.angularVelocity *= PHYSICS.angularDamping;
+    lander.angle += lander.angularVelocity;
+
+    // Apply air resistance for more realistic movement
+    lander.vx *= PHYSICS.dragX;
+    lander.vy *= PHYSICS.dragY;
+
+    // Update position
+    lander.x += lander.vx;
+    lander.y += lander.vy;
+
+    // Boundary checks
+    if (lander.x < PHYSICS.boundaryLeft || lander.x > PHYSICS.boundaryRight) {
+        return 'crashed';
+    }
+
+    // Ground collision
+    if (lander.y > PHYSICS.groundY) {
+        lander.y = PHYSICS.groundY;
+        lander.vy = 0;
+        if (Math.abs(lander.angle) < PHYSICS.landingMaxAngle &&
+            Math.abs(lander.vx) < PHYSICS.landingMaxVelocityX) {
+            return 'landed';
+        }
+        return 'crashed';
+    }
+    return 'running';
+}
+
+// One fixed tick with the given engine held: the pending wobble fires if
+// the same engine is still held, a new thrust fires once the cooldown
+// has elapsed, then the dynamics advance.
+function stepTick(lander, controls, action) {
+    const direction = ACTION_DIRECTION[action];
+    if (controls.wobbleTimer > 0) {
+        controls.wobbleTimer -= 1;
+        if (controls.wobbleTimer === 0 && direction === controls.wobbleDirection) {
+            applyWobble(lander, direction);
+        }
+    }
+    if (controls.cooldown > 0) {
+        controls.cooldown -= 1;
+    }
+    if (direction !== 0 && controls.cooldown === 0) {
+        applyThrust(lander, direction);
+        controls.cooldown = PHYSICS.thrustCooldownTicks;
+        controls.wobbleTimer = PHYSICS.wobbleDelayTicks;
+        controls.wobbleDirection = direction;
+    }
+    return stepPhysics(lander);
+}
+// --- physics:end ---
+
+// Fixed-timestep loop: physics always advances in TICK_MS steps; the
+// renderer interpolates between the last two ticks. Elapsed time is
+// capped so a backgrounded tab resumes instead of spiralling.
+const TICK_MS = 1000 / PHYSICS.tickRate;
+const MAX_CATCH_UP_TICKS = 15;
+
+// Game variables
+const lander = createLander();
+const previousLander = createLander();
+const renderPose = { x: lander.x, y: lander.y, angle: lander.angle };
+const controls = createControls();
+let heldAction = 0;
+let aiPilot = null;     // { name, act(lander, controls) }, loaded on first use
+let aiFlying = false;
+let tick = 0;
+let accumulator = 0;
+let lastFrameTime = null;
+let altitude = 300;
+let speed = 15;
+let gameRunning = true;
+
+// HUD text and altitude bar are refreshed a few times per second only
+const HUD_INTERVAL_MS = 250;
+let lastHudTime = -Infinity;
+let hudText = '';
+let leftEngineOn = false;
+let rightEngineOn = false;
+
+// DOM elements
+const sceneCanvas = document.getElementById('sceneCanvas');
+const leftKey = document.getElementById('leftKey');
+const rightKey = document.getElementById('rightKey');
+const pilotToggle = document.getElementById('pilotToggle');
+const status = document.getElementById('status');
+const altitudeFill = document.getElementById('altitudeFill');
+const gameArea = document.getElementById('gameArea');
+const crashAnimation = document.getElementById('crashAnimation');
+const successAnimation = document.getElementById('successAnimation');
+
+// Rocket, flames and lander pose all live on one canvas: one draw per
+// frame and no per-frame style or layout work. Reusable for any canvas.
+function createSceneRenderer(canvas) {
+    const ctx = canvas.getContext('2d');
+    const flameLevels = { left: 0, right: 0 };
+    let width = 0;
+    let height = 0;
+
+    function resize() {
+        const ratio = window.devicePixelRatio || 1;
+        width = canvas.clientWidth;
+        height = canvas.clientHeight;
+        canvas.width = Math.round(width * ratio);
+        canvas.height = Math.round(height * ratio);
+        ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+    }
+
+    function flameGradient(top, bottom) {
+        const gradient = ctx.createLinearGradient(0, bottom, 0, top);
+        gradient.addColorStop(0, '#ff5722');
+        gradient.addColorStop(0.5, '#ff9800');
+        gradient.addColorStop(1, '#ffff00');
+        return gradient;
+    }
+
+    // Flame with a rounded top and an orange glow
+    function drawFlame(left, top, flameWidth, flameHeight, opacity, glow) {
+        if (opacity <= 0.01) return;
+        const radius = flameWidth / 2;
+        ctx.globalAlpha = opacity;
+        ctx.shadowColor = '#ff5722';
+        ctx.shadowBlur = glow;
+        ctx.fillStyle = flameGradient(top, top + flameHeight);
+        ctx.beginPath();
+        ctx.moveTo(left, top + flameHeight);
+        ctx.lineTo(left, top + radius);
+        ctx.arc(left + radius, top + radius, radius, Math.PI, 0);
+        ctx.lineTo(left + flameWidth, top + flameHeight);
+        ctx.closePath();
+        ctx.fill();
+        ctx.shadowBlur = 0;
+        ctx.globalAlpha = 1;
+    }
+
+    // Rocket in its 40x40 box with the top-left corner at (x - 20, y),
+    // rotated about the box centre
+    function drawRocket(pose) {
+        ctx.save();
+        ctx.translate(pose.x, pose.y + 20);
+        ctx.rotate(pose.angle * Math.PI / 180);
+        ctx.translate(-20, -20);
+        ctx.fillStyle = '#e0e0e0';
+        ctx.beginPath();
+        ctx.roundRect(15, 5, 10, 25, 2);
+        ctx.fill();
+        ctx.fillStyle = '#f5f5f5';
+        ctx.beginPath();
+        ctx.moveTo(15, 5); ctx.lineTo(25, 5); ctx.lineTo(20, 0);
+        ctx.fill();
+        ctx.fillStyle = '#bdbdbd';
+        ctx.beginPath();
+        ctx.moveTo(15, 30); ctx.lineTo(10, 35); ctx.lineTo(15, 35);
+        ctx.moveTo(25, 30); ctx.lineTo(30, 35); ctx.lineTo(25, 35);
+        ctx.fill();
+        ctx.fillStyle = '#4fc3f7';
+        ctx.beginPath();
+        ctx.arc(20, 12, 3, 0, 2 * Math.PI);
+        ctx.fill();
+        ctx.restore();
+    }
+
+    function draw(pose, leftOn, rightOn) {
+        if (width !== canvas.clientWidth || height !== canvas.clientHeight) resize();
+        ctx.clearRect(0, 0, width, height);
+
+        // Ease flames in and out instead of CSS transitions
+        flameLevels.left += ((leftOn ? 1 : 0) - flameLevels.left) * 0.35;
+        flameLevels.right += ((rightOn ? 1 : 0) - flameLevels.right) * 0.35;
+
+        drawFlame(pose.x - 12.5, pose.y + 35, 25, 40, 0.7, 20);
+        drawFlame(pose.x - 25, pose.y + 35, 20, 30 + 10 * flameLevels.left, flameLevels.left, 15);
+        drawFlame(pose.x + 5, pose.y + 35, 20, 30 + 10 * flameLevels.right, flameLevels.right, 15);
+        drawRocket(pose);
+    }
+
+    // Swarm: every lander of one outcome goes into a single path, so the
+    // whole population costs one fill per outcome colour
+    function drawSwarm(poses, outcomes, count, scale) {
+        if (width !== canvas.clientWidth || height !== canvas.clientHeight) resize();
+        ctx.clearRect(0, 0, width, height);
+        ctx.globalAlpha = 0.6;
+        for (let outcome = 0; outcome < SWARM_COLORS.length; outcome++) {
+            ctx.fillStyle = SWARM_COLORS[outcome];
+            ctx.beginPath();
+            for (let i = 0; i < count; i++) {
+                if (outcomes[i] !== outcome) continue;
+                const cx = poses[3 * i] / scale[0];
+                const cy = poses[3 * i + 1] / scale[1] + 20;
+                const radians = poses[3 * i + 2] / scale[2] * Math.PI / 180;
+                const cos = Math.cos(radians);
+                const sin = Math.sin(radians);
+                for (let k = 0; k < ROCKET_OUTLINE.length; k += 2) {
+                    const px = ROCKET_OUTLINE[k];
+                    const py = ROCKET_OUTLINE[k + 1];
+                    const x = cx + px * cos - py * sin;
+                    const y = cy + px * sin + py * cos;
+                    if (k === 0) ctx.moveTo(x, y); else ctx.lineTo(x, y);
+                }
+                ctx.closePath();
+            }
+            ctx.fill();
+        }
+        ctx.globalAlpha = 1;
+    }
+
+    return { draw, drawSwarm };
+}
+
+// Rocket silhouette about its box centre (x, y pairs) and one colour per
+// outcome (running, landed, crashed) for the swarm view
+const ROCKET_OUTLINE = [0, -20, 5, -15, 5, 10, 10, 15, -10, 15, -5, 10, -5, -15];
+const SWARM_COLORS = ['#4fc3f7', '#66bb6a', '#ef5350'];
+
+const sceneRenderer = createSceneRenderer(sceneCanvas);
+
+// Initialize positions
+updateRocketPosition(lander);
+
+// Keyboard event listeners
+document.addEventListener('keydown', function(event) {
+    if (!gameRunning) return;
+
+    switch(event.key) {
+        case 'ArrowLeft':
+            activateLeftEngine();
+            event.preventDefault();
+            break;
+        case 'ArrowRight':
+            activateRightEngine();
+            event.preventDefault();
+            break;
+        case 'p':
+            if (!liveEpisode && !swarmMode) setAiPilot(!aiFlying);
+            break;
+    }
+});
+
+document.addEventListener('keyup', function(event) {
+    switch(event.key) {
+        case 'ArrowLeft':
+            deactivateLeftEngine();
+            event.preventDefault();
+            break;
+        case 'ArrowRight':
+            deactivateRightEngine();
+            event.preventDefault();
+            break;
+    }
+});
+
+// Touch events for mobile
+leftKey.addEventListener('touchstart', function(e) {
+    e.preventDefault();
+    activateLeftEngine();
+});
+
+leftKey.addEventListener('touchend', function(e) {
+    e.preventDefault();
+    deactivateLeftEngine();
+});
+
+rightKey.addEventListener('touchstart', function(e) {
+    e.preventDefault();
+    activateRightEngine();
+});
+
+rightKey.addEventListener('touchend', function(e) {
+    e.preventDefault();
+    deactivateRightEngine();
+});
+
+// Mouse events for desktop
+leftKey.addEventListener('mousedown', activateLeftEngine);
+leftKey.addEventListener('mouseup', deactivateLeftEngine);
+leftKey.addEventListener('mouseleave', deactivateLeftEngine);
+
+rightKey.addEventListener('mousedown', activateRightEngine);
+rightKey.addEventListener('mouseup', deactivateRightEngine);
+rightKey.addEventListener('mouseleave', deactivateRightEngine);
+
+// Left engine pushes rocket RIGHT and creates CLOCKWISE rotation. The
+// held engine is sampled once per physics tick in stepTick().
+function activateLeftEngine() {
+    leftKey.classList.add('active');
+    leftEngineOn = true;
+    setHeldAction(1);
+}
+
+function deactivateLeftEngine() {
+    if (!leftKey.classList.contains('active')) return;
+    leftKey.classList.remove('active');
+    leftEngineOn = false;
+    if (heldAction === 1) {
+        setHeldAction(rightKey.classList.contains('active') ? 2 : 0);
+    }
+}
+
+// Right engine pushes rocket LEFT and creates COUNTER-CLOCKWISE rotation
+function activateRightEngine() {
+    rightKey.classList.add('active');
+    rightEngineOn = true;
+    setHeldAction(2);
+}
+
+function deactivateRightEngine() {
+    if (!rightKey.classList.contains('active')) return;
+    rightKey.classList.remove('active');
+    rightEngineOn = false;
+    if (heldAction === 2) {
+        setHeldAction(leftKey.classList.contains('active') ? 1 : 0);
+    }
+}
+
+function setHeldAction(action) {
+    if (action === heldAction) return;
+    heldAction = action;
+    // Live mode: the server owns the physics, just report the held engine
+    if (liveSocket) sendLiveAction(action);
+}
+
+function updateRocketPosition(pose) {
+    sceneRenderer.draw(pose, leftEngineOn, rightEngineOn);
+}
+
+// Throttled to HUD_INTERVAL_MS unless forced (e.g. on landing or crash)
+function updateStatus(force) {
+    const now = performance.now();
+    if (!force && now - lastHudTime < HUD_INTERVAL_MS) return;
+    lastHudTime = now;
+    const text = `${aiFlying ? `🤖 ${aiPilot.name} | ` : ''}Altitude: ${Math.round(altitude)}ft | Speed: ${Math.round(speed)} mph | Angle: ${Math.round(lander.angle)}°`;
+    if (text === hudText) return;
+    hudText = text;
+    status.textContent = text;
+    altitudeFill.style.height = (altitude / 300 * 100) + '%';
+}
+
+function showCrash() {
+    crashAnimation.style.display = 'flex';
+    gameRunning = false;
+}
+
+function showSuccess() {
+    successAnimation.style.display = 'flex';
+    gameRunning = false;
+}
+
+// Advance one fixed tick; returns the outcome of stepTick()
+function advanceTick() {
+    if (aiFlying) {
+        heldAction = aiPilot.act(lander, controls);
+        leftEngineOn = heldAction === 1;
+        rightEngineOn = heldAction === 2;
+    }
+    if (aiFlying) demoAssisted = true;
+    else recordDemoTick(tick, lander, heldAction);
+    Object.assign(previousLander, lander);
+    const outcome = stepTick(lander, controls, heldAction);
+    tick += 1;
+    if (outcome !== 'running') endDemoEpisode(outcome);
+    return outcome;
+}
+
+// Game loop: run as many fixed ticks as real time allows, then render
+function gameLoop(now) {
+    if (!gameRunning) return;
+
+    if (lastFrameTime === null) lastFrameTime = now;
+    accumulator += Math.min(now - lastFrameTime, MAX_CATCH_UP_TICKS * TICK_MS);
+    lastFrameTime = now;
+
+    let outcome = 'running';
+    while (accumulator >= TICK_MS && outcome === 'running') {
+        outcome = advanceTick();
+        accumulator -= TICK_MS;
+    }
+
+    // Update altitude and speed
+    altitude = 300 - lander.y;
+    speed = Math.sqrt(lander.vx * lander.vx + lander.vy * lander.vy) * 12;
+
+    // Update rocket position (interpolated between ticks) and status
+    const alpha = outcome === 'running' ? accumulator / TICK_MS : 1;
+    renderPose.x = previousLander.x + (lander.x - previousLander.x) * alpha;
+    renderPose.y = previousLander.y + (lander.y - previousLander.y) * alpha;
+    renderPose.angle = previousLander.angle + (lander.angle - previousLander.angle) * alpha;
+    updateRocketPosition(renderPose);
+    updateStatus(outcome !== 'running');
+
+    if (outcome === 'landed') {
+        showSuccess();
+        return;
+    }
+    if (outcome === 'crashed') {
+        showCrash();
+        return;
+    }
+
+    // Continue game loop
+    requestAnimationFrame(gameLoop);
+}
+
+// --- policy:begin ---
+// Trained policy run in the page: the actor network exported by
+// lander_inference.export_policy_weights() (served on /policy-weights),
+// dense layers over the float32 observation, action = argmax of the logits.
+function parsePolicyWeights(buffer) {
+    const view = new DataView(buffer);
+    const headerLength = view.getUint32(4, true);
+    const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 8, headerLength)));
+    let offset = 8 + headerLength;
+    const layers = header.layers.map(({ inputs, outputs, activation }) => {
+        const weight = new Float32Array(buffer, offset, inputs * outputs);
+        offset += weight.byteLength;
+        const bias = new Float32Array(buffer, offset, outputs);
+        offset += bias.byteLength;
+        return { inputs, outputs, activation, weight, bias };
+    });
+    const width = Math.max(...layers.map((layer) => layer.outputs));
+    return { layers, input: new Float32Array(layers[0].inputs), scratch: [new Float32Array(width), new Float32Array(width)] };
+}
+
+const ACTIVATIONS = { tanh: Math.tanh, relu: (x) => Math.max(x, 0) };
+
+function policyAction(policy, lander) {
+    // Observation in STATE_FIELDS order, rounded to float32 like the training env
+    const input = policy.input;
+    input[0] = lander.x; input[1] = lander.y; input[2] = lander.angle;
+    input[3] = lander.vx; input[4] = lander.vy; input[5] = lander.angularVelocity;
+    let x = input;
+    policy.layers.forEach(({ inputs, outputs, activation, weight, bias }, index) => {
+        const y = policy.scratch[index % 2];
+        for (let j = 0; j < outputs; j++) {
+            let sum = bias[j];
+            for (let i = 0; i < inputs; i++) sum += weight[j * inputs + i] * x[i];
+            y[j] = activation ? ACTIVATIONS[activation](sum) : sum;
+        }
+        x = y;
+    });
+    const logits = x.subarray(0, policy.layers[policy.layers.length - 1].outputs);
+    return logits.indexOf(Math.max(...logits));
+}
+// --- policy:end ---
+
+// --- autopilot:begin ---
+// Value-table autopilot: the server's value-iteration table
+// (lander_value_table.py, served on /value-table). Same lookup as
+// ValueTable.act(): simulate each engine choice exactly and take the best
+// interpolated value of where it leads.
+function parseValueTable(buffer) {
+    const view = new DataView(buffer);
+    const headerLength = view.getUint32(4, true);
+    const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 8, headerLength)));
+    const ticksLength = header.ticks_shape[0] * header.ticks_shape[1];
+    const ticks = new Float32Array(buffer, 8 + headerLength, ticksLength);
+    const values = new Uint8Array(buffer, 8 + headerLength + ticksLength * 4);
+    const axes = [header.axes.angle, header.axes.angular_velocity, header.axes.vx];
+    const layerSize = values.length / (header.horizon + 1);
+    return { header, ticks, values, axes, layerSize };
+}
+
+// Lower grid index, fractional offset and steps outside the axis
+function gridCoordinates(value, [low, high, points]) {
+    const unclamped = (value - low) / (high - low) * (points - 1);
+    const position = Math.min(Math.max(unclamped, 0), points - 1);
+    const index = Math.min(Math.floor(position), points - 2);
+    return [index, position - index, Math.abs(unclamped - position)];
+}
+
+function ticksToTouchdown(table, y, vy) {
+    const [ih, th] = gridCoordinates(PHYSICS.groundY - y, table.header.height_axis);
+    const [iv, tv] = gridCoordinates(vy, table.header.vy_axis);
+    const columns = table.header.ticks_shape[1];
+    const t = (i, j) => table.ticks[i * columns + j];
+    const ticks = (1 - th) * ((1 - tv) * t(ih, iv) + tv * t(ih, iv + 1))
+                + th * ((1 - tv) * t(ih + 1, iv) + tv * t(ih + 1, iv + 1));
+    return Math.min(Math.max(Math.ceil(ticks), 1), table.header.horizon);
+}
+
+// Trilinear value at layer k; mode 0 = fresh, +1/-1 = wobble pending (-1 mirrored)
+function tableValue(table, k, mode, { angle, angularVelocity, vx }) {
+    const sign = mode < 0 ? -1 : 1;
+    const [[ia, ta, oa], [iw, tw, ow], [iu, tu, ou]] = [angle, angularVelocity, vx].map(
+        (value, axis) => gridCoordinates(sign * value, table.axes[axis]));
+    const [na, nw, nu] = table.axes.map((axis) => axis[2]);
+    const base = k * table.layerSize + (((mode === 0 ? 0 : 1) * na + ia) * nw + iw) * nu + iu;
+    let value = 0;
+    for (let corner = 0; corner < 8; corner++) {
+        const da = (corner >> 2) & 1, dw = (corner >> 1) & 1, du = corner & 1;
+        const weight = (da ? ta : 1 - ta) * (dw ? tw : 1 - tw) * (du ? tu : 1 - tu);
+        value += weight * (table.values[base + (da * nw + dw) * nu + du] / 127.5 - 1);
+    }
+    return value - table.header.outside_penalty * (oa + ow + ou);
+}
+
+function terminalValue({ angle, vx }) {
+    const margin = Math.min(1 - Math.abs(angle) / PHYSICS.landingMaxAngle,
+                            1 - Math.abs(vx) / PHYSICS.landingMaxVelocityX);
+    return Math.min(Math.max(margin, -1), 1);
+}
+
+// Controlled state after `ticks` ticks with no engine
+function freeFlight({ angle, angularVelocity, vx }, ticks) {
+    for (let i = 0; i < ticks; i++) {
+        angularVelocity *= PHYSICS.angularDamping;
+        angle += angularVelocity;
+        vx *= PHYSICS.dragX;
+    }
+    return { angle, angularVelocity, vx };
+}
+
+function autopilotAction(table, lander, controls) {
+    if (controls.cooldown > 1) return 0;  // engine still cooling down
+    const mode = controls.wobbleTimer === 1 ? controls.wobbleDirection : 0;
+    const k = ticksToTouchdown(table, lander.y, lander.vy);
+    const noop = freeFlight(lander, 1);
+    let best = k === 1 ? terminalValue(noop) : tableValue(table, k - 1, 0, noop);
+    let action = 0;
+    for (const candidate of [1, 2]) {
+        const direction = ACTION_DIRECTION[candidate];
+        const state = {
+            angle: lander.angle + (mode === direction ? direction * PHYSICS.wobbleAngle : 0),
+            angularVelocity: lander.angularVelocity + direction * PHYSICS.thrustAngular,
+            vx: lander.vx + direction * PHYSICS.thrustVelocity
+        };
+        const cooldown = PHYSICS.thrustCooldownTicks;
+        const value = (k <= cooldown
+            ? terminalValue(freeFlight(state, k))
+            : tableValue(table, k - cooldown, direction, freeFlight(state, cooldown))) - table.header.thrust_cost;
+        if (value > best) {
+            best = value;
+            action = candidate;
+        }
+    }
+    return action;
+}
+// --- autopilot:end ---
+
+// AI pilot: the trained policy when the server exports one, otherwise the
+// value table. P or the 🤖 key hands control over and back; ?autopilot
+// starts with the AI flying. Local game only: live episodes are flown
+// server-side.
+async function loadAiPilot() {
+    let response = await fetch('/policy-weights');
+    if (response.ok) {
+        const policy = parsePolicyWeights(await response.arrayBuffer());
+        return { name: 'policy', act: (pilotLander) => policyAction(policy, pilotLander) };
+    }
+    response = await fetch('/value-table');
+    if (response.ok) {
+        const table = parseValueTable(await response.arrayBuffer());
+        return { name: 'value table', act: (pilotLander, pilotControls) => autopilotAction(table, pilotLander, pilotControls) };
+    }
+    return null;
+}
+
+async function setAiPilot(enabled) {
+    if (enabled && aiPilot === null) {
+        aiPilot = await loadAiPilot();
+        if (aiPilot === null) {
+            status.textContent = hudText = 'No AI pilot available on this server';
+            return;
+        }
+    }
+    aiFlying = enabled;
+    pilotToggle.classList.toggle('active', enabled);
+    if (!enabled) {
+        // Back to whatever the human is holding
+        leftEngineOn = leftKey.classList.contains('active');
+        rightEngineOn = rightKey.classList.contains('active');
+        heldAction = leftEngineOn ? 1 : rightEngineOn ? 2 : 0;
+    }
+    updateStatus(true);
+}
+
+pilotToggle.addEventListener('click', () => {
+    if (!liveEpisode && !swarmMode) setAiPilot(!aiFlying);
+});
+
+// Demonstration capture: every human-flown tick (tick, the state before
+// the action, the held engine) goes into one preallocated Float32Array,
+// POSTed to /demos as a binary chunk every few seconds, when the buffer
+// fills and when the episode ends. An episode the AI pilot flew any part
+// of keeps a null outcome, so its human ticks never count as a landing.
+// Stops for good if the server does not collect demos.
+const DEMO_MAGIC = [0x4c, 0x44, 0x4d, 0x31]; // 'LDM1'
+const DEMO_ROW_FIELDS = 8;                    // tick, x, y, angle, vx, vy, angularVelocity, action
+const DEMO_CAPACITY = 1024;                   // rows per chunk; 32 KiB fits a keepalive request
+const DEMO_FLUSH_MS = 3000;
+const demoSession = Array.from(crypto.getRandomValues(new Uint32Array(2)),
+    (word) => word.toString(16).padStart(8, '0')).join('');
+const demoRows = new Float32Array(DEMO_CAPACITY * DEMO_ROW_FIELDS);
+let demoCount = 0;
+let demoEpisode = 0;
+let demoEpisodeRows = 0;
+let demoAssisted = false;
+let demoEnabled = true;
+
+function recordDemoTick(demoTick, state, action) {
+    if (!demoEnabled) return;
+    const row = demoCount * DEMO_ROW_FIELDS;
+    demoRows[row] = demoTick;
+    demoRows[row + 1] = state.x;
+    demoRows[row + 2] = state.y;
+    demoRows[row + 3] = state.angle;
+    demoRows[row + 4] = state.vx;
+    demoRows[row + 5] = state.vy;
+    demoRows[row + 6] = state.angularVelocity;
+    demoRows[row + 7] = action;
+    demoCount += 1;
+    demoEpisodeRows += 1;
+    if (demoCount === DEMO_CAPACITY) flushDemos(null);
+}
+
+// The episode ended: send its outcome unless the human flew no tick or had help
+function endDemoEpisode(outcome) {
+    if (demoEpisodeRows > 0) flushDemos(demoAssisted ? null : outcome);
+    demoEpisode += 1;
+    demoEpisodeRows = 0;
+    demoAssisted = false;
+}
+
+// outcome: null while the episode is still running, else 'landed' or 'crashed'
+function flushDemos(outcome) {
+    if (!demoEnabled || (demoCount === 0 && outcome === null)) return;
+    const encoded = new TextEncoder().encode(JSON.stringify({ session: demoSession, episode: demoEpisode, outcome }));
+    const headerLength = Math.ceil(encoded.length / 4) * 4;
+    const body = new Uint8Array(8 + headerLength + demoCount * DEMO_ROW_FIELDS * 4);
+    body.set(DEMO_MAGIC, 0);
+    new DataView(body.buffer).setUint32(4, headerLength, true);
+    body.fill(0x20, 8, 8 + headerLength);
+    body.set(encoded, 8);
+    body.set(new Uint8Array(demoRows.buffer, 0, demoCount * DEMO_ROW_FIELDS * 4), 8 + headerLength);
+    demoCount = 0;
+    fetch('/demos', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/octet-stream' },
+        body,
+        keepalive: true
+    }).then((response) => {
+        if (response.status === 404) demoEnabled = false;
+    }).catch(() => {});
+}
+
+setInterval(() => flushDemos(null), DEMO_FLUSH_MS);
+window.addEventListener('pagehide', () => flushDemos(null));
+
+// Live mode: ?watch=<episode> spectates and ?pilot=<episode> flies a
+// server-side episode streamed over /ws/episode as float32 frames
+const FRAME_FIELDS = ['tick', 'x', 'y', 'angle', 'vx', 'vy', 'angularVelocity', 'action', 'outcome'];
+const RESET_COMMAND = 255;
+const liveParams = new URLSearchParams(window.location.search);
+const liveEpisode = liveParams.get('pilot') || liveParams.get('watch');
+const swarmMode = liveParams.has('swarm');
+let liveSocket = null;
+
+function sendLiveAction(action) {
+    if (liveSocket.readyState === WebSocket.OPEN) {
+        liveSocket.send(new Uint8Array([action]));
+    }
+}
+
+function renderFrame(view, offset) {
+    const frame = {};
+    for (let i = 0; i < FRAME_FIELDS.length; i++) {
+        frame[FRAME_FIELDS[i]] = view.getFloat32(offset + i * 4, true);
+    }
+    Object.assign(lander, {
+        x: frame.x, y: frame.y, angle: frame.angle,
+        vx: frame.vx, vy: frame.vy, angularVelocity: frame.angularVelocity
+    });
+    altitude = 300 - lander.y;
+    speed = Math.sqrt(lander.vx * lander.vx + lander.vy * lander.vy) * 12;
+    leftEngineOn = frame.action === 1;
+    rightEngineOn = frame.action === 2;
+    updateRocketPosition(lander);
+    updateStatus(frame.outcome !== 0);
+    successAnimation.style.display = frame.outcome === 1 ? 'flex' : 'none';
+    crashAnimation.style.display = frame.outcome === 2 ? 'flex' : 'none';
+}
+
+function startLive(episode, role) {
+    const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+    const query = `episode=${encodeURIComponent(episode)}&role=${role}`;
+    liveSocket = new WebSocket(`${protocol}//${window.location.host}/ws/episode?${query}`);
+    liveSocket.binaryType = 'arraybuffer';
+    liveSocket.onmessage = (event) => renderFrame(new DataView(event.data), 0);
+    if (role === 'pilot') {
+        document.addEventListener('keydown', (event) => {
+            if (event.key === 'r') sendLiveAction(RESET_COMMAND);
+        });
+    }
+}
+
+// Replay mode: ?replay=<n> plays episode n of the server's recording
+async function startReplay(index) {
+    const response = await fetch(`/replay/${encodeURIComponent(index)}`);
+    if (!response.ok) {
+        status.textContent = `Replay ${index} unavailable`;
+        return;
+    }
+    const view = new DataView(await response.arrayBuffer());
+    const frameBytes = FRAME_FIELDS.length * 4;
+    const frameCount = view.byteLength / frameBytes;
+    let startTime = null;
+
+    function playFrame(now) {
+        if (startTime === null) startTime = now;
+        const frameIndex = Math.min(Math.floor((now - startTime) / TICK_MS), frameCount - 1);
+        renderFrame(view, frameIndex * frameBytes);
+        if (frameIndex < frameCount - 1) requestAnimationFrame(playFrame);
+    }
+    requestAnimationFrame(playFrame);
+}
+
+// Swarm mode: ?swarm draws the server's whole population of policy-flown
+// landers, streamed over /ws/swarm as one message per tick: uint32 tick,
+// count, landed and crashed totals, int16 (x, y, angle) per lander, then
+// one outcome byte per lander. The newest message is drawn once per frame.
+const SWARM_HEADER_BYTES = 16;
+const SWARM_SCALE = [8, 8, 100];
+
+function startSwarm() {
+    const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+    const socket = new WebSocket(`${protocol}//${window.location.host}/ws/swarm`);
+    socket.binaryType = 'arraybuffer';
+    let latest = null;
+    let drawn = null;
+    socket.onmessage = (event) => { latest = event.data; };
+    socket.onclose = () => { status.textContent = 'Swarm stream closed'; };
+
+    function drawLatest(now) {
+        if (latest !== drawn) {
+            drawn = latest;
+            const header = new Uint32Array(drawn, 0, 4);
+            const count = header[1];
+            const poses = new Int16Array(drawn, SWARM_HEADER_BYTES, 3 * count);
+            const outcomes = new Uint8Array(drawn, SWARM_HEADER_BYTES + 6 * count, count);
+            sceneRenderer.drawSwarm(poses, outcomes, count, SWARM_SCALE);
+            if (now - lastHudTime >= HUD_INTERVAL_MS) {
+                lastHudTime = now;
+                let flying = 0;
+                for (let i = 0; i < count; i++) flying += outcomes[i] === 0;
+                const finished = header[2] + header[3];
+                const rate = finished ? `${(100 * header[2] / finished).toFixed(1)}%` : '–';
+                status.textContent = `Swarm: ${count} landers | Flying: ${flying} | ` +
+                    `Landed: ${header[2]} | Crashed: ${header[3]} | Success: ${rate}`;
+            }
+        }
+        requestAnimationFrame(drawLatest);
+    }
+    requestAnimationFrame(drawLatest);
+}
+
+// Start the game
+if (swarmMode) {
+    startSwarm();
+} else if (liveParams.has('replay')) {
+    startReplay(liveParams.get('replay'));
+} else if (liveParams.has('autopilot')) {
+    setAiPilot(true).then(() => requestAnimationFrame(gameLoop));
+} else if (liveEpisode) {
+    startLive(liveEpisode, liveParams.has('pilot') ? 'pilot' : 'spectator');
+} else {
+    requestAnimationFrame(gameLoop);
+}
@@ -0,0 +1,58 @@
+import struct
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import airplane_lander
+from airplane_landing_simulator import CRASHED, LANDED
+from lander_demos import DEMO_MAGIC, DEMO_ROW_FIELDS, DemoWriter, load_demonstrations, parse_demo_chunk
+
+BAD_HEADERS = {
+    "list outcome": b'{"session": "00000000000000ab", "episode": 0, "outcome": ["landed"]}',
+    "dict outcome": b'{"session": "00000000000000ab", "episode": 0, "outcome": {"landed": 1}}',
+    "infinite episode": b'{"session": "00000000000000ab", "episode": Infinity, "outcome": null}',
+}
+
+
+def _chunk(header, rows=3):
+    header += b" " * (-len(header) % 4)
+    data = np.zeros((rows, len(DEMO_ROW_FIELDS)), dtype="<f4")
+    data[:, 0] = np.arange(rows)
+    return DEMO_MAGIC + struct.pack("<I", len(header)) + header + data.tobytes()
+
+
+def _episode_chunk(session, episode, rows, outcome):
+    return _chunk(f'{{"session": "{session:016x}", "episode": {episode}, "outcome": {outcome}}}'.encode(), rows)
+
+
+@pytest.mark.parametrize("header", BAD_HEADERS.values(), ids=BAD_HEADERS.keys())
+def test_malformed_headers_are_rejected(header):
+    with pytest.raises(ValueError):
+        parse_demo_chunk(_chunk(header))
+
+
+@pytest.mark.parametrize("header", BAD_HEADERS.values(), ids=BAD_HEADERS.keys())
+def test_malformed_headers_get_400(header, tmp_path, monkeypatch):
+    writer = DemoWriter(str(tmp_path))
+    monkeypatch.setattr(airplane_lander, "demo_writer", writer)
+    try:
+        response = TestClient(airplane_lander.app).post("/demos", content=_chunk(header))
+    finally:
+        writer.close()
+    assert response.status_code == 400
+
+
+def test_load_demonstrations_keeps_landed_episodes(tmp_path):
+    writer = DemoWriter(str(tmp_path))
+    # Two sessions sharing their low 32 bits must not be confused
+    for session, episode, rows, outcome in ((0x100000005, 1, 10, '"landed"'), (0x200000005, 1, 7, '"crashed"'),
+                                            (0x200000005, 2, 5, "null")):
+        writer.submit(parse_demo_chunk(_episode_chunk(session, episode, rows, outcome)))
+    writer.close()
+
+    landed = load_demonstrations(str(tmp_path))
+    assert len(landed["actions"]) == 10 and set(landed["session"]) == {0x100000005}
+    assert len(load_demonstrations(str(tmp_path), (CRASHED,))["actions"]) == 7
+    assert len(load_demonstrations(str(tmp_path), (LANDED, CRASHED))["actions"]) == 17
+    assert len(load_demonstrations(str(tmp_path), None)["actions"]) == 22
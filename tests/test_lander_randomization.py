@@ -0,0 +1,55 @@
+import numpy as np
+
+from lander_randomization import FIELDS, LanderRandomizer, env_seeds, uniform
+
+NUM_ENVS = 2000
+NUM_EPISODES = 100
+BINS = 100
+
+
+def _draws(field, seed=0):
+    """Uniform draws of one field for every (environment, episode) pair, shape (envs, episodes)"""
+    seeds = env_seeds(seed, np.arange(NUM_ENVS, dtype=np.uint64))
+    episodes = np.arange(NUM_EPISODES, dtype=np.uint64)
+    return uniform(seeds[:, None], episodes[None, :], field)
+
+
+def _chi_square(values):
+    counts = np.bincount((values * BINS).astype(np.int64), minlength=BINS)
+    expected = len(values) / BINS
+    return float(((counts - expected) ** 2 / expected).sum())
+
+
+def test_draws_are_uniform_per_field():
+    # 99 degrees of freedom: mean 99, standard deviation 14; allow six of them
+    for field in FIELDS:
+        values = _draws(field).ravel()
+        assert values.min() >= 0.0 and values.max() < 1.0
+        assert _chi_square(values) < 99 + 6 * 14, field
+
+
+def test_fields_episodes_and_environments_are_uncorrelated():
+    draws = {field: _draws(field) for field in FIELDS}
+    limit = 5 / np.sqrt(NUM_ENVS * NUM_EPISODES)
+    for i, a in enumerate(FIELDS):
+        for b in FIELDS[i + 1:]:
+            assert abs(np.corrcoef(draws[a].ravel(), draws[b].ravel())[0, 1]) < limit, (a, b)
+    x = draws["x"]
+    limit = 5 / np.sqrt(x[:, 1:].size)
+    assert abs(np.corrcoef(x[:, :-1].ravel(), x[:, 1:].ravel())[0, 1]) < limit  # consecutive episodes
+    assert abs(np.corrcoef(x[:-1].ravel(), x[1:].ravel())[0, 1]) < limit        # neighbouring environments
+
+
+def test_pairs_of_fields_fill_the_unit_square():
+    # Joint uniformity on a 10x10 grid catches dependence that correlation misses
+    a, b = _draws("x").ravel(), _draws("y").ravel()
+    cells = (a * 10).astype(np.int64) * 10 + (b * 10).astype(np.int64)
+    counts = np.bincount(cells, minlength=100)
+    expected = len(a) / 100
+    assert (((counts - expected) ** 2 / expected).sum()) < 99 + 6 * 14
+
+
+def test_episode_regenerates_without_replaying():
+    randomizer = LanderRandomizer(8, {"x": (200.0, 400.0), "gravity": (0.025, 0.035)}, seed=3)
+    drawn = [randomizer.sample(randomizer.seeds, np.full(8, episode, dtype=np.uint64)) for episode in range(5)]
+    assert randomizer.episode(5, 4) == {name: float(values[5]) for name, values in drawn[4].items()}
@@ -0,0 +1,21 @@
+import numpy as np
+
+from airplane_landing_simulator import CRASHED, GROUND_Y
+from env.mountain_car_plane_env import MountainCarPlaneVectorEnv
+
+
+def test_boundary_crash_below_ground_stays_in_observation_space():
+    env = MountainCarPlaneVectorEnv(num_envs=2)
+    env.reset(seed=0)
+    lander = env.lander
+    # Environment 0 leaves through the right boundary on the tick it sinks below the ground
+    lander.x[0] = lander.boundary_right[0] - 0.1
+    lander.vx[0] = 5.0
+    lander.y[0] = GROUND_Y - 0.1
+    lander.vy[0] = 5.0
+
+    _, _, terminated, _, info = env.step(np.zeros(2, dtype=np.int64))
+
+    assert terminated[0] and info["_final_obs"][0]
+    assert info["outcome"][0] == CRASHED
+    assert env.single_observation_space.contains(info["final_obs"][0])
@@ -0,0 +1,220 @@
+"""
+Asynchronous training checkpoints.
+
+A checkpoint holds a tree of training state: nested dicts, lists and tuples
+whose leaves are arrays (anything NumPy can view, including CPU torch
+tensors) or small JSON values. Checkpointer.snapshot() copies every array
+into one of two preallocated snapshot buffers on the calling thread, a plain
+memory copy, and hands the buffer to a background writer thread. The writer
+flushes one buffer while the next snapshot fills the other; if both are
+still taken, the snapshot is skipped instead of waiting, so the training
+loop never blocks on disk.
+
+On disk a checkpoint is a directory, checkpoint-<step>/, with one .npy file
+per array and meta.json (tree skeleton plus caller metadata). It is written
+under a temporary name and renamed into place, so a run killed mid-write
+leaves the previous checkpoint intact. load_checkpoint() memory-maps the
+arrays copy-on-write: large buffers are paged in as they are touched, and
+writing to them never modifies the checkpoint.
+"""
+
+import json
+import os
+import shutil
+import threading
+
+import numpy as np
+
+CHECKPOINT_PREFIX = "checkpoint-"
+TEMP_SUFFIX = ".tmp"
+META_FILE = "meta.json"
+
+
+def flatten(tree):
+    """Split a state tree into ({name: array}, JSON skeleton referencing the arrays by name)"""
+    arrays = {}
+
+    def visit(node, path):
+        if isinstance(node, dict):
+            return {"dict": [[key, visit(value, f"{path}.{key}")] for key, value in node.items()]}
+        if isinstance(node, (list, tuple)):
+            kind = "list" if isinstance(node, list) else "tuple"
+            return {kind: [visit(value, f"{path}.{i}") for i, value in enumerate(node)]}
+        if isinstance(node, np.ndarray) or hasattr(node, "__array__"):
+            name = f"{len(arrays):04d}"  # the skeleton holds the path; keys may contain any character
+            arrays[name] = np.asarray(node)
+            return {"array": name}
+        return {"value": node}
+
+    return arrays, visit(tree, "")
+
+
+def unflatten(skeleton, arrays, leaf=None):
+    """Rebuild a state tree; leaf converts each array (e.g. to a torch tensor)"""
+    kind, content = next(iter(skeleton.items()))
+    if kind == "dict":
+        return {key: unflatten(value, arrays, leaf) for key, value in content}
+    if kind in ("list", "tuple"):
+        items = [unflatten(value, arrays, leaf) for value in content]
+        return items if kind == "list" else tuple(items)
+    if kind == "array":
+        return arrays[content] if leaf is None else leaf(arrays[content])
+    return content
+
+
+def map_arrays(tree, function):
+    """Apply function to every array leaf of a state tree"""
+    arrays, skeleton = flatten(tree)
+    return unflatten(skeleton, {name: function(array) for name, array in arrays.items()})
+
+
+def checkpoint_name(step):
+    return f"{CHECKPOINT_PREFIX}{int(step):012d}"
+
+
+def list_checkpoints(directory):
+    """Completed checkpoint paths in directory, oldest first"""
+    if not os.path.isdir(directory):
+        return []
+    names = sorted(name for name in os.listdir(directory)
+                   if name.startswith(CHECKPOINT_PREFIX) and not name.endswith(TEMP_SUFFIX))
+    return [os.path.join(directory, name) for name in names]
+
+
+def latest_checkpoint(directory):
+    """Path of the newest completed checkpoint, or None"""
+    checkpoints = list_checkpoints(directory)
+    return checkpoints[-1] if checkpoints else None
+
+
+def load_checkpoint(path, mmap_mode="c"):
+    """
+    Read a checkpoint directory (or the latest one under a run directory).
+
+    Returns (state, meta). Arrays are memory-mapped with mmap_mode; the
+    default copy-on-write mode lets callers use them as live, writable
+    buffers without touching the files.
+    """
+    if not os.path.exists(os.path.join(path, META_FILE)):
+        latest = latest_checkpoint(path)
+        if latest is None:
+            raise FileNotFoundError(f"no checkpoint in {path}")
+        path = latest
+    with open(os.path.join(path, META_FILE)) as f:
+        meta = json.load(f)
+    arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode) for name in meta["arrays"]}
+    return unflatten(meta["skeleton"], arrays), meta["meta"]
+
+
+class Checkpointer:
+    """
+    Periodic, double-buffered checkpoints written by a background thread.
+
+    snapshot(step, state, meta) returns False when it had to skip because
+    the writer is still behind by a full snapshot. The newest `keep`
+    checkpoints are kept; older ones are deleted once a newer one is
+    complete. on_write(path, step, state, meta), if given, runs on the
+    writer thread after each checkpoint is in place and before older ones
+    are pruned (e.g. to fold an incremental checkpoint into its base).
+    close() waits for pending writes.
+    """
+
+    def __init__(self, directory, keep=2, on_write=None):
+        self.directory = directory
+        self.keep = int(keep)
+        self.on_write = on_write
+        self.written = 0
+        self.skipped = 0
+        self.error = None
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):  # leftovers of a run killed mid-write
+            if name.startswith(CHECKPOINT_PREFIX) and name.endswith(TEMP_SUFFIX):
+                shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+        self._buffers = [{}, {}]
+        self._free = [0, 1]
+        self._pending = []  # (buffer index, step, skeleton, meta), oldest first
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._write_loop, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    def snapshot(self, step, state, meta=None):
+        """Copy state into a free snapshot buffer and queue it for writing; never waits for disk"""
+        if self.error is not None:
+            raise RuntimeError("checkpoint writer failed") from self.error
+        with self._condition:
+            if not self._free:
+                self.skipped += 1
+                return False
+            index = self._free.pop()
+
+        arrays, skeleton = flatten(state)
+        buffer = self._buffers[index]
+        for name in list(buffer):
+            if name not in arrays:
+                del buffer[name]
+        for name, array in arrays.items():
+            target = buffer.get(name)
+            if target is None or target.shape != array.shape or target.dtype != array.dtype:
+                buffer[name] = np.array(array)
+            else:
+                np.copyto(target, array)
+        meta = json.loads(json.dumps(meta or {}))  # detach from the caller's objects
+
+        with self._condition:
+            self._pending.append((index, int(step), skeleton, meta))
+            self._condition.notify()
+        return True
+
+    def _write_loop(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                index, step, skeleton, meta = self._pending[0]
+            try:
+                self._write(self._buffers[index], step, skeleton, meta)
+                self.written += 1
+            except Exception as error:  # surfaced to the training thread by the next snapshot()
+                self.error = error
+            with self._condition:
+                self._pending.pop(0)
+                self._free.append(index)
+                self._condition.notify_all()
+
+    def _write(self, arrays, step, skeleton, meta):
+        final = os.path.join(self.directory, checkpoint_name(step))
+        temporary = final + TEMP_SUFFIX
+        shutil.rmtree(temporary, ignore_errors=True)
+        os.makedirs(temporary)
+        for name, array in arrays.items():
+            np.save(os.path.join(temporary, f"{name}.npy"), array)
+        with open(os.path.join(temporary, META_FILE), "w") as f:
+            json.dump({"step": step, "arrays": sorted(arrays), "skeleton": skeleton, "meta": meta}, f)
+        if os.path.exists(final):
+            shutil.rmtree(final)
+        os.replace(temporary, final)
+        if self.on_write is not None:
+            self.on_write(final, step, unflatten(skeleton, arrays), meta)
+        for old in list_checkpoints(self.directory)[:-self.keep]:
+            shutil.rmtree(old, ignore_errors=True)
+
+    def wait(self):
+        """Block until every queued snapshot is on disk"""
+        with self._condition:
+            while self._pending:
+                self._condition.wait()
+        if self.error is not None:
+            raise RuntimeError("checkpoint writer failed") from self.error
+
+    def close(self):
+        """Finish pending writes and stop the writer thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        if self.error is not None:
+            raise RuntimeError("checkpoint writer failed") from self.error
@@ -0,0 +1,106 @@
+"""
+Difficulty curriculum for lander training.
+
+A level is a set of task parameters (airplane_landing_simulator.TASK_DEFAULTS:
+crash boundaries and landing thresholds), easiest first; the last default
+level is the browser game itself. A Curriculum writes the per-environment
+task arrays of a collector (shared memory for SharedMemoryCollector, so the
+workers see new values on their next step without any extra message) and
+is fed the done and outcome arrays the parent already holds after every
+step, so the statistics cost a few masked counts over the batch and no
+synchronization.
+
+Every episode is played and scored at the level that was current when it
+began. Once `window` episodes have finished at the current level, their
+success rate decides: at or above promote_at moves one level harder, below
+demote_at (when set) one level easier, and counting starts over.
+"""
+
+import numpy as np
+
+from airplane_landing_simulator import LANDED, TASK_DEFAULTS
+
+# Easiest first; missing parameters take TASK_DEFAULTS
+DEFAULT_LEVELS = (
+    {"boundary_left": -400.0, "boundary_right": 1000.0, "landing_max_angle": 20.0, "landing_max_velocity_x": 3.0},
+    {"boundary_left": -300.0, "boundary_right": 900.0, "landing_max_angle": 14.0, "landing_max_velocity_x": 2.2},
+    {"boundary_left": -200.0, "boundary_right": 800.0, "landing_max_angle": 10.0, "landing_max_velocity_x": 1.6},
+    {"boundary_left": -150.0, "boundary_right": 750.0, "landing_max_angle": 7.0, "landing_max_velocity_x": 1.25},
+    TASK_DEFAULTS,
+)
+
+
+class Curriculum:
+    """
+    Promote (or demote) every environment's task together, by the success
+    rate over windows of episodes finished at the current level.
+
+    task maps TASK_DEFAULTS names to the (num_envs,) arrays the engine reads.
+    """
+
+    def __init__(self, task, levels=DEFAULT_LEVELS, promote_at=0.8, demote_at=None, window=2000, level=0):
+        unknown = {name for level_params in levels for name in level_params} - set(TASK_DEFAULTS)
+        if unknown:
+            raise ValueError(f"unknown task parameters {sorted(unknown)}; expected some of {tuple(TASK_DEFAULTS)}")
+        self.task = task
+        self.levels = [dict(TASK_DEFAULTS, **level_params) for level_params in levels]
+        self.promote_at = float(promote_at)
+        self.demote_at = None if demote_at is None else float(demote_at)
+        self.window = int(window)
+        self.level = int(level)
+        self.episodes = 0
+        self.landed = 0
+        self.history = []  # (level, success rate) of every finished window
+
+        num_envs = len(task[next(iter(TASK_DEFAULTS))])
+        self.episode_level = np.empty(num_envs, dtype=np.int16)
+        self._scored = np.empty(num_envs, dtype=bool)
+        self._landed = np.empty(num_envs, dtype=bool)
+        self._apply(slice(None))
+
+    @property
+    def success_rate(self):
+        """Success rate of the episodes counted so far in the current window (None before the first)"""
+        return self.landed / self.episodes if self.episodes else None
+
+    def _apply(self, mask):
+        """Start the next episodes of the masked environments at the current level"""
+        for name, value in self.levels[self.level].items():
+            self.task[name][mask] = value
+        self.episode_level[mask] = self.level
+
+    def update(self, done, outcome):
+        """Score the episodes that just ended (outcome is read where done); returns True if the level changed"""
+        if not done.any():
+            return False
+        scored = np.equal(self.episode_level, self.level, out=self._scored)
+        np.logical_and(scored, done, out=scored)
+        landed = np.equal(outcome, LANDED, out=self._landed)
+        np.logical_and(landed, scored, out=landed)
+        self.episodes += int(np.count_nonzero(scored))
+        self.landed += int(np.count_nonzero(landed))
+
+        previous = self.level
+        if self.episodes >= self.window:
+            rate = self.landed / self.episodes
+            self.history.append((self.level, rate))
+            if rate >= self.promote_at and self.level < len(self.levels) - 1:
+                self.level += 1
+            elif self.demote_at is not None and rate < self.demote_at and self.level > 0:
+                self.level -= 1
+            self.episodes = 0
+            self.landed = 0
+        self._apply(done)
+        return self.level != previous
+
+    def state(self):
+        """Level and window counts, JSON-serializable (for training checkpoints)"""
+        return {"level": self.level, "episodes": self.episodes, "landed": self.landed, "history": self.history}
+
+    def load_state(self, state):
+        """Continue from state(); every environment is moved to the restored level at once"""
+        self.level = int(state["level"])
+        self.episodes = int(state["episodes"])
+        self.landed = int(state["landed"])
+        self.history = [tuple(entry) for entry in state["history"]]
+        self._apply(slice(None))
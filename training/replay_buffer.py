@@ -0,0 +1,385 @@
+"""
+Compact replay buffer for lander transitions.
+
+Transitions from a vector of num_envs environments are stored in one
+preallocated ring, one row per environment per step, column by column:
+
+    observations  (capacity, 6)  float32 or float16
+    actions       (capacity,)    uint8
+    rewards       (capacity,)    float32
+    dones         (capacity,)    uint8   NOT_DONE / TERMINATED / TRUNCATED
+
+There is no next-observation column: the next observation of row i is the
+observation stored num_envs rows later. Only when an episode ends does the
+next observation differ (same-step autoreset puts the reset state there);
+the terminal observation is then kept in a small side table. The newest
+num_envs rows have no successor yet and are never sampled.
+
+Sampling is vectorized, either uniform or proportional to priority through
+an array-backed sum-tree. save() writes every column to a .npy file;
+load() maps them back without reading the whole buffer. state() and
+from_state() expose the same arrays for training checkpoints;
+delta_state() cuts them to the rows added since the previous checkpoint,
+and update_base() folds such a delta into a copy of the columns on disk.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from airplane_landing_simulator import STATE_FIELDS
+from lander_recording import NOT_DONE, TERMINATED, TRUNCATED
+
+OBS_DIM = len(STATE_FIELDS)
+COLUMNS = ("observations", "actions", "rewards", "dones")
+
+
+class SumTree:
+    """
+    Binary sum-tree over `capacity` leaf priorities in one flat array.
+
+    Node k has children 2k and 2k+1, leaves start at `size`. update() and
+    find() process a whole batch of indices level by level, so their cost is
+    O(log capacity) NumPy operations per batch.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = int(capacity)
+        self.size = 1 << max(0, (self.capacity - 1).bit_length())
+        self.depth = self.size.bit_length() - 1
+        self.nodes = np.zeros(2 * self.size, dtype=np.float64)
+
+    @property
+    def total(self):
+        return self.nodes[1]
+
+    def update(self, indices, priorities):
+        """Set leaf priorities and refresh their ancestors"""
+        nodes = self.nodes
+        position = np.asarray(indices, dtype=np.int64) + self.size
+        nodes[position] = priorities
+        for _ in range(self.depth):
+            position = np.unique(position >> 1)
+            nodes[position] = nodes[2 * position] + nodes[2 * position + 1]
+
+    def find(self, prefix_sums):
+        """Leaf index whose cumulative priority range contains each prefix sum"""
+        nodes = self.nodes
+        value = np.array(prefix_sums, dtype=np.float64)
+        position = np.ones(len(value), dtype=np.int64)
+        for _ in range(self.depth):
+            left = nodes[2 * position]
+            # Rounding in the running sums can point past a subtree's total; never
+            # descend into an empty subtree, so a zero-priority leaf is never found
+            right = ((value > left) | (left <= 0.0)) & (nodes[2 * position + 1] > 0.0)
+            value -= np.where(right, left, 0.0)
+            position = 2 * position + right
+        return np.minimum(position - self.size, self.capacity - 1)
+
+    def leaves(self, indices):
+        return self.nodes[np.asarray(indices, dtype=np.int64) + self.size]
+
+
+class ReplayBuffer:
+    """
+    Ring buffer of lander transitions from num_envs lockstep environments.
+
+    prioritized=True samples proportionally to priority ** alpha (new
+    transitions get the current maximum) and returns importance weights;
+    update_priorities() feeds back the new TD errors.
+    """
+
+    def __init__(self, capacity, num_envs, obs_dtype=np.float32, prioritized=False, alpha=0.6, _columns=None):
+        self.num_envs = int(num_envs)
+        self.capacity = int(capacity) // self.num_envs * self.num_envs  # whole steps only
+        if self.capacity < 2 * self.num_envs:
+            raise ValueError("capacity must hold at least two steps of num_envs transitions")
+        self.obs_dtype = np.dtype(obs_dtype)
+        self.prioritized = bool(prioritized)
+        self.alpha = float(alpha)
+
+        if _columns is None:
+            _columns = {
+                "observations": np.zeros((self.capacity, OBS_DIM), dtype=self.obs_dtype),
+                "actions": np.zeros(self.capacity, dtype=np.uint8),
+                "rewards": np.zeros(self.capacity, dtype=np.float32),
+                "dones": np.zeros(self.capacity, dtype=np.uint8),
+            }
+        self.observations = _columns["observations"]
+        self.actions = _columns["actions"]
+        self.rewards = _columns["rewards"]
+        self.dones = _columns["dones"]
+        self.final_observations = {}  # row -> terminal observation (float32) of a finished episode
+
+        self.position = 0  # next row to write
+        self.size = 0      # rows written, up to capacity
+        self.max_priority = 1.0
+        self.tree = SumTree(self.capacity) if self.prioritized else None
+        self._dirty = np.zeros(self.capacity, dtype=bool) if self.prioritized else None  # since mark_checkpointed()
+        self._rows = np.arange(self.num_envs)
+
+    def __len__(self):
+        """Number of sampleable transitions (rows whose next observation is known)"""
+        return max(0, self.size - self.num_envs)
+
+    def add(self, observations, actions, rewards, terminated, truncated, final_observations=None):
+        """
+        Append one vector step: the observations the actions were taken in,
+        the actions, rewards and termination flags; final_observations holds
+        the terminal observation of environments whose episode just ended.
+        """
+        rows = self._rows + self.position
+        for row in rows[self.dones[rows] != NOT_DONE]:  # episode ends about to be overwritten
+            self.final_observations.pop(int(row), None)
+
+        self.observations[rows] = observations
+        self.actions[rows] = actions
+        self.rewards[rows] = rewards
+        done_codes = np.where(terminated, TERMINATED, NOT_DONE).astype(np.uint8)
+        done_codes[np.asarray(truncated, dtype=bool)] = TRUNCATED
+        self.dones[rows] = done_codes
+        if final_observations is not None:
+            for i in np.flatnonzero(done_codes):
+                self.final_observations[int(rows[i])] = np.array(final_observations[i], dtype=np.float32)
+
+        if self.tree is not None:
+            # The new rows have no successor yet; the previous step's rows just got one
+            self.tree.update(rows, 0.0)
+            self._dirty[rows] = True
+            if self.size >= self.num_envs:
+                previous = (rows - self.num_envs) % self.capacity
+                self.tree.update(previous, self.max_priority ** self.alpha)
+                self._dirty[previous] = True
+
+        self.position = (self.position + self.num_envs) % self.capacity
+        self.size = min(self.size + self.num_envs, self.capacity)
+
+    @property
+    def _oldest(self):
+        return self.position if self.size == self.capacity else 0
+
+    def _valid_rows(self, offsets):
+        """Map offsets in [0, len(self)) to rows, oldest first"""
+        return (self._oldest + offsets) % self.capacity
+
+    def sample(self, batch_size, rng, beta=0.4):
+        """
+        Draw a batch as a dict of arrays: observations, actions, rewards,
+        next_observations, dones (terminated only; truncation bootstraps),
+        indices, and weights (importance weights; ones when uniform).
+        """
+        if len(self) == 0:
+            raise ValueError("replay buffer has no sampleable transitions yet")
+        if self.tree is None:
+            indices = self._valid_rows(rng.integers(0, len(self), size=batch_size))
+            weights = np.ones(batch_size, dtype=np.float32)
+        else:
+            # Stratified: one draw from each of batch_size equal slices of the total priority
+            total = self.tree.total
+            prefix = (np.arange(batch_size) + rng.random(batch_size)) * (total / batch_size)
+            indices = self.tree.find(np.minimum(prefix, np.nextafter(total, 0.0)))
+            probabilities = self.tree.leaves(indices) / total
+            weights = (len(self) * probabilities) ** -beta
+            weights = (weights / weights.max()).astype(np.float32)
+
+        dones = self.dones[indices]
+        next_observations = self.observations[(indices + self.num_envs) % self.capacity].astype(np.float32)
+        for i in np.flatnonzero(dones):
+            final = self.final_observations.get(int(indices[i]))
+            if final is not None:
+                next_observations[i] = final
+        return {
+            "observations": self.observations[indices].astype(np.float32),
+            "actions": self.actions[indices],
+            "rewards": self.rewards[indices],
+            "next_observations": next_observations,
+            "dones": (dones == TERMINATED).astype(np.float32),
+            "indices": indices,
+            "weights": weights,
+        }
+
+    def update_priorities(self, indices, priorities, epsilon=1e-6):
+        """Set new priorities (e.g. |TD error|) for sampled rows"""
+        if self.tree is None:
+            return
+        indices = np.asarray(indices, dtype=np.int64)
+        priorities = np.abs(np.asarray(priorities, dtype=np.float64)) + epsilon
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        # Rows overwritten since they were sampled may now be among the newest, unsampleable ones
+        valid = (indices - self._oldest) % self.capacity < len(self)
+        self.tree.update(indices[valid], priorities[valid] ** self.alpha)
+        self._dirty[indices[valid]] = True
+
+    @property
+    def nbytes(self):
+        """Memory held by the transition columns"""
+        return sum(getattr(self, name).nbytes for name in COLUMNS)
+
+    def state(self):
+        """Columns, side tables and counters as ({name: array}, meta), for save() and training checkpoints"""
+        arrays, meta = self._side_state()
+        arrays.update((name, getattr(self, name)) for name in COLUMNS)
+        if self.tree is not None:
+            arrays["priorities"] = self.tree.leaves(np.arange(self.capacity))
+        return arrays, meta
+
+    def _side_state(self):
+        """Terminal-observation side table and counters"""
+        finals = sorted(self.final_observations)
+        arrays = {
+            "final_rows": np.array(finals, dtype=np.int64),
+            "final_observations": np.array([self.final_observations[row] for row in finals],
+                                           dtype=np.float32).reshape(-1, OBS_DIM),
+        }
+        meta = {
+            "capacity": self.capacity,
+            "num_envs": self.num_envs,
+            "obs_dtype": self.obs_dtype.str,
+            "prioritized": self.prioritized,
+            "alpha": self.alpha,
+            "position": self.position,
+            "size": self.size,
+            "max_priority": self.max_priority,
+        }
+        return arrays, meta
+
+    @classmethod
+    def from_state(cls, arrays, meta):
+        """Rebuild a buffer around the arrays of state(); the columns are used as they are, not copied"""
+        buffer = cls(meta["capacity"], meta["num_envs"], meta["obs_dtype"], meta["prioritized"], meta["alpha"],
+                     _columns={name: arrays[name] for name in COLUMNS})
+        buffer.position = meta["position"]
+        buffer.size = meta["size"]
+        buffer.max_priority = meta["max_priority"]
+        buffer.final_observations = {int(row): np.array(obs) for row, obs in
+                                     zip(arrays["final_rows"], arrays["final_observations"])}
+        if buffer.tree is not None:
+            buffer.tree.update(np.arange(buffer.capacity), arrays["priorities"])
+        return buffer
+
+    def recent_rows(self, count):
+        """Rows of the newest count transitions (at most the whole ring), oldest first"""
+        count = min(int(count), self.size)
+        return (self.position - count + np.arange(count)) % self.capacity
+
+    def delta_state(self, count):
+        """
+        state() with the columns cut to the newest count rows, listed under
+        "rows", and the priorities to those changed since mark_checkpointed(),
+        under "priority_rows": an incremental checkpoint on top of
+        update_base(). The terminal-observation side table is small and
+        always complete.
+        """
+        rows = self.recent_rows(count)
+        arrays, meta = self._side_state()
+        arrays.update((name, getattr(self, name)[rows]) for name in COLUMNS)
+        arrays["rows"] = rows
+        if self.tree is not None:
+            arrays["priority_rows"] = np.flatnonzero(self._dirty)
+            arrays["priorities"] = self.tree.leaves(arrays["priority_rows"])
+        return arrays, meta
+
+    def mark_checkpointed(self):
+        """Call once the last delta_state() is safely queued: later deltas carry only newer priority changes"""
+        if self._dirty is not None:
+            self._dirty[:] = False
+
+    def end_episodes(self, final_observations):
+        """
+        Mark the newest step as truncated, with final_observations as its next
+        observations: for when the environments restart from fresh resets
+        instead of continuing (e.g. after resuming from a checkpoint).
+        """
+        if self.size == 0:
+            return
+        rows = self._rows + (self.position - self.num_envs) % self.capacity
+        for i in np.flatnonzero(self.dones[rows] == NOT_DONE):
+            self.dones[rows[i]] = TRUNCATED
+            self.final_observations[int(rows[i])] = np.array(final_observations[i], dtype=np.float32)
+
+    def save(self, directory):
+        """Write the buffer as .npy columns plus a small metadata file"""
+        os.makedirs(directory, exist_ok=True)
+        arrays, meta = self.state()
+        for name, array in arrays.items():
+            np.save(os.path.join(directory, f"{name}.npy"), array)
+        with open(os.path.join(directory, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=2)
+
+    @classmethod
+    def load(cls, directory, mmap_mode="c"):
+        """
+        Map a saved buffer back; columns stay on disk. The default copy-on-write
+        mode never modifies the saved files ("r+" writes new transitions
+        through to them, None reads the columns into memory).
+        """
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        arrays = {}
+        for name in (*COLUMNS, "final_rows", "final_observations", "priorities"):
+            path = os.path.join(directory, f"{name}.npy")
+            if name in COLUMNS or os.path.exists(path):
+                arrays[name] = np.load(path, mmap_mode=mmap_mode if name in COLUMNS else None)
+        return cls.from_state(arrays, meta)
+
+
+def update_base(directory, arrays, meta, step):
+    """
+    Write the rows (and changed priorities) of a delta_state() snapshot into
+    the memory-mapped base columns in directory (zero-filled on first use)
+    and record step in
+    base.json. Applying the same delta twice is harmless, so a crash
+    halfway is repaired by applying it again.
+    """
+    os.makedirs(directory, exist_ok=True)
+    rows = arrays["rows"]
+    for name in COLUMNS:
+        path = os.path.join(directory, f"{name}.npy")
+        if os.path.exists(path):
+            column = np.load(path, mmap_mode="r+")
+        else:
+            column = np.lib.format.open_memmap(path, mode="w+", dtype=arrays[name].dtype,
+                                               shape=(meta["capacity"], *arrays[name].shape[1:]))
+        column[rows] = arrays[name]
+        column.flush()
+        del column
+    if "priority_rows" in arrays:
+        path = os.path.join(directory, "priorities.npy")
+        if os.path.exists(path):
+            priorities = np.load(path, mmap_mode="r+")
+        else:
+            priorities = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(meta["capacity"],))
+        priorities[arrays["priority_rows"]] = arrays["priorities"]
+        priorities.flush()
+        del priorities
+    temporary = os.path.join(directory, "base.json.tmp")
+    with open(temporary, "w") as f:
+        json.dump({"step": int(step)}, f)
+    os.replace(temporary, os.path.join(directory, "base.json"))
+
+
+def load_base(directory, arrays, meta, mmap_mode="c"):
+    """
+    Rebuild a buffer from the base columns in directory plus a
+    delta_state() snapshot (as read back from a checkpoint). The delta is
+    applied to the mapped columns, copy-on-write by default.
+    """
+    columns = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode) for name in COLUMNS}
+    rows = np.asarray(arrays["rows"])
+    for name in COLUMNS:
+        columns[name][rows] = arrays[name]
+    if "priority_rows" in arrays:
+        priorities = np.load(os.path.join(directory, "priorities.npy"), mmap_mode=mmap_mode)
+        priorities[np.asarray(arrays["priority_rows"])] = arrays["priorities"]
+        columns["priorities"] = priorities
+    return ReplayBuffer.from_state(dict(arrays, **columns), meta)
+
+
+def base_step(directory):
+    """Step recorded by the last update_base() in directory, or None"""
+    path = os.path.join(directory, "base.json")
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)["step"]
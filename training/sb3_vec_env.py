@@ -0,0 +1,69 @@
+"""
+stable-baselines3 VecEnv adapter for SharedMemoryCollector.
+
+Replaces SubprocVecEnv: the workers write into shared memory, and only the
+per-env info dicts SB3 requires are built in the parent process.
+"""
+
+import numpy as np
+from stable_baselines3.common.vec_env import VecEnv
+
+from env.mountain_car_plane_env import MountainCarPlaneVectorEnv
+
+
+class SharedMemoryVecEnv(VecEnv):
+    """
+    Expose a SharedMemoryCollector through the SB3 VecEnv interface.
+
+    An optional training.curriculum.Curriculum on the collector's task arrays
+    is updated after every step from the done and outcome arrays.
+    """
+
+    def __init__(self, collector, curriculum=None):
+        self.collector = collector
+        self.curriculum = curriculum
+        spaces_env = MountainCarPlaneVectorEnv(1)
+        super().__init__(collector.num_envs, spaces_env.single_observation_space, spaces_env.single_action_space)
+        self._seed = None
+
+    def reset(self):
+        observations = self.collector.reset(seed=self._seed)
+        self._seed = None
+        self.reset_infos = [{} for _ in range(self.num_envs)]
+        return observations.copy()
+
+    def step_async(self, actions):
+        self.collector.step_async(actions)
+
+    def step_wait(self):
+        collector = self.collector
+        observations, rewards, terminated, truncated = collector.step_wait()
+        if self.curriculum is not None:
+            self.curriculum.update(collector.done, collector.outcome)
+        infos = [{} for _ in range(self.num_envs)]
+        for i in np.flatnonzero(collector.done):
+            infos[i]["terminal_observation"] = collector.final_observations[i].copy()
+            infos[i]["TimeLimit.truncated"] = bool(truncated[i])
+            infos[i]["outcome"] = int(collector.outcome[i])
+        return observations.copy(), rewards.copy(), collector.done.copy(), infos
+
+    def seed(self, seed=None):
+        self._seed = seed
+        return [None if seed is None else seed + i for i in range(self.num_envs)]
+
+    def close(self):
+        self.collector.close()
+
+    def get_attr(self, attr_name, indices=None):
+        if attr_name == "render_mode":
+            return [None] * len(self._get_indices(indices))
+        raise AttributeError(f"{attr_name} is not available from shared-memory workers")
+
+    def set_attr(self, attr_name, value, indices=None):
+        raise AttributeError(f"{attr_name} cannot be set on shared-memory workers")
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        raise AttributeError(f"{method_name} cannot be called on shared-memory workers")
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False] * len(self._get_indices(indices))
@@ -0,0 +1,718 @@
+#!/usr/bin/env python3
+"""
+Training entry point for the airplane lander.
+
+Environments are sharded across worker processes. Each worker owns one
+MountainCarPlaneVectorEnv whose output buffers are views into
+multiprocessing.shared_memory blocks, so observations, rewards and done
+flags are written once, in place, and never pickled through a pipe. The
+pipes only carry tiny step/reset commands.
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing as mp
+import os
+import shutil
+import sys
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from airplane_landing_simulator import NUM_ACTIONS, TASK_DEFAULTS  # noqa: E402
+from env.mountain_car_plane_env import BUFFER_SPECS, MountainCarPlaneVectorEnv  # noqa: E402
+from lander_randomization import DEFAULT_RANGES  # noqa: E402
+
+# Browser policy weights are written next to the model: models/ppo_lander.weights.bin
+WEIGHTS_SUFFIX = ".weights.bin"
+REPLAY_BASE = "replay-base"  # full replay columns next to the incremental checkpoints
+
+# Shared blocks: every env output buffer plus the actions and task parameters written by the parent
+TASK_SPECS = {name: ((), np.float64) for name in TASK_DEFAULTS}
+SHARED_SPECS = dict(BUFFER_SPECS, actions=((), np.uint8), **TASK_SPECS)
+
+
+def _shared_views(blocks, num_envs, start=0, stop=None):
+    """Map shared memory blocks to NumPy arrays, optionally sliced to [start:stop]"""
+    views = {}
+    for name, (shape, dtype) in SHARED_SPECS.items():
+        array = np.ndarray((num_envs, *shape), dtype=dtype, buffer=blocks[name].buf)
+        views[name] = array[start:stop]
+    return views
+
+
+def _worker(conn, blocks, num_envs, start, stop, max_episode_steps, randomization):
+    """Worker loop: step a shard of environments in place on command"""
+    views = _shared_views(blocks, num_envs, start, stop)
+    actions = views.pop("actions")
+    task = {name: views.pop(name) for name in TASK_SPECS}
+    env = MountainCarPlaneVectorEnv(stop - start, max_episode_steps, buffers=views,
+                                    randomization=randomization, first_env=start, task=task)
+    rng = np.random.default_rng(start)
+    with conn:
+        while True:
+            command, arg = conn.recv()
+            if command == "step":
+                env.step(actions)
+            elif command == "reset":
+                env.reset(seed=arg)
+            elif command == "rollout":
+                # Benchmark mode: random actions chosen inside the worker
+                random_actions = rng.integers(0, NUM_ACTIONS, size=(64, stop - start), dtype=np.uint8)
+                for tick in range(arg):
+                    env.step(random_actions[tick % 64])
+            elif command == "close":
+                break
+            conn.send(None)
+
+
+class SharedMemoryCollector:
+    """
+    Steps num_workers * envs_per_worker environments across worker processes.
+
+    After step() the public arrays (observations, rewards, terminated,
+    truncated, done, final_observations, outcome) hold the latest results for
+    all environments; they live in shared memory and are overwritten by the
+    next step. The task arrays (one per TASK_DEFAULTS name, also in `task`)
+    are read by the workers on every step, so the parent can change an
+    environment's crash boundaries and landing thresholds between steps.
+    Environments are seeded by their global index, so a seeded run draws the
+    same randomized episodes whatever the worker count.
+    """
+
+    def __init__(self, num_workers, envs_per_worker, max_episode_steps=1000, randomization=None):
+        self.num_workers = int(num_workers)
+        self.envs_per_worker = int(envs_per_worker)
+        self.num_envs = self.num_workers * self.envs_per_worker
+
+        self._blocks = {}
+        for name, (shape, dtype) in SHARED_SPECS.items():
+            size = max(1, self.num_envs * int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize)
+            self._blocks[name] = shared_memory.SharedMemory(create=True, size=size)
+        for name, array in _shared_views(self._blocks, self.num_envs).items():
+            array.fill(TASK_DEFAULTS.get(name, 0))
+            setattr(self, name, array)
+        self.task = {name: getattr(self, name) for name in TASK_SPECS}
+
+        self._conns = []
+        self._processes = []
+        for rank in range(self.num_workers):
+            parent_conn, child_conn = mp.Pipe()
+            start = rank * self.envs_per_worker
+            process = mp.Process(
+                target=_worker,
+                args=(child_conn, self._blocks, self.num_envs, start, start + self.envs_per_worker,
+                      max_episode_steps, randomization),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._processes.append(process)
+        self.closed = False
+
+    def _broadcast(self, command, arg=None):
+        """Send a command to every worker and wait for all of them"""
+        for conn in self._conns:
+            conn.send((command, arg))
+        for conn in self._conns:
+            conn.recv()
+
+    def reset(self, seed=None):
+        """Reset all environments; returns the shared observation array"""
+        self._broadcast("reset", seed)
+        return self.observations
+
+    def step_async(self, actions):
+        """Publish actions and start every worker on its shard"""
+        np.copyto(self.actions, actions, casting="unsafe")
+        for conn in self._conns:
+            conn.send(("step", None))
+
+    def step_wait(self):
+        """Wait for every worker to finish the step started by step_async()"""
+        for conn in self._conns:
+            conn.recv()
+        return self.observations, self.rewards, self.terminated, self.truncated
+
+    def step(self, actions):
+        """Step all environments with the given actions"""
+        self.step_async(actions)
+        return self.step_wait()
+
+    def rollout(self, num_steps):
+        """Run num_steps random-action steps inside every worker (benchmarking)"""
+        self._broadcast("rollout", int(num_steps))
+
+    def close(self):
+        """Stop the workers and release the shared memory"""
+        if self.closed:
+            return
+        for conn in self._conns:
+            try:
+                conn.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+        for name in SHARED_SPECS:
+            delattr(self, name)
+        self.task = None
+        for block in self._blocks.values():
+            try:
+                block.close()
+            except BufferError:
+                pass  # a caller still holds a view; the mapping goes with it
+            block.unlink()
+        self.closed = True
+
+
+class InProcessCollector:
+    """
+    SharedMemoryCollector's interface over one in-process vector env.
+
+    For sweep trials: pool workers are daemonic and cannot start their own
+    env workers, and many small concurrent trials are better off with one
+    process each anyway.
+    """
+
+    def __init__(self, num_envs, max_episode_steps=1000, randomization=None):
+        self.num_envs = int(num_envs)
+        buffers = {name: np.zeros((self.num_envs, *shape), dtype=dtype) for name, (shape, dtype) in BUFFER_SPECS.items()}
+        for name, array in buffers.items():
+            setattr(self, name, array)
+        self._env = MountainCarPlaneVectorEnv(self.num_envs, max_episode_steps, buffers=buffers,
+                                              randomization=randomization)
+        self.task = self._env.task
+        self._actions = np.zeros(self.num_envs, dtype=np.uint8)
+        self.closed = False
+
+    def reset(self, seed=None):
+        self._env.reset(seed=seed)
+        return self.observations
+
+    def step_async(self, actions):
+        np.copyto(self._actions, actions, casting="unsafe")
+
+    def step_wait(self):
+        self._env.step(self._actions)
+        return self.observations, self.rewards, self.terminated, self.truncated
+
+    def step(self, actions):
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close(self):
+        self._env.close()
+        self.closed = True
+
+
+def benchmark(worker_counts, envs_per_worker, num_steps):
+    """Report collection steps/sec for each worker count (fixed envs per worker)"""
+    print(f"⏱  {envs_per_worker} envs per worker, {num_steps} steps per measurement")
+    print(f"   {'workers':>7} {'env steps/sec (lockstep)':>26} {'env steps/sec (in-worker)':>26} {'scaling':>8}")
+    rng = np.random.default_rng(0)
+    baseline = None
+    for workers in worker_counts:
+        collector = SharedMemoryCollector(workers, envs_per_worker)
+        try:
+            actions = rng.integers(0, NUM_ACTIONS, size=(64, collector.num_envs), dtype=np.uint8)
+            collector.step(actions[0])  # warm-up (JIT compilation in the workers)
+            collector.reset(seed=0)
+
+            start = time.perf_counter()
+            for step in range(num_steps):
+                collector.step(actions[step % 64])
+            lockstep = collector.num_envs * num_steps / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            collector.rollout(num_steps)
+            in_worker = collector.num_envs * num_steps / (time.perf_counter() - start)
+        finally:
+            collector.close()
+
+        if baseline is None:
+            baseline = lockstep / workers
+        scaling = lockstep / (baseline * workers)
+        print(f"   {workers:>7} {lockstep:>26,.0f} {in_worker:>26,.0f} {scaling:>7.0%}")
+
+
+def collect_replay(args):
+    """Fill a replay buffer with random-policy transitions from the collector and save it"""
+    from training.checkpoint import Checkpointer, load_checkpoint
+    from training.replay_buffer import ReplayBuffer, base_step, load_base, update_base
+
+    collector = SharedMemoryCollector(args.workers, args.envs_per_worker, args.max_episode_steps)
+    checkpointer = None
+    if args.checkpoint_dir:
+        # Checkpoints hold only the rows added since the previous one; the writer
+        # folds each into a full copy of the columns kept next to them
+        base_dir = os.path.join(args.checkpoint_dir, REPLAY_BASE)
+        if not args.resume:
+            shutil.rmtree(base_dir, ignore_errors=True)
+        checkpointer = Checkpointer(args.checkpoint_dir, args.checkpoint_keep, on_write=lambda path, step, state, meta:
+                                    update_base(base_dir, state["buffer"], meta["buffer"], step))
+    rng = np.random.default_rng(args.seed)
+    steps = 0
+    try:
+        if args.resume:
+            # The buffer columns stay memory-mapped; the envs restart, so the last stored step is cut there
+            state, meta = load_checkpoint(args.checkpoint_dir)
+            step = meta["steps"] * collector.num_envs
+            if not meta["since"] <= (base_step(base_dir) or 0) <= step:
+                raise RuntimeError(f"replay base in {base_dir} does not match the latest checkpoint")
+            update_base(base_dir, state["buffer"], meta["buffer"], step)
+            buffer = load_base(base_dir, state["buffer"], meta["buffer"])
+            buffer.end_episodes(state["observations"])
+            rng.bit_generator.state = state["rng"]
+            steps = meta["steps"]
+            print(f"↩️  Resumed at {step:,} transitions")
+        else:
+            obs_dtype = np.float16 if args.replay_float16 else np.float32
+            buffer = ReplayBuffer(args.replay_capacity, collector.num_envs, obs_dtype)
+        observations = collector.reset(seed=args.seed + steps).copy()
+        checkpoint_steps = max(1, args.checkpoint_interval // collector.num_envs)
+        snapshot_steps = steps
+        start = time.perf_counter()
+        for steps in range(steps + 1, args.replay_steps // collector.num_envs + 1):
+            actions = rng.integers(0, NUM_ACTIONS, size=collector.num_envs, dtype=np.uint8)
+            collector.step(actions)
+            buffer.add(observations, actions, collector.rewards, collector.terminated, collector.truncated,
+                       collector.final_observations)
+            np.copyto(observations, collector.observations)
+            if checkpointer is not None and steps % checkpoint_steps == 0:
+                arrays, buffer_meta = buffer.delta_state((steps - snapshot_steps) * collector.num_envs)
+                if checkpointer.snapshot(steps * collector.num_envs,
+                                         {"buffer": arrays, "observations": observations,
+                                          "rng": rng.bit_generator.state},
+                                         {"steps": steps, "since": snapshot_steps * collector.num_envs,
+                                          "buffer": buffer_meta}):
+                    snapshot_steps = steps
+                    buffer.mark_checkpointed()
+        elapsed = time.perf_counter() - start
+    finally:
+        collector.close()
+        if checkpointer is not None:
+            checkpointer.close()
+    print(f"✓ Collected {buffer.size:,} transitions in {elapsed:.1f}s "
+          f"({buffer.nbytes / max(1, buffer.capacity):.0f} bytes/transition)")
+    buffer.save(args.collect_replay)
+    print(f"💾 Saved replay buffer to {args.collect_replay}")
+
+
+def training_state(model):
+    """Everything a PPO run needs to continue between two updates: weights, optimizer and RNG states"""
+    import random
+
+    import torch
+
+    return {
+        "policy": model.policy.state_dict(),
+        "optimizer": model.policy.optimizer.state_dict(),
+        "rng": {"python": random.getstate(), "numpy": np.random.get_state(legacy=False),
+                "torch": torch.get_rng_state()},
+    }
+
+
+def restore_training_state(model, state):
+    """Load a training_state() tree (as read back by load_checkpoint) into a freshly built model"""
+    import random
+
+    import torch
+
+    from training.checkpoint import map_arrays
+
+    def tensors(tree):
+        return map_arrays(tree, lambda array: torch.from_numpy(np.array(array)))
+
+    model.policy.load_state_dict(tensors(state["policy"]))
+    model.policy.optimizer.load_state_dict(tensors(state["optimizer"]))
+    rng = state["rng"]
+    random.setstate(rng["python"])
+    np.random.set_state(map_arrays(rng["numpy"], np.array))
+    torch.set_rng_state(tensors(rng["torch"]))
+
+
+def pretrain_behavior_cloning(model, demos, epochs, batch_size, learning_rate, seed=0):
+    """Fit the PPO actor to demonstrations (cross-entropy on the demonstrated actions) before RL"""
+    import torch
+
+    observations = torch.from_numpy(np.ascontiguousarray(demos["observations"], dtype=np.float32))
+    actions = torch.from_numpy(demos["actions"].astype(np.int64))
+    optimizer = torch.optim.Adam(model.policy.parameters(), lr=learning_rate)
+    model.policy.set_training_mode(True)
+    rng = np.random.default_rng(seed)
+    for epoch in range(epochs):
+        order = torch.from_numpy(rng.permutation(len(actions)))
+        losses = []
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            loss = -model.policy.get_distribution(observations[batch]).log_prob(actions[batch]).mean()
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+            losses.append(loss.item())
+        print(f"   BC epoch {epoch + 1}/{epochs}: loss {np.mean(losses):.4f}")
+
+
+def train(args):
+    """Train a PPO agent on the shared-memory vectorized environment"""
+    from stable_baselines3 import PPO
+    from stable_baselines3.common.callbacks import BaseCallback, CallbackList
+
+    from training.checkpoint import Checkpointer, load_checkpoint
+    from training.curriculum import Curriculum
+    from training.sb3_vec_env import SharedMemoryVecEnv
+
+    randomization = DEFAULT_RANGES if args.randomize else None
+    collector = SharedMemoryCollector(args.workers, args.envs_per_worker, args.max_episode_steps, randomization)
+    curriculum = None
+    if args.curriculum:
+        curriculum = Curriculum(collector.task, promote_at=args.curriculum_target, window=args.curriculum_window)
+    vec_env = SharedMemoryVecEnv(collector, curriculum)
+    checkpointer = Checkpointer(args.checkpoint_dir, args.checkpoint_keep) if args.checkpoint_dir else None
+
+    def snapshot(model):
+        meta = {"timesteps": model.num_timesteps, "updates": model._n_updates}
+        if curriculum is not None:
+            meta["curriculum"] = curriculum.state()
+        checkpointer.snapshot(model.num_timesteps, training_state(model), meta)
+
+    class SnapshotCallback(BaseCallback):
+        """Checkpoint between updates, when the rollout buffer has been consumed and holds nothing to save"""
+
+        def _on_rollout_start(self):
+            if self.model.num_timesteps >= self.next_checkpoint:
+                snapshot(self.model)
+                self.next_checkpoint = self.model.num_timesteps + args.checkpoint_interval
+
+        def _on_step(self):
+            return True
+
+    class CurriculumCallback(BaseCallback):
+        """Report the curriculum level and window success rate with every rollout"""
+
+        def _on_rollout_end(self):
+            self.logger.record("curriculum/level", curriculum.level)
+            if curriculum.history:
+                self.logger.record("curriculum/last_window_landed", curriculum.history[-1][1])
+
+        def _on_step(self):
+            return True
+
+    try:
+        model = PPO("MlpPolicy", vec_env, n_steps=args.n_steps, seed=args.seed, device="cpu", verbose=1)
+        if args.resume:
+            state, meta = load_checkpoint(args.checkpoint_dir)
+            restore_training_state(model, state)
+            model.num_timesteps = meta["timesteps"]
+            model._n_updates = meta["updates"]
+            if curriculum is not None and "curriculum" in meta:
+                curriculum.load_state(meta["curriculum"])
+            vec_env.seed(args.seed + model.num_timesteps)  # in-flight episodes restart from fresh draws
+            print(f"↩️  Resumed at {model.num_timesteps:,} steps")
+        elif args.demos:
+            from lander_demos import load_demonstrations
+
+            demos = load_demonstrations(args.demos)
+            print(f"🧑‍✈️ Behavior cloning on {len(demos['actions']):,} demonstrated steps from {args.demos}")
+            if len(demos["actions"]):
+                pretrain_behavior_cloning(model, demos, args.bc_epochs, args.bc_batch_size, args.bc_lr, args.seed)
+        callbacks = []
+        if checkpointer is not None:
+            callbacks.append(SnapshotCallback())
+            callbacks[-1].next_checkpoint = model.num_timesteps + args.checkpoint_interval
+        if curriculum is not None:
+            callbacks.append(CurriculumCallback())
+        callback = CallbackList(callbacks) if callbacks else None
+        start = time.perf_counter()
+        remaining = max(0, args.timesteps - model.num_timesteps)
+        model.learn(total_timesteps=remaining, callback=callback, reset_num_timesteps=not args.resume)
+        elapsed = time.perf_counter() - start
+        print(f"✓ Trained {remaining:,} steps in {elapsed:.1f}s ({remaining / elapsed:,.0f} steps/sec)")
+        if curriculum is not None:
+            print(f"🎓 Curriculum level {curriculum.level + 1}/{len(curriculum.levels)}")
+        if checkpointer is not None:
+            checkpointer.wait()  # the final checkpoint must not be skipped
+            snapshot(model)
+        model.save(args.save_path)
+        print(f"💾 Saved policy to {args.save_path}")
+        write_policy_weights(model.policy, args.save_path + WEIGHTS_SUFFIX)
+    finally:
+        vec_env.close()
+        if checkpointer is not None:
+            checkpointer.close()
+
+
+def write_policy_weights(policy, path):
+    """Export the actor's raw weights for the browser pilot (LANDER_POLICY_WEIGHTS)"""
+    from lander_inference import export_policy_weights
+
+    data = export_policy_weights(policy)
+    with open(path, "wb") as f:
+        f.write(data)
+    print(f"💾 Exported browser policy weights to {path} ({len(data) / 1024:.1f} KiB)")
+
+
+def export_weights(model_path):
+    """Export the browser weights of an already saved model"""
+    from stable_baselines3 import PPO
+
+    write_policy_weights(PPO.load(model_path, device="cpu").policy,
+                         model_path.removesuffix(".zip") + WEIGHTS_SUFFIX)
+
+
+class ResultsLog:
+    """
+    Append-only JSON-lines file shared by every sweep trial.
+
+    Each row is written with a single write() on an O_APPEND descriptor, so
+    concurrent trials never interleave lines; a reader racing a writer may
+    see a partial last line, which read() skips.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def append(self, row):
+        line = (json.dumps(row, sort_keys=True) + "\n").encode("utf-8")
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    def read(self):
+        if not os.path.exists(self.path):
+            return []
+        rows = []
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    pass
+        return rows
+
+
+# Hyperparameter grid swept when no --sweep spec is given (PPO keyword -> values)
+DEFAULT_SWEEP = {
+    "learning_rate": [1e-4, 3e-4, 1e-3],
+    "n_steps": [64, 128, 256],
+    "gamma": [0.99, 0.995],
+    "ent_coef": [0.0, 0.01],
+}
+
+
+def sweep_trials(spec, samples=None, seed=0):
+    """Grid product of a sweep spec as [(trial id, params)], optionally a seeded random subset"""
+    names = sorted(spec)
+    grid = [dict(zip(names, values)) for values in itertools.product(*(spec[name] for name in names))]
+    trials = [(f"trial-{i:04d}", params) for i, params in enumerate(grid)]  # ids stable under subsetting
+    if samples is not None and samples < len(trials):
+        order = np.random.default_rng(seed).permutation(len(trials))[:samples]
+        trials = [trials[i] for i in sorted(order)]
+    return trials
+
+
+def should_stop(rows, trial, checkpoint, best, min_trials):
+    """
+    Median stopping rule: stop a trial whose best evaluation so far is below
+    the median best-so-far of the other trials that reached the same
+    checkpoint (in timesteps). Needs min_trials such trials to decide.
+    """
+    best_so_far = {}
+    reached = set()
+    for row in rows:
+        if row.get("event") != "eval" or row["trial"] == trial or row["checkpoint"] > checkpoint:
+            continue
+        best_so_far[row["trial"]] = max(best_so_far.get(row["trial"], 0.0), row["landed"])
+        if row["checkpoint"] == checkpoint:
+            reached.add(row["trial"])
+    if len(reached) < min_trials:
+        return False
+    return best < float(np.median([best_so_far[other] for other in reached]))
+
+
+def _init_trial_worker(threads):
+    """Pool initializer: pin torch (and its OpenMP/MKL pools) to `threads` threads per trial"""
+    for name in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[name] = str(threads)
+    import torch
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+
+
+def run_trial(trial, params, options):
+    """Train one sweep trial, evaluating every eval_interval steps; returns its final result row"""
+    from stable_baselines3 import PPO
+    from stable_baselines3.common.callbacks import BaseCallback
+
+    from airplane_landing_simulator import LANDED
+    from lander_inference import policy_function
+    from run_lander_evaluation import evaluate_task
+    from training.sb3_vec_env import SharedMemoryVecEnv
+
+    log = ResultsLog(options["results"])
+    randomization = DEFAULT_RANGES if options["randomize"] else None
+    start = time.perf_counter()
+    evaluations = []
+    stopped = []
+
+    class EvaluationCallback(BaseCallback):
+        """Evaluate on fixed episodes at every checkpoint, stream the result, stop poor trials"""
+
+        def _on_step(self):
+            checkpoint = (len(evaluations) + 1) * options["eval_interval"]
+            if self.num_timesteps < checkpoint:
+                return True
+            rows = evaluate_task(0, policy_function(self.model.policy), options["eval_seed"],
+                                 options["eval_episodes"], 1, options["max_episode_steps"], randomization)
+            landed = float(np.mean(rows["outcome"] == LANDED))
+            evaluations.append(landed)
+            log.append({"event": "eval", "trial": trial, "checkpoint": checkpoint, "timesteps": self.num_timesteps,
+                        "landed": landed, "elapsed": time.perf_counter() - start})
+            if len(evaluations) > options["grace"] and should_stop(log.read(), trial, checkpoint, max(evaluations),
+                                                                    options["min_trials"]):
+                stopped.append(checkpoint)
+                return False
+            return True
+
+    vec_env = SharedMemoryVecEnv(InProcessCollector(options["envs"], options["max_episode_steps"], randomization))
+    result = {"event": "end", "trial": trial, "params": params}
+    try:
+        kwargs = dict(params)
+        model = PPO("MlpPolicy", vec_env, seed=kwargs.pop("seed", options["seed"]), device="cpu", verbose=0, **kwargs)
+        model.learn(total_timesteps=options["timesteps"], callback=EvaluationCallback())
+        result.update(status="stopped" if stopped else "completed", timesteps=model.num_timesteps,
+                      best_landed=max(evaluations, default=None),
+                      final_landed=evaluations[-1] if evaluations else None)
+    except Exception as error:  # a bad configuration fails its trial, not the sweep
+        result.update(status="failed", error=f"{type(error).__name__}: {error}")
+    finally:
+        vec_env.close()
+    result["elapsed"] = time.perf_counter() - start
+    log.append(result)
+    return result
+
+
+def _run_trial(task):
+    return run_trial(*task)
+
+
+def sweep(args):
+    """Run a hyperparameter sweep over a process pool, one pinned-thread trial per worker"""
+    spec = DEFAULT_SWEEP
+    if args.sweep != "default":
+        with open(args.sweep) as f:
+            spec = json.load(f)
+    trials = sweep_trials(spec, args.sweep_samples, args.seed)
+    log = ResultsLog(args.sweep_results)
+    finished = {row["trial"] for row in log.read() if row.get("event") == "end"}
+    pending = [(trial, params) for trial, params in trials if trial not in finished]
+    workers = args.sweep_workers or max(1, (os.cpu_count() or 1) // args.trial_threads)
+    options = {
+        "results": args.sweep_results,
+        "timesteps": args.timesteps,
+        "envs": args.trial_envs,
+        "max_episode_steps": args.max_episode_steps,
+        "randomize": args.randomize,
+        "seed": args.seed,
+        "eval_interval": args.eval_interval,
+        "eval_episodes": args.eval_episodes,
+        "eval_seed": args.seed + 1,
+        "min_trials": args.min_trials,
+        "grace": args.grace_evals,
+    }
+
+    print(f"🧪 {len(trials)} trials ({len(finished)} already finished) on {workers} workers "
+          f"x {args.trial_threads} torch threads, results in {args.sweep_results}")
+    start = time.perf_counter()
+    with mp.Pool(workers, initializer=_init_trial_worker, initargs=(args.trial_threads,), maxtasksperchild=1) as pool:
+        tasks = [(trial, params, options) for trial, params in pending]
+        for done, result in enumerate(pool.imap_unordered(_run_trial, tasks), start=1):
+            best = result.get("best_landed")
+            score = "-" if best is None else f"{best:.1%}"
+            print(f"   [{done}/{len(pending)}] {result['trial']} {result['status']:>9} best landed {score:>6} "
+                  f"in {result['elapsed']:.0f}s  {result['params']}")
+    print(f"✓ Sweep finished in {time.perf_counter() - start:.0f}s")
+
+    ended = [row for row in log.read() if row.get("event") == "end" and row.get("best_landed") is not None]
+    ended.sort(key=lambda row: row["best_landed"], reverse=True)
+    print("🏆 Best trials:")
+    for row in ended[:5]:
+        print(f"   {row['trial']}  landed {row['best_landed']:.1%}  ({row['status']})  {row['params']}")
+
+
+def main():
+    """Main function for lander training"""
+    parser = argparse.ArgumentParser(description="Train or benchmark the airplane lander")
+    parser.add_argument("--workers", type=int, default=max(1, os.cpu_count() or 1))
+    parser.add_argument("--envs-per-worker", type=int, default=64)
+    parser.add_argument("--max-episode-steps", type=int, default=1000)
+    parser.add_argument("--timesteps", type=int, default=1_000_000)
+    parser.add_argument("--n-steps", type=int, default=128, help="PPO rollout length per environment")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save-path", default="models/ppo_lander")
+    parser.add_argument("--randomize", action="store_true", help="randomize start state and physics per episode")
+    parser.add_argument("--curriculum", action="store_true",
+                        help="start with loose landing thresholds and boundaries, tightened as success improves")
+    parser.add_argument("--curriculum-target", type=float, default=0.8, help="success rate that promotes a level")
+    parser.add_argument("--curriculum-window", type=int, default=2000, help="episodes per promotion decision")
+    parser.add_argument("--demos", metavar="DIR", help="pretrain on human demonstrations (LANDER_DEMO_PATH dataset)")
+    parser.add_argument("--bc-epochs", type=int, default=10)
+    parser.add_argument("--bc-batch-size", type=int, default=256)
+    parser.add_argument("--bc-lr", type=float, default=1e-3)
+    parser.add_argument("--benchmark", action="store_true", help="report collection steps/sec per worker count")
+    parser.add_argument("--bench-workers", type=int, nargs="+", help="worker counts to benchmark")
+    parser.add_argument("--bench-steps", type=int, default=500)
+    parser.add_argument("--collect-replay", metavar="DIR", help="save random-policy transitions as a replay buffer")
+    parser.add_argument("--replay-steps", type=int, default=1_000_000)
+    parser.add_argument("--replay-capacity", type=int, default=1_000_000)
+    parser.add_argument("--replay-float16", action="store_true", help="store replay observations as float16")
+    parser.add_argument("--checkpoint-dir", metavar="DIR",
+                        help="write periodic checkpoints (training and --collect-replay) in the background")
+    parser.add_argument("--checkpoint-interval", type=int, default=100_000, help="timesteps between checkpoints")
+    parser.add_argument("--checkpoint-keep", type=int, default=2, help="newest checkpoints kept on disk")
+    parser.add_argument("--resume", action="store_true", help="continue from the latest checkpoint in --checkpoint-dir")
+    parser.add_argument("--export-weights", metavar="MODEL", help="export a saved model's weights for the browser")
+    parser.add_argument("--sweep", metavar="SPEC", help="hyperparameter sweep: JSON {ppo_kwarg: [values]} or 'default'")
+    parser.add_argument("--sweep-samples", type=int, help="random subset of the grid to run")
+    parser.add_argument("--sweep-workers", type=int, help="concurrent trials (default: cores / --trial-threads)")
+    parser.add_argument("--sweep-results", default="sweeps/results.jsonl", help="append-only results file")
+    parser.add_argument("--trial-threads", type=int, default=1, help="torch threads per trial")
+    parser.add_argument("--trial-envs", type=int, default=64, help="in-process environments per trial")
+    parser.add_argument("--eval-interval", type=int, default=50_000, help="timesteps between trial evaluations")
+    parser.add_argument("--eval-episodes", type=int, default=256)
+    parser.add_argument("--min-trials", type=int, default=4, help="trials needed at a checkpoint before stopping any")
+    parser.add_argument("--grace-evals", type=int, default=2, help="evaluations before a trial may be stopped")
+    args = parser.parse_args()
+
+    if args.resume and not args.checkpoint_dir:
+        parser.error("--resume needs --checkpoint-dir")
+
+    print("🛩  Airplane Lander Training")
+    print("=" * 50)
+
+    if args.benchmark:
+        counts = args.bench_workers or sorted({1, 2, 4, 8, 16, 32, args.workers} & set(range(1, args.workers + 1)))
+        benchmark(counts, args.envs_per_worker, args.bench_steps)
+    elif args.collect_replay:
+        collect_replay(args)
+    elif args.sweep:
+        sweep(args)
+    elif args.export_weights:
+        export_weights(args.export_weights)
+    else:
+        train(args)
+
+
+if __name__ == "__main__":
+    main()